@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException, Query
+from app.services.building_info_service import building_info_service
+
+router = APIRouter()
+
+
+@router.post("/building-info/reload")
+async def reload_building_info(
+    force: bool = Query(True, description="원본 파일이 바뀌지 않았어도 다시 로드")
+):
+    """
+    건축 정보 재로드
+
+    원본 JSON 파일로 새 스냅샷과 조회 인덱스를 만든 뒤 한 번에 교체합니다.
+    로드에 실패하면 기존 스냅샷을 그대로 사용합니다.
+    """
+    reloaded = await building_info_service.reload(force=force)
+    stats = building_info_service.stats()
+
+    if force and not reloaded:
+        raise HTTPException(status_code=500, detail=f"건축 정보 재로드 실패: {stats['last_error']}")
+
+    return {"reloaded": reloaded, **stats}
@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Query, HTTPException
-from typing import Optional
+from fastapi import APIRouter, Depends, Query, HTTPException
+from typing import Dict, List, Optional
 from app.models.schemas import (
+    AreaGroup,
+    PriceDistribution,
     PriceTrendAnalysis,
+    PropertyType,
+    TrendGroupBy,
     MarketComparison,
     LocationAnalysis
 )
@@ -9,17 +13,19 @@ from app.services.molit_api_xml import molit_service_xml as molit_service
 from app.services.price_analyzer import price_analyzer
 from app.services.market_analyzer import market_analyzer
 from app.services.location_analyzer import location_analyzer
-from app.core.config import settings
+from app.api.dependencies import cached_query, get_region_codes
 
 router = APIRouter()
 
 
 @router.get("/price-trend", response_model=PriceTrendAnalysis)
+@cached_query("price-trend")
 async def get_price_trend(
     apartment_name: Optional[str] = Query(None, description="아파트명"),
     min_area: Optional[float] = Query(None, ge=0, description="최소 면적(㎡)"),
     max_area: Optional[float] = Query(None, ge=0, description="최대 면적(㎡)"),
-    months: int = Query(12, ge=1, le=24, description="조회 개월 수")
+    months: int = Query(12, ge=1, le=24, description="조회 개월 수"),
+    region_codes: List[str] = Depends(get_region_codes)
 ):
     """
     가격 추이 분석
@@ -28,11 +34,9 @@ async def get_price_trend(
     """
     try:
         # 전체 매물 조회
-        all_properties = await molit_service.fetch_all_properties(
-            settings.MAPO_REGION_CODE, months
-        )
+        frame = await molit_service.fetch_frame(region_codes, months)
 
-        if not all_properties:
+        if not len(frame):
             raise HTTPException(status_code=404, detail="데이터가 없습니다.")
 
         # 면적 범위 설정
@@ -42,7 +46,7 @@ async def get_price_trend(
 
         # 가격 추이 분석
         analysis = price_analyzer.analyze_price_trend(
-            all_properties,
+            frame,
             apartment_name=apartment_name,
             area_range=area_range
         )
@@ -55,10 +59,46 @@ async def get_price_trend(
         raise HTTPException(status_code=500, detail=f"가격 추이 분석 중 오류 발생: {str(e)}")
 
 
+@router.get("/price-trends", response_model=Dict[str, PriceTrendAnalysis])
+@cached_query("price-trends")
+async def get_price_trends(
+    group_by: TrendGroupBy = Query(TrendGroupBy.AREA, description="그룹 기준 (평형대/단지/동)"),
+    names: Optional[List[str]] = Query(None, description="조회할 그룹 이름 (중복 선택 가능, 미지정 시 전체)"),
+    months: int = Query(12, ge=1, le=24, description="조회 개월 수"),
+    region_codes: List[str] = Depends(get_region_codes)
+):
+    """
+    그룹별 가격 추이 분석
+
+    평형대, 단지 또는 동별 가격 추이를 한 번에 분석합니다.
+    """
+    try:
+        # 평형대/동은 집계 큐브, 단지는 거래 행으로 집계
+        if group_by == TrendGroupBy.APARTMENT:
+            data = await molit_service.fetch_frame(region_codes, months)
+        else:
+            data = await molit_service.fetch_cube(region_codes, months)
+
+        if not len(data):
+            raise HTTPException(status_code=404, detail="데이터가 없습니다.")
+
+        # 그룹별 가격 추이 분석
+        trends = price_analyzer.analyze_group_trends(data, group_by.value, names)
+
+        return trends
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"가격 추이 분석 중 오류 발생: {str(e)}")
+
+
 @router.get("/market-comparison", response_model=MarketComparison)
+@cached_query("market-comparison")
 async def get_market_comparison(
     property_id: Optional[str] = Query(None, description="매물 ID"),
-    months: int = Query(12, ge=1, le=24, description="조회 개월 수")
+    months: int = Query(12, ge=1, le=24, description="조회 개월 수"),
+    region_codes: List[str] = Depends(get_region_codes)
 ):
     """
     시세 비교 분석
@@ -66,30 +106,27 @@ async def get_market_comparison(
     특정 매물의 시세를 동일 평형대 매물과 비교 분석합니다.
     """
     try:
-        # 전체 매물 조회
-        all_properties = await molit_service.fetch_all_properties(
-            settings.MAPO_REGION_CODE, months
-        )
+        # 특정 매물 시세 비교 (유사 면적 매물 원본 필요)
+        if property_id:
+            frame = await molit_service.fetch_frame(region_codes, months)
 
-        if not all_properties:
-            raise HTTPException(status_code=404, detail="데이터가 없습니다.")
+            if not len(frame):
+                raise HTTPException(status_code=404, detail="데이터가 없습니다.")
 
-        # 특정 매물 시세 비교
-        if property_id:
-            property_found = next(
-                (p for p in all_properties if p.id == property_id),
-                None
-            )
+            property_found = molit_service.lookup_property(region_codes, property_id, months)
 
-            if not property_found:
+            if property_found is None:
                 raise HTTPException(status_code=404, detail="매물을 찾을 수 없습니다.")
 
-            comparison = market_analyzer.compare_property_price(
-                property_found, all_properties
-            )
+            comparison = market_analyzer.compare_property_price(property_found, frame)
         else:
-            # 전체 시세 통계
-            market_stats = market_analyzer.analyze_market_stats(all_properties)
+            # 전체 시세 통계 (집계 큐브)
+            cube = await molit_service.fetch_cube(region_codes, months)
+
+            if not len(cube):
+                raise HTTPException(status_code=404, detail="데이터가 없습니다.")
+
+            market_stats = market_analyzer.analyze_market_stats(cube)
             comparison = MarketComparison(
                 market_stats=market_stats
             )
@@ -102,10 +139,56 @@ async def get_market_comparison(
         raise HTTPException(status_code=500, detail=f"시세 비교 중 오류 발생: {str(e)}")
 
 
+@router.get("/price-distribution", response_model=PriceDistribution)
+@cached_query("price-distribution")
+async def get_price_distribution(
+    property_type: Optional[PropertyType] = Query(None, description="매물 유형"),
+    dongs: Optional[List[str]] = Query(None, description="동 목록 (중복 선택 가능)"),
+    area_groups: Optional[List[AreaGroup]] = Query(None, description="평형대 목록 (중복 선택 가능)"),
+    percentiles: List[float] = Query([10, 25, 50, 75, 90], description="백분위 목록 (0~100)"),
+    bins: int = Query(10, ge=1, le=50, description="가격 구간 수"),
+    months: int = Query(12, ge=1, le=24, description="조회 개월 수"),
+    region_codes: List[str] = Depends(get_region_codes)
+):
+    """
+    가격 분포
+
+    조건(매물 유형, 동, 평형대, 지역, 기간)에 맞는 거래의 백분위 가격과 구간별 거래 건수를 조회합니다.
+    월·동·지역별 분위수 스케치를 합쳐 계산하며, 오차 상한은 rank_error로 함께 제공합니다.
+    """
+    if any(not 0 <= percentile <= 100 for percentile in percentiles):
+        raise HTTPException(status_code=400, detail="백분위는 0~100 사이여야 합니다.")
+
+    try:
+        # 집계 큐브 조회
+        cube = await molit_service.fetch_cube(region_codes, months)
+
+        distribution = market_analyzer.analyze_price_distribution(
+            cube,
+            property_type=property_type.value if property_type else None,
+            dongs=dongs,
+            area_groups=[group.value for group in area_groups] if area_groups else None,
+            percentiles=percentiles,
+            bins=bins
+        )
+
+        if distribution is None:
+            raise HTTPException(status_code=404, detail="데이터가 없습니다.")
+
+        return distribution
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"가격 분포 분석 중 오류 발생: {str(e)}")
+
+
 @router.get("/market-ranking")
+@cached_query("market-ranking")
 async def get_market_ranking(
     limit: int = Query(10, ge=1, le=50, description="조회 개수"),
-    months: int = Query(12, ge=1, le=24, description="조회 개월 수")
+    months: int = Query(12, ge=1, le=24, description="조회 개월 수"),
+    region_codes: List[str] = Depends(get_region_codes)
 ):
     """
     시세 순위
@@ -114,15 +197,13 @@ async def get_market_ranking(
     """
     try:
         # 전체 매물 조회
-        all_properties = await molit_service.fetch_all_properties(
-            settings.MAPO_REGION_CODE, months
-        )
+        frame = await molit_service.fetch_frame(region_codes, months)
 
-        if not all_properties:
+        if not len(frame):
             raise HTTPException(status_code=404, detail="데이터가 없습니다.")
 
         # 시세 순위 계산
-        ranking = market_analyzer.get_market_ranking(all_properties, limit)
+        ranking = market_analyzer.get_market_ranking(frame, limit)
 
         return ranking
 
@@ -133,7 +214,11 @@ async def get_market_ranking(
 
 
 @router.get("/location/{property_id}", response_model=LocationAnalysis)
-async def get_location_analysis(property_id: str):
+@cached_query("location")
+async def get_location_analysis(
+    property_id: str,
+    region_codes: List[str] = Depends(get_region_codes)
+):
     """
     입지 분석
 
@@ -141,18 +226,10 @@ async def get_location_analysis(property_id: str):
     (역세권, 학군, 상권 접근성 등)
     """
     try:
-        # 전체 매물 조회
-        all_properties = await molit_service.fetch_all_properties(
-            settings.MAPO_REGION_CODE, 12
-        )
-
-        # 매물 검색
-        property_found = next(
-            (p for p in all_properties if p.id == property_id),
-            None
-        )
+        # 매물 검색 (ID 인덱스)
+        property_found = await molit_service.find_property(region_codes, property_id)
 
-        if not property_found:
+        if property_found is None:
             raise HTTPException(status_code=404, detail="매물을 찾을 수 없습니다.")
 
         # 입지 분석
@@ -167,8 +244,10 @@ async def get_location_analysis(property_id: str):
 
 
 @router.get("/area-price-changes")
+@cached_query("area-price-changes")
 async def get_area_price_changes(
-    months: int = Query(12, ge=1, le=24, description="조회 개월 수")
+    months: int = Query(12, ge=1, le=24, description="조회 개월 수"),
+    region_codes: List[str] = Depends(get_region_codes)
 ):
     """
     평형대별 가격 변화율
@@ -176,16 +255,14 @@ async def get_area_price_changes(
     평형대별 가격 변화율을 분석합니다.
     """
     try:
-        # 전체 매물 조회
-        all_properties = await molit_service.fetch_all_properties(
-            settings.MAPO_REGION_CODE, months
-        )
+        # 집계 큐브 조회
+        cube = await molit_service.fetch_cube(region_codes, months)
 
-        if not all_properties:
+        if not len(cube):
             raise HTTPException(status_code=404, detail="데이터가 없습니다.")
 
         # 평형대별 가격 변화 분석
-        changes = price_analyzer.calculate_area_price_changes(all_properties)
+        changes = price_analyzer.calculate_area_price_changes(cube)
 
         return changes
 
@@ -0,0 +1,75 @@
+"""API 공통 의존성"""
+
+import asyncio
+import functools
+from datetime import datetime
+from fastapi import HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from typing import List, Optional
+from app.core.config import settings
+from app.core.degradation import degraded_partitions
+from app.core.regions import resolve_region_codes
+from app.services.building_info_service import building_info_service
+from app.services.molit_api_xml import molit_service_xml as molit_service
+from app.services.query_cache import query_cache
+from app.services.trade_store import trade_store
+
+
+def get_region_codes(
+    region: Optional[str] = Query(None, description="지역 (지역코드 또는 구 이름, 예: 11440, 마포구)"),
+    regions: Optional[List[str]] = Query(None, description="지역 목록 (중복 선택 가능, '서울' 지정 시 25개 구 전체)")
+) -> List[str]:
+    """요청 지역 파라미터를 지역코드 목록으로 변환 (미지정 시 마포구)"""
+    values = ([region] if region else []) + (regions or [])
+    if not values:
+        return [settings.MAPO_REGION_CODE]
+
+    try:
+        return resolve_region_codes(values)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def cached_query(route: str, enriched: bool = False):
+    """조회 결과 캐시 데코레이터 (@router.get 바로 아래에 사용)
+
+    검증을 마친 파라미터(기본값 포함, 지역은 지역코드로 변환된 값)와 현재 월로 키를 만들고,
+    저장소의 데이터셋 버전이 같으면 직렬화해 둔 응답 본문을 그대로 반환합니다.
+    버전은 저장소(meta 테이블)에서 읽으므로 같은 저장소를 쓰는 다른 워커가 반영한 변경에도 무효화됩니다.
+    enriched=True인 라우트(건축 정보로 보강한 응답)는 건축 정보 버전이 바뀌어도 무효화됩니다.
+    """
+    def decorator(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(**params):
+            # API 장애 중이거나 요청 파티션의 갱신이 실패한 동안에는
+            # 품질 저하 헤더(X-Degraded-Months)가 정확하도록 캐시를 거치지 않음
+            region_codes = params.get("region_codes") or [settings.MAPO_REGION_CODE]
+            if molit_service.circuit.is_open or molit_service.failing_partitions(
+                region_codes, params.get("months", 12)
+            ):
+                return await endpoint(**params)
+
+            # 조회 기간(최근 N개월)이 현재 월 기준이므로 월이 바뀌면 다른 키
+            key = query_cache.make_key(route, {**params, "_month": datetime.now().strftime("%Y%m")})
+            versions = {"dataset": await asyncio.to_thread(trade_store.current_version)}
+            if enriched:
+                versions["building"] = building_info_service.version
+
+            body = query_cache.get(key, versions)
+            if body is not None:
+                if "region_codes" in params:
+                    molit_service.touch_partitions(params["region_codes"], params.get("months", 12))
+                return Response(content=body, media_type="application/json")
+
+            response = JSONResponse(content=jsonable_encoder(await endpoint(**params)))
+            # 품질이 저하된 데이터로 만든 결과나 계산 도중 데이터셋이 바뀐 결과는 저장하지 않음
+            if (
+                not degraded_partitions()
+                and await asyncio.to_thread(trade_store.current_version) == versions["dataset"]
+            ):
+                query_cache.put(key, versions, response.body)
+            return response
+
+        return wrapper
+    return decorator
@@ -1,23 +1,65 @@
-from fastapi import APIRouter, Query, HTTPException
+import asyncio
+import numpy as np
+from datetime import date
+from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import StreamingResponse
 from typing import Optional, List
 from app.models.schemas import (
+    ApartmentSuggestion,
+    ExportFormat,
     Property,
     PropertyListResponse,
     PropertyStatsResponse,
-    PropertyType
+    PropertyType,
+    SortOrder,
+    TradeChangeFeed,
+    TradeSort
 )
 from app.services.molit_api_xml import molit_service_xml as molit_service
+from app.services.trade_export import iter_csv, iter_ndjson
+from app.services.trade_index import apartment_name_counts, apartment_name_index
+from app.services.trade_query import TradeQuery, decode_cursor, encode_cursor
+from app.services.trade_store import trade_store
 from app.services.r114_crawler import r114_crawler
 from app.services.building_info_service import building_info_service
-from app.core.config import settings
+from app.api.dependencies import cached_query, get_region_codes
 
 router = APIRouter()
 
 
+def _build_query(
+    property_type: Optional[PropertyType],
+    min_area: Optional[float],
+    max_area: Optional[float],
+    min_price: Optional[int],
+    max_price: Optional[int],
+    apartment_name: Optional[str],
+    dongs: Optional[List[str]],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> TradeQuery:
+    """목록 조회 파라미터를 필터 조건으로 변환"""
+    return TradeQuery(
+        property_type=property_type.value if property_type else None,
+        min_area=min_area,
+        max_area=max_area,
+        min_price=min_price,
+        max_price=max_price,
+        apartment_name=apartment_name,
+        dongs=dongs,
+        start_date=start_date,
+        end_date=end_date
+    )
+
+
 @router.get("/trades", response_model=PropertyListResponse)
+@cached_query("trades", enriched=True)
 async def get_trade_history(
-    page: int = Query(1, ge=1, description="페이지 번호"),
+    page: int = Query(1, ge=1, description="페이지 번호 (cursor 지정 시 무시)"),
     page_size: int = Query(50, ge=1, le=10000, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    sort: TradeSort = Query(TradeSort.DEAL_DATE, description="정렬 기준"),
+    order: SortOrder = Query(SortOrder.DESC, description="정렬 방향"),
     property_type: Optional[PropertyType] = Query(None, description="매물 유형"),
     min_area: Optional[float] = Query(None, ge=0, description="최소 면적(㎡)"),
     max_area: Optional[float] = Query(None, ge=0, description="최대 면적(㎡)"),
@@ -25,72 +67,42 @@ async def get_trade_history(
     max_price: Optional[int] = Query(None, ge=0, description="최대 가격(만원)"),
     apartment_name: Optional[str] = Query(None, description="아파트명"),
     dongs: Optional[List[str]] = Query(None, description="동 목록 (중복 선택 가능)"),
-    months: int = Query(12, ge=1, le=24, description="조회 개월 수")
+    start_date: Optional[date] = Query(None, description="거래일 시작 (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="거래일 끝 (YYYY-MM-DD)"),
+    months: int = Query(12, ge=1, le=24, description="조회 개월 수"),
+    region_codes: List[str] = Depends(get_region_codes)
 ):
     """
     실거래가 내역 조회 (시세 분석용)
 
     국토교통부 실거래가 데이터를 조회합니다.
     시세 분석, 가격 추이 등에 사용됩니다.
+
+    정렬 기준이 같으면 동점도 매물 ID 순으로 항상 같은 순서입니다.
+    다음 페이지는 응답의 next_cursor를 cursor로 넘겨 조회하며, 몇 번째 페이지든 조회 비용이 같습니다.
     """
+    descending = order == SortOrder.DESC
+    try:
+        after = decode_cursor(cursor, sort.value, descending) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         # 국토교통부 실거래가 데이터만 조회
-        all_properties = await molit_service.fetch_all_properties(
-            settings.MAPO_REGION_CODE, months
-        )
+        frame = await molit_service.fetch_frame(region_codes, months)
 
-        print(f"📊 국토교통부 실거래가 데이터: {len(all_properties)}건")
+        print(f"📊 국토교통부 실거래가 데이터: {len(frame)}건")
 
-        # 필터링
-        filtered_properties = all_properties
-
-        if property_type:
-            filtered_properties = [
-                p for p in filtered_properties
-                if p.property_type == property_type
-            ]
-
-        if min_area is not None:
-            filtered_properties = [
-                p for p in filtered_properties
-                if p.exclusive_area >= min_area
-            ]
-
-        if max_area is not None:
-            filtered_properties = [
-                p for p in filtered_properties
-                if p.exclusive_area <= max_area
-            ]
-
-        if min_price is not None:
-            filtered_properties = [
-                p for p in filtered_properties
-                if p.deal_amount >= min_price
-            ]
-
-        if max_price is not None:
-            filtered_properties = [
-                p for p in filtered_properties
-                if p.deal_amount <= max_price
-            ]
-
-        if apartment_name:
-            filtered_properties = [
-                p for p in filtered_properties
-                if apartment_name.lower() in p.apartment_name.lower()
-            ]
-
-        if dongs:
-            filtered_properties = [
-                p for p in filtered_properties
-                if p.dong in dongs
-            ]
-
-        # 페이지네이션
-        total = len(filtered_properties)
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_properties = filtered_properties[start_idx:end_idx]
+        # 필터링, 정렬 및 페이지네이션 (응답에 포함되는 행만 Property로 변환)
+        query = _build_query(
+            property_type, min_area, max_area, min_price, max_price, apartment_name, dongs,
+            start_date, end_date
+        )
+        offset = 0 if after is not None else (page - 1) * page_size
+        page_indices, total, next_key = query.seek(
+            frame, sort.value, descending, after, offset, page_size
+        )
+        paginated_properties = frame.to_properties(page_indices)
 
         # 건축 정보 추가 (용적률, 건폐율, 대지지분)
         enriched_properties = [
@@ -102,13 +114,64 @@ async def get_trade_history(
             total=total,
             properties=enriched_properties,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            next_cursor=encode_cursor(sort.value, descending, next_key) if next_key else None
         )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"실거래가 조회 중 오류 발생: {str(e)}")
 
 
+@router.get("/trades/export")
+async def export_trade_history(
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="내보내기 형식 (ndjson/csv)"),
+    sort: TradeSort = Query(TradeSort.DEAL_DATE, description="정렬 기준"),
+    order: SortOrder = Query(SortOrder.DESC, description="정렬 방향"),
+    property_type: Optional[PropertyType] = Query(None, description="매물 유형"),
+    min_area: Optional[float] = Query(None, ge=0, description="최소 면적(㎡)"),
+    max_area: Optional[float] = Query(None, ge=0, description="최대 면적(㎡)"),
+    min_price: Optional[int] = Query(None, ge=0, description="최소 가격(만원)"),
+    max_price: Optional[int] = Query(None, ge=0, description="최대 가격(만원)"),
+    apartment_name: Optional[str] = Query(None, description="아파트명"),
+    dongs: Optional[List[str]] = Query(None, description="동 목록 (중복 선택 가능)"),
+    start_date: Optional[date] = Query(None, description="거래일 시작 (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="거래일 끝 (YYYY-MM-DD)"),
+    months: int = Query(12, ge=1, le=24, description="조회 개월 수"),
+    region_codes: List[str] = Depends(get_region_codes)
+):
+    """
+    실거래가 내역 내보내기 (NDJSON/CSV 스트리밍)
+
+    /trades와 같은 필터·정렬 조건의 전체 결과를 페이지 없이 내려받습니다.
+    응답 모델을 거치지 않고 일정 행 수씩 변환해 바로 전송하므로
+    결과 크기와 무관하게 메모리 사용량이 일정합니다.
+    """
+    try:
+        frame = await molit_service.fetch_frame(region_codes, months)
+
+        query = _build_query(
+            property_type, min_area, max_area, min_price, max_price, apartment_name, dongs,
+            start_date, end_date
+        )
+        rows = query.ordered(frame, sort.value, order == SortOrder.DESC)
+
+        print(f"📤 실거래가 내보내기 ({format.value}): {len(rows)}건")
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"실거래가 내보내기 중 오류 발생: {str(e)}")
+
+    if format == ExportFormat.CSV:
+        body, media_type = iter_csv(frame, rows), "text/csv"
+    else:
+        body, media_type = iter_ndjson(frame, rows), "application/x-ndjson"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="trades.{format.value}"'}
+    )
+
+
 @router.get("/listings", response_model=PropertyListResponse)
 async def get_current_listings(
     page: int = Query(1, ge=1, description="페이지 번호"),
@@ -133,56 +196,9 @@ async def get_current_listings(
 
         print(f"📊 부동산114 현재 매물: {len(all_properties)}건")
 
-        # 필터링
-        filtered_properties = all_properties
-
-        if property_type:
-            filtered_properties = [
-                p for p in filtered_properties
-                if p.property_type == property_type
-            ]
-
-        if min_area is not None:
-            filtered_properties = [
-                p for p in filtered_properties
-                if p.exclusive_area >= min_area
-            ]
-
-        if max_area is not None:
-            filtered_properties = [
-                p for p in filtered_properties
-                if p.exclusive_area <= max_area
-            ]
-
-        if min_price is not None:
-            filtered_properties = [
-                p for p in filtered_properties
-                if p.deal_amount >= min_price
-            ]
-
-        if max_price is not None:
-            filtered_properties = [
-                p for p in filtered_properties
-                if p.deal_amount <= max_price
-            ]
-
-        if apartment_name:
-            filtered_properties = [
-                p for p in filtered_properties
-                if apartment_name.lower() in p.apartment_name.lower()
-            ]
-
-        if dongs:
-            filtered_properties = [
-                p for p in filtered_properties
-                if p.dong in dongs
-            ]
-
-        # 페이지네이션
-        total = len(filtered_properties)
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_properties = filtered_properties[start_idx:end_idx]
+        # 필터링 및 페이지네이션 (한 번 순회)
+        query = _build_query(property_type, min_area, max_area, min_price, max_price, apartment_name, dongs)
+        paginated_properties, total = query.paginate(all_properties, (page - 1) * page_size, page_size)
 
         # 건축 정보 추가 (용적률, 건폐율, 대지지분)
         enriched_properties = [
@@ -201,26 +217,72 @@ async def get_current_listings(
         raise HTTPException(status_code=500, detail=f"현재 매물 조회 중 오류 발생: {str(e)}")
 
 
+@router.get("/autocomplete", response_model=List[ApartmentSuggestion])
+@cached_query("autocomplete")
+async def autocomplete_apartment_names(
+    q: str = Query(..., min_length=1, description="검색어 (단지명 일부)"),
+    limit: int = Query(10, ge=1, le=50, description="최대 개수"),
+    months: int = Query(12, ge=1, le=24, description="조회 개월 수"),
+    region_codes: List[str] = Depends(get_region_codes)
+):
+    """
+    단지명 자동완성
+
+    조회 기간에 거래가 있는 단지 중 검색어를 포함하는 단지명을 반환합니다.
+    공백과 표기 변형(레미안/래미안 등)은 무시하며, 검색어로 시작하는 단지와 거래가 많은 단지가 먼저 나옵니다.
+    """
+    try:
+        frame = await molit_service.fetch_frame(region_codes, months)
+
+        counts = apartment_name_counts(frame)
+        codes = apartment_name_index(frame).suggest(q, counts, limit)
+
+        return [
+            ApartmentSuggestion(
+                apartment_name=frame.apartment_name.categories[code],
+                deal_count=int(counts[code])
+            )
+            for code in codes
+        ]
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"단지명 검색 중 오류 발생: {str(e)}")
+
+
+@router.get("/changes", response_model=TradeChangeFeed)
+async def get_trade_changes(
+    since: int = Query(0, ge=0, description="마지막으로 받은 데이터셋 버전"),
+    limit: int = Query(1000, ge=1, le=10000, description="최대 변경 건수")
+):
+    """
+    실거래 변경 내역 (change feed)
+
+    since 버전 이후 추가/수정/삭제된 실거래 내역을 조회합니다.
+    응답의 next_since를 다음 요청의 since로 사용하세요.
+    reset이 true이면 보관 기간이 지난 내역이 있으므로 전체 데이터를 다시 조회해야 합니다.
+    """
+    try:
+        return await asyncio.to_thread(trade_store.get_changes, since, limit)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"변경 내역 조회 중 오류 발생: {str(e)}")
+
+
 @router.get("/{property_id}", response_model=Property)
-async def get_property(property_id: str):
+async def get_property(
+    property_id: str,
+    region_codes: List[str] = Depends(get_region_codes)
+):
     """
     매물 상세 조회
 
     특정 매물의 상세 정보를 조회합니다.
     """
     try:
-        # 전체 매물 조회 (캐시 활용)
-        all_properties = await molit_service.fetch_all_properties(
-            settings.MAPO_REGION_CODE, 12
-        )
+        # 매물 검색 (ID 인덱스)
+        property_found = await molit_service.find_property(region_codes, property_id)
 
-        # 매물 검색
-        property_found = next(
-            (p for p in all_properties if p.id == property_id),
-            None
-        )
-
-        if not property_found:
+        if property_found is None:
             raise HTTPException(status_code=404, detail="매물을 찾을 수 없습니다.")
 
         return property_found
@@ -232,9 +294,11 @@ async def get_property(property_id: str):
 
 
 @router.get("/stats/summary", response_model=PropertyStatsResponse)
+@cached_query("stats-summary")
 async def get_property_stats(
     property_type: Optional[PropertyType] = Query(None, description="매물 유형"),
-    months: int = Query(12, ge=1, le=24, description="조회 개월 수")
+    months: int = Query(12, ge=1, le=24, description="조회 개월 수"),
+    region_codes: List[str] = Depends(get_region_codes)
 ):
     """
     매물 통계 요약
@@ -242,49 +306,42 @@ async def get_property_stats(
     매물의 전반적인 통계 정보를 제공합니다.
     """
     try:
-        # 전체 매물 조회
-        all_properties = await molit_service.fetch_all_properties(
-            settings.MAPO_REGION_CODE, months
-        )
+        # 집계 큐브 조회 (파티션 수집 시 만든 칸 단위 집계)
+        cube = await molit_service.fetch_cube(region_codes, months)
 
         # 필터링
-        if property_type:
-            all_properties = [
-                p for p in all_properties
-                if p.property_type == property_type
-            ]
+        selected = cube.select(property_type.value if property_type else None)
 
-        if not all_properties:
-            raise HTTPException(status_code=404, detail="데이터가 없습니다.")
+        # 통계 계산 (선택한 칸 합산)
+        stats = cube.aggregate(np.where(selected, 0, -1), 1, sketches=True)
+        total_properties = int(stats.count[0])
 
-        # 통계 계산
-        valid_properties = [p for p in all_properties if p.deal_amount > 0]
+        if not total_properties:
+            raise HTTPException(status_code=404, detail="데이터가 없습니다.")
 
-        total_properties = len(valid_properties)
-        avg_price = sum(p.deal_amount for p in valid_properties) / total_properties
-        avg_area = sum(p.exclusive_area for p in valid_properties) / total_properties
+        avg_price = float(stats.price_mean[0])
+        avg_area = float(stats.area_mean[0])
 
-        prices = [p.deal_amount for p in valid_properties]
         price_range = {
-            "min": min(prices),
-            "max": max(prices),
-            "median": sorted(prices)[len(prices) // 2]
+            "min": int(stats.price_min[0]),
+            "max": int(stats.price_max[0]),
+            "median": int(stats.sketches[0].quantile(0.5))
         }
 
-        # 면적 분포
-        area_distribution = {
-            "10평 이하": len([p for p in valid_properties if p.exclusive_area < 33]),
-            "10-20평": len([p for p in valid_properties if 33 <= p.exclusive_area < 66]),
-            "20-30평": len([p for p in valid_properties if 66 <= p.exclusive_area < 99]),
-            "30-40평": len([p for p in valid_properties if 99 <= p.exclusive_area < 132]),
-            "40평 이상": len([p for p in valid_properties if p.exclusive_area >= 132])
-        }
+        # 면적 분포 (평형대 필터와 같은 규칙 - 범위 밖/미상 면적은 제외)
+        area_distribution = cube.area_distribution(selected)
 
         # 매물 유형 분포
-        property_type_distribution = {}
-        for prop in valid_properties:
-            prop_type = prop.property_type.value
-            property_type_distribution[prop_type] = property_type_distribution.get(prop_type, 0) + 1
+        type_counts = np.bincount(
+            cube.property_type.codes[selected],
+            weights=cube.count[selected],
+            minlength=len(cube.property_type.categories)
+        )
+        property_type_distribution = {
+            prop_type: int(count)
+            for prop_type, count in zip(cube.property_type.categories, type_counts.tolist())
+            if count
+        }
 
         return PropertyStatsResponse(
             total_properties=total_properties,
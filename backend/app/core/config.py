@@ -9,10 +9,40 @@ class Settings(BaseSettings):
     # API 설정
     MOLIT_API_KEY: str = ""
     MOLIT_API_BASE_URL: str = "https://apis.data.go.kr/1613000"
+    MOLIT_MAX_CONCURRENCY: int = 8  # 국토부 API 동시 요청 상한
+    MOLIT_REQUEST_TIMEOUT: float = 15.0  # 요청 타임아웃(초)
+    MOLIT_PAGE_SIZE: int = 1000  # 페이지당 조회 건수 (numOfRows)
+    MOLIT_TRADE_TYPES: str = "아파트"  # 조회할 매물 유형 (쉼표 구분, 예: 아파트,오피스텔,연립다세대 - API별 활용신청 필요)
+
+    # 국토부 API 장애 대응 설정
+    MOLIT_RATE_LIMIT_PER_SEC: float = 10.0  # 초당 요청 수 (API 할당량에 맞춤)
+    MOLIT_RATE_LIMIT_BURST: int = 20  # 순간 최대 요청 수
+    MOLIT_MAX_RETRIES: int = 2  # 일시적 오류 재시도 횟수
+    MOLIT_RETRY_BASE_DELAY: float = 0.5  # 재시도 기본 대기(초, 지수 증가 + jitter)
+    MOLIT_RETRY_MAX_DELAY: float = 4.0  # 재시도 최대 대기(초)
+    MOLIT_CIRCUIT_FAILURE_THRESHOLD: int = 5  # 서킷 브레이커 열림 기준 연속 실패 수
+    MOLIT_CIRCUIT_RESET_TIMEOUT: float = 30.0  # 서킷 브레이커 열림 유지 시간(초)
 
     # 캐시 설정
     CACHE_DURATION: int = 3600  # 1시간
     CACHE_DIR: str = "app/data/cache"
+    QUERY_CACHE_MAX_MB: int = 64  # 조회 결과 캐시 메모리 예산(MB)
+
+    # 실거래 저장소 설정
+    TRADE_STORE_PATH: str = "app/data/cache/trades.sqlite3"
+    TRADE_REPORTING_LAG_MONTHS: int = 1  # 신고 기한 (이 기간이 지난 달은 재조회하지 않음)
+    TRADE_CHANGE_RETENTION_DAYS: int = 30  # 변경 내역(change feed) 보관 기간(일)
+
+    # 백그라운드 갱신 설정
+    TRADE_REFRESH_INTERVAL: int = 60  # 갱신 대상 점검 주기(초)
+    TRADE_REFRESH_AHEAD_RATIO: float = 0.8  # 만료 전 선제 갱신 시점 (CACHE_DURATION 대비 비율)
+    TRADE_HOT_WINDOW: int = 21600  # 최근 요청된 파티션을 갱신 대상으로 유지하는 시간(초)
+    TRADE_REFRESH_RETRY_COOLDOWN: float = 60.0  # 갱신 실패 후 같은 파티션 재시도 대기(초, 연속 실패 시 두 배씩 증가)
+    TRADE_REFRESH_RETRY_MAX_COOLDOWN: float = 3600.0  # 갱신 실패 후 재시도 최대 대기(초)
+
+    # 건축 정보 설정
+    BUILDING_INFO_PATH: str = ""  # 건축 정보 JSON 또는 건축물대장 저장소(.sqlite3) 경로 (비우면 app/data/apartment_building_info.json)
+    BUILDING_INFO_WATCH_INTERVAL: float = 30.0  # 원본 파일 변경 점검 주기(초, 0이면 점검 안 함)
 
     # CORS 설정
     CORS_ORIGINS: str = "http://localhost:5173,http://localhost:3000"
@@ -0,0 +1,54 @@
+"""요청 단위 데이터 품질 저하(degraded) 추적
+
+외부 API 장애로 비어 있거나 갱신에 실패한 만료 데이터로 응답한 파티션을
+요청별로 모아 응답 헤더(X-Degraded-Months)로 알려줍니다.
+"""
+
+from contextvars import ContextVar
+from typing import List, Optional, Set
+
+DEGRADED_HEADER = "X-Degraded-Months"
+
+_degraded_partitions: ContextVar[Optional[Set[str]]] = ContextVar("degraded_partitions", default=None)
+
+
+def mark_degraded(region_code: str, deal_ymd: str):
+    """현재 요청에서 품질이 저하된 파티션 기록"""
+    partitions = _degraded_partitions.get()
+    if partitions is not None:
+        partitions.add(f"{region_code}:{deal_ymd}")
+
+
+def degraded_partitions() -> List[str]:
+    """현재 요청에서 품질이 저하된 파티션 목록"""
+    return sorted(_degraded_partitions.get() or [])
+
+
+class DegradationMiddleware:
+    """품질이 저하된 파티션을 응답 헤더에 추가하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        partitions: Set[str] = set()
+        token = _degraded_partitions.set(partitions)
+
+        async def send_with_header(message):
+            if message["type"] == "http.response.start" and partitions:
+                headers = list(message.get("headers", []))
+                headers.append((
+                    DEGRADED_HEADER.lower().encode("latin-1"),
+                    ",".join(sorted(partitions)).encode("latin-1")
+                ))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_header)
+        finally:
+            _degraded_partitions.reset(token)
@@ -0,0 +1,69 @@
+"""시군구 지역코드 (국토부 API LAWD_CD)"""
+
+from typing import Dict, Iterable, List
+
+# 서울특별시 25개 자치구
+SEOUL_REGION_CODES: Dict[str, str] = {
+    "종로구": "11110",
+    "중구": "11140",
+    "용산구": "11170",
+    "성동구": "11200",
+    "광진구": "11215",
+    "동대문구": "11230",
+    "중랑구": "11260",
+    "성북구": "11290",
+    "강북구": "11305",
+    "도봉구": "11320",
+    "노원구": "11350",
+    "은평구": "11380",
+    "서대문구": "11410",
+    "마포구": "11440",
+    "양천구": "11470",
+    "강서구": "11500",
+    "구로구": "11530",
+    "금천구": "11545",
+    "영등포구": "11560",
+    "동작구": "11590",
+    "관악구": "11620",
+    "서초구": "11650",
+    "강남구": "11680",
+    "송파구": "11710",
+    "강동구": "11740",
+}
+
+# 이름 -> 지역코드
+REGION_CODES: Dict[str, str] = {**SEOUL_REGION_CODES}
+
+# 지역 그룹 (여러 시군구를 한 번에 지정)
+REGION_GROUPS: Dict[str, List[str]] = {
+    "서울": list(SEOUL_REGION_CODES.values()),
+    "seoul": list(SEOUL_REGION_CODES.values()),
+}
+
+# 지역코드 -> 이름
+REGION_NAMES: Dict[str, str] = {code: name for name, code in REGION_CODES.items()}
+
+
+def resolve_region_codes(values: Iterable[str]) -> List[str]:
+    """지역코드/시군구 이름/지역 그룹을 지역코드 목록으로 변환
+
+    순서를 유지하며 중복은 제거합니다. 알 수 없는 값이 있으면 ValueError를 발생시킵니다.
+    """
+    region_codes: List[str] = []
+
+    for value in values:
+        value = value.strip()
+        if value in REGION_GROUPS:
+            codes = REGION_GROUPS[value]
+        elif value in REGION_CODES:
+            codes = [REGION_CODES[value]]
+        elif value in REGION_NAMES:
+            codes = [value]
+        else:
+            raise ValueError(f"알 수 없는 지역입니다: {value}")
+
+        for code in codes:
+            if code not in region_codes:
+                region_codes.append(code)
+
+    return region_codes
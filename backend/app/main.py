@@ -1,12 +1,36 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.api import properties, analysis
+from app.core.degradation import DEGRADED_HEADER, DegradationMiddleware
+from app.api import admin, properties, analysis
+from app.services.building_info_service import building_info_service
+from app.services.molit_api_xml import molit_service_xml
+from app.services.query_cache import query_cache
+from app.services.trade_refresher import trade_refresher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 시작/종료 처리"""
+    # 실거래 데이터 백그라운드 갱신 시작
+    trade_refresher.start()
+    # 건축 정보 원본 파일 변경 점검 시작
+    building_info_service.start_watching()
+    yield
+    await building_info_service.stop_watching()
+    # 건축 정보 저장소 연결 정리
+    building_info_service.close()
+    await trade_refresher.stop()
+    # 공유 HTTP 커넥션 풀 정리
+    await molit_service_xml.aclose()
+
 
 app = FastAPI(
     title="마포구 부동산 정보 API",
     description="국토교통부 실거래가 데이터 기반 부동산 정보 조회 및 분석 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -16,11 +40,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[DEGRADED_HEADER],
 )
 
+# 외부 API 장애로 품질이 저하된 월 표시 (X-Degraded-Months 헤더)
+app.add_middleware(DegradationMiddleware)
+
 # 라우터 등록
 app.include_router(properties.router, prefix="/api/properties", tags=["매물"])
 app.include_router(analysis.router, prefix="/api/analysis", tags=["분석"])
+app.include_router(admin.router, prefix="/api/admin", tags=["관리"])
 
 
 @app.get("/")
@@ -36,4 +65,10 @@ async def root():
 @app.get("/health")
 async def health_check():
     """헬스 체크 엔드포인트"""
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "trade_loader": molit_service_xml.loader_stats(),
+        "trade_refresher": trade_refresher.stats(),
+        "building_info": building_info_service.stats(),
+        "query_cache": query_cache.stats()
+    }
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from enum import Enum
 
@@ -11,10 +11,47 @@ class PropertyType(str, Enum):
     MULTIPLEX = "연립다세대"
 
 
+class TradeSort(str, Enum):
+    """실거래 목록 정렬 기준"""
+    DEAL_DATE = "deal_date"
+    PRICE = "price"
+    AREA = "area"
+    PRICE_PER_PYEONG = "price_per_pyeong"
+
+
+class AreaGroup(str, Enum):
+    """평형대 (3.3㎡ = 1평)"""
+    UNDER_10 = "10평 이하"
+    FROM_10_TO_20 = "10-20평"
+    FROM_20_TO_30 = "20-30평"
+    FROM_30_TO_40 = "30-40평"
+    OVER_40 = "40평 이상"
+
+
+class TrendGroupBy(str, Enum):
+    """가격 추이 그룹 기준"""
+    AREA = "area"  # 평형대
+    APARTMENT = "apartment"  # 단지
+    DONG = "dong"  # 동
+
+
+class SortOrder(str, Enum):
+    """정렬 방향"""
+    ASC = "asc"
+    DESC = "desc"
+
+
+class ExportFormat(str, Enum):
+    """내보내기 형식"""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 class Property(BaseModel):
     """부동산 매물 정보"""
     id: str
     property_type: PropertyType
+    region_code: Optional[str] = None  # 시군구 지역코드 (LAWD_CD)
     dong: str  # 동
     jibun: str  # 지번
     apartment_name: str  # 아파트명
@@ -60,6 +97,24 @@ class MarketStats(BaseModel):
     price_distribution: Optional[dict] = None  # 가격 분포
 
 
+class PriceBucket(BaseModel):
+    """가격 구간"""
+    min_price: float  # 구간 하한
+    max_price: float  # 구간 상한 (마지막 구간은 최고가 포함)
+    deal_count: int  # 거래 건수 (추정)
+
+
+class PriceDistribution(BaseModel):
+    """가격 분포 (분위수 스케치 기반)"""
+    deal_count: int  # 거래 건수
+    avg_price: float  # 평균 가격
+    min_price: float  # 최저가
+    max_price: float  # 최고가
+    percentiles: Dict[str, float]  # 백분위 가격 (예: {"p50": 중앙값})
+    histogram: List[PriceBucket]  # 최저가~최고가 같은 폭 구간별 건수
+    rank_error: float  # 정규화 순위 오차 상한 (0이면 정확, 0.0165면 백분위 순위 ±1.65%)
+
+
 class LocationScore(BaseModel):
     """입지 점수"""
     subway_score: float = Field(ge=0, le=100)  # 역세권 점수
@@ -108,6 +163,7 @@ class PropertyListResponse(BaseModel):
     properties: List[Property]
     page: int = 1
     page_size: int = 50
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
 
 
 class PropertyStatsResponse(BaseModel):
@@ -118,3 +174,29 @@ class PropertyStatsResponse(BaseModel):
     price_range: dict
     area_distribution: dict
     property_type_distribution: dict
+
+
+class ApartmentSuggestion(BaseModel):
+    """단지명 자동완성 항목"""
+    apartment_name: str
+    deal_count: int  # 조회 기간 거래 건수
+
+
+class TradeChange(BaseModel):
+    """실거래 변경 내역"""
+    version: int  # 변경이 반영된 데이터셋 버전
+    op: str  # insert / update / delete
+    region_code: str
+    deal_ymd: str  # 거래년월 (YYYYMM)
+    trade_key: str  # 거래 키
+    property: Property  # 변경 후 데이터 (delete는 삭제 전 데이터)
+
+
+class TradeChangeFeed(BaseModel):
+    """실거래 변경 내역 응답"""
+    version: int  # 현재 데이터셋 버전
+    since: int
+    next_since: int  # 다음 요청에 사용할 since
+    has_more: bool
+    reset: bool = False  # 보관 기간 경과로 전체 재조회가 필요한지 여부
+    changes: List[TradeChange]
@@ -1,79 +1,336 @@
 """아파트 건축 정보 서비스"""
 
+import asyncio
 import json
 import os
-from typing import Dict, Optional
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
 from app.models.schemas import Property
+from app.services.building_store import BuildingStore
+from app.services.name_index import NameIndex
+
+DEFAULT_DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'apartment_building_info.json')
+
+# 건축물대장 저장소(SQLite) 파일 확장자
+STORE_EXTENSIONS = (".sqlite3", ".sqlite", ".db")
+
+# 단지명 표기 변형 (대소문자 차이는 정규화 마지막에 소문자로 통일)
+NAME_VARIANTS = {
+    "레미안": "래미안",
+}
+
+# 조회 결과 캐시에서 "일치하는 단지 없음"을 나타내는 값
+_NO_MATCH: dict = {}
+
+
+def normalize_apartment_name(name: str) -> str:
+    """아파트명 정규화 (공백, 특수문자 제거)"""
+    if not name:
+        return ""
+
+    # 공백 제거
+    normalized = name.replace(" ", "").replace("　", "")
+
+    # 흔한 변형 처리 (SK뷰/DMC/E편한세상 등 대소문자 변형은 소문자 변환으로 처리)
+    for old, new in NAME_VARIANTS.items():
+        normalized = normalized.replace(old, new)
+
+    return normalized.lower()
+
+
+class BuildingRegistry(ABC):
+    """건축 정보 스냅샷
+
+    만든 뒤에는 데이터와 인덱스를 바꾸지 않으므로 서비스는 참조 하나만 교체해 새 스냅샷으로 전환하고,
+    조회 중인 요청은 시작할 때 잡은 스냅샷을 끝까지 사용합니다.
+    이름별 조회 결과(일치 없음 포함)를 기억하므로 같은 단지명은 한 번만 찾습니다.
+
+    정확히 같은 이름이 없으면 정규화한 이름끼리 한쪽이 다른 쪽을 포함하는 단지 중 원본 순서상 첫 단지를 찾습니다.
+    """
+
+    def __init__(self, version: int = 0, source_signature: Optional[Tuple[int, int]] = None):
+        self.version = version
+        # 원본 파일 (수정 시각 ns, 크기)
+        self.source_signature = source_signature
+        self.loaded_at = time.time()
+        self.matches: Dict[str, dict] = {}
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """단지 수"""
+
+    def lookup(self, apartment_name: str) -> Optional[dict]:
+        """아파트 건축 정보 조회"""
+        info = self.matches.get(apartment_name)
+        if info is None:
+            info = self.matches[apartment_name] = self._find(apartment_name) or _NO_MATCH
+        return info if info is not _NO_MATCH else None
+
+    @abstractmethod
+    def _find(self, apartment_name: str) -> Optional[dict]:
+        """단지명으로 건축 정보 검색 (일치하는 단지가 없으면 None)"""
+
+    def close(self):
+        """스냅샷이 사용하는 자원 정리 (교체된 뒤 호출)"""
+
+    @staticmethod
+    def _substrings(normalized: str) -> List[str]:
+        """검색어의 모든 부분 문자열 (빈 문자열 포함)"""
+        return list({
+            normalized[start:end]
+            for start in range(len(normalized) + 1)
+            for end in range(start, len(normalized) + 1)
+        })
+
+
+class JSONBuildingRegistry(BuildingRegistry):
+    """JSON 건축 정보 스냅샷 (단지명 -> 건축 정보 dict 전체를 메모리에 보관)
+
+    단지명은 생성 시 한 번만 정규화해 정규화 이름 -> 위치 dict와 n-gram 역색인을 만듭니다.
+    """
+
+    def __init__(
+        self,
+        data: Dict[str, dict],
+        version: int = 0,
+        source_signature: Optional[Tuple[int, int]] = None
+    ):
+        super().__init__(version, source_signature)
+        self.data = data
+
+        self.names: List[str] = list(data)
+        self.name_index = NameIndex(self.names, normalize_apartment_name)
+
+        # 정규화 이름이 같은 단지가 여럿이면 앞의 단지 (기존 순차 비교와 같은 결과)
+        self.positions: Dict[str, int] = {}
+        for position, normalized in enumerate(self.name_index.normalized):
+            self.positions.setdefault(normalized, position)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def _find(self, apartment_name: str) -> Optional[dict]:
+        # 정확한 매칭 시도
+        info = self.data.get(apartment_name)
+        if info is not None:
+            return info
+
+        # 검색어를 포함하는 단지 (n-gram 역색인, 위치 오름차순)
+        containing = self.name_index.search(apartment_name)
+        first = containing[0] if containing else len(self.names)
+
+        # 검색어에 포함되는 단지 (검색어의 부분 문자열 중 단지명과 정확히 같은 것)
+        for substring in self._substrings(normalize_apartment_name(apartment_name)):
+            position = self.positions.get(substring)
+            if position is not None and position < first:
+                first = position
+
+        return self.data[self.names[first]] if first < len(self.names) else None
+
+
+class StoreBuildingRegistry(BuildingRegistry):
+    """건축물대장 저장소(SQLite) 스냅샷
+
+    파일을 읽기 전용으로 열기만 하고 필요한 단지만 색인으로 조회합니다.
+    """
+
+    def __init__(
+        self,
+        store: BuildingStore,
+        version: int = 0,
+        source_signature: Optional[Tuple[int, int]] = None
+    ):
+        super().__init__(version, source_signature)
+        self.store = store
+
+    def __len__(self) -> int:
+        return self.store.count
+
+    def _find(self, apartment_name: str) -> Optional[dict]:
+        # 정확한 매칭 시도
+        info = self.store.get(apartment_name)
+        if info is not None:
+            return info
+
+        normalized = normalize_apartment_name(apartment_name)
+        candidates = [
+            self.store.first_id_containing(normalized),
+            self.store.first_id_in(self._substrings(normalized))
+        ]
+        candidates = [building_id for building_id in candidates if building_id is not None]
+        return self.store.get_by_id(min(candidates)) if candidates else None
+
+    def close(self):
+        self.store.close()
 
 
 class BuildingInfoService:
-    """아파트 건축 정보 관리 서비스"""
+    """아파트 건축 정보 관리 서비스
+
+    원본은 직접 관리하는 JSON 파일 또는 건축물대장에서 변환한 SQLite 저장소(.sqlite3/.db)입니다.
+    원본 파일이 바뀌면(주기 점검 또는 관리자 재로드 요청) 새 스냅샷과 인덱스를
+    요청 처리 경로 밖(스레드)에서 만든 뒤 한 번에 교체합니다.
+    스냅샷 버전은 교체마다 증가하며, 조회 결과 캐시는 건축 정보를 사용한 결과만 이 버전으로 무효화합니다.
+    """
+
+    def __init__(self, data_path: Optional[str] = None):
+        self.data_path = data_path or settings.BUILDING_INFO_PATH or DEFAULT_DATA_PATH
+        self.watch_interval = settings.BUILDING_INFO_WATCH_INTERVAL
+
+        self._registry: BuildingRegistry = JSONBuildingRegistry({})
+        self._reload_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        self.reload_count = 0
+        self.last_error: Optional[str] = None
+        # 로드에 실패한 원본 파일 (같은 파일로 반복 시도하지 않음)
+        self._failed_signature: Optional[Tuple[int, int]] = None
 
-    def __init__(self):
-        self.building_data: Dict[str, dict] = {}
         self.load_building_info()
 
-    def load_building_info(self):
-        """건축 정보 JSON 파일 로드"""
+    @property
+    def version(self) -> int:
+        """현재 스냅샷 버전 (로드 성공마다 증가, 미로드 시 0)"""
+        return self._registry.version
+
+    def load_building_info(self) -> bool:
+        """건축 정보 파일 로드 (실패 시 기존 스냅샷 유지)"""
+        registry = self._read_registry()
+        if registry is None:
+            return False
+        self._swap(registry)
+        return True
+
+    def _swap(self, registry: BuildingRegistry):
+        """현재 스냅샷 교체 후 이전 스냅샷 자원 정리 (저장소 연결 등)"""
+        previous, self._registry = self._registry, registry
+        previous.close()
+
+    def close(self):
+        """현재 스냅샷 자원 정리 (애플리케이션 종료 시)"""
+        self._registry.close()
+
+    def _read_registry(self) -> Optional[BuildingRegistry]:
+        """원본 파일로 새 스냅샷 생성"""
+        if not os.path.exists(self.data_path):
+            print(f"⚠️  건축 정보 파일 없음: {self.data_path}")
+            return None
+
+        signature = self._source_signature()
+        version = self._registry.version + 1
         try:
-            data_path = os.path.join(
-                os.path.dirname(__file__),
-                '..',
-                'data',
-                'apartment_building_info.json'
-            )
-
-            if os.path.exists(data_path):
-                with open(data_path, 'r', encoding='utf-8') as f:
-                    self.building_data = json.load(f)
-                print(f"✅ {len(self.building_data)}개 아파트 건축 정보 로드 완료")
+            if self.data_path.endswith(STORE_EXTENSIONS):
+                registry: BuildingRegistry = StoreBuildingRegistry(
+                    BuildingStore(self.data_path), version, signature
+                )
             else:
-                print(f"⚠️  건축 정보 파일 없음: {data_path}")
+                with open(self.data_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if not isinstance(data, dict):
+                    raise ValueError("단지명 -> 건축 정보 객체 형식이 아닙니다")
+                registry = JSONBuildingRegistry(data, version, signature)
         except Exception as e:
+            self.last_error = str(e)
+            self._failed_signature = signature
             print(f"⚠️  건축 정보 로드 실패: {e}")
+            return None
 
-    def normalize_apartment_name(self, name: str) -> str:
-        """아파트명 정규화 (공백, 특수문자 제거)"""
-        if not name:
-            return ""
-
-        # 공백 제거
-        normalized = name.replace(" ", "").replace("　", "")
-
-        # 흔한 변형 처리
-        replacements = {
-            "래미안": "래미안",
-            "레미안": "래미안",
-            "푸르지오": "푸르지오",
-            "SK뷰": "sk뷰",
-            "DMC": "dmc",
-            "e편한세상": "e편한세상",
-            "E편한세상": "e편한세상",
-        }
+        self.last_error = None
+        self._failed_signature = None
+        print(f"✅ {len(registry)}개 아파트 건축 정보 로드 완료 (버전 {registry.version})")
+        return registry
+
+    def _source_signature(self) -> Optional[Tuple[int, int]]:
+        """원본 파일 (수정 시각 ns, 크기)"""
+        try:
+            stat = os.stat(self.data_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    async def reload(self, force: bool = False) -> bool:
+        """원본 파일이 바뀌었으면(force면 항상) 새 스냅샷으로 교체
 
-        for old, new in replacements.items():
-            normalized = normalized.replace(old, new)
+        파일 읽기와 인덱스 생성은 스레드에서 수행하고, 교체는 참조 하나만 바꿉니다.
+        동시에 들어온 재로드 요청은 하나씩 처리합니다.
 
-        return normalized.lower()
+        Returns:
+            교체 여부
+        """
+        async with self._reload_lock:
+            if not force:
+                signature = self._source_signature()
+                if signature is None or signature in (
+                    self._registry.source_signature, self._failed_signature
+                ):
+                    return False
+
+            registry = await asyncio.to_thread(self._read_registry)
+            if registry is None:
+                return False
+
+            self._swap(registry)
+            self.reload_count += 1
+            return True
+
+    def start_watching(self):
+        """원본 파일 변경 점검 루프 시작 (BUILDING_INFO_WATCH_INTERVAL이 0이면 사용 안 함)"""
+        if self.watch_interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop_watching(self):
+        """원본 파일 변경 점검 루프 종료"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            try:
+                await self.reload()
+            except Exception as e:
+                print(f"⚠️  건축 정보 재로드 오류: {e}")
+
+    def stats(self) -> dict:
+        """건축 정보 스냅샷 상태"""
+        registry = self._registry
+        return {
+            "version": registry.version,
+            "complexes": len(registry),
+            "loaded_at": datetime.fromtimestamp(registry.loaded_at).isoformat(timespec="seconds"),
+            "source": self.data_path,
+            "watching": self._task is not None and not self._task.done(),
+            "reloads": self.reload_count,
+            "cached_matches": len(registry.matches),
+            "last_error": self.last_error
+        }
+
+    def normalize_apartment_name(self, name: str) -> str:
+        """아파트명 정규화 (공백, 특수문자 제거)"""
+        return normalize_apartment_name(name)
 
     def get_building_info(self, apartment_name: str) -> Optional[dict]:
-        """아파트 건축 정보 조회"""
+        """아파트 건축 정보 조회 (현재 스냅샷)"""
         if not apartment_name:
             return None
 
-        # 정확한 매칭 시도
-        if apartment_name in self.building_data:
-            return self.building_data[apartment_name]
-
-        # 정규화된 이름으로 매칭 시도
-        normalized_search = self.normalize_apartment_name(apartment_name)
-
-        for stored_name, info in self.building_data.items():
-            normalized_stored = self.normalize_apartment_name(stored_name)
-            if normalized_search in normalized_stored or normalized_stored in normalized_search:
-                return info
-
-        return None
+        registry = self._registry
+        try:
+            return registry.lookup(apartment_name)
+        except sqlite3.ProgrammingError:
+            # 조회 도중 스냅샷이 교체되어 이전 저장소 연결이 닫힌 경우 새 스냅샷으로 다시 조회
+            if registry is self._registry:
+                raise
+            return self._registry.lookup(apartment_name)
 
     def calculate_land_share(self, exclusive_area: float, total_land_area: float, total_households: int) -> float:
         """
@@ -0,0 +1,251 @@
+"""건축물대장 건축 정보 저장소 (SQLite)
+
+전국 건축물대장(총괄표제부) CSV처럼 큰 원본은 JSON으로 메모리에 올리지 않고,
+건축 정보 보강에 필요한 필드만 골라 색인된 SQLite 파일로 변환해 둡니다.
+워커는 파일을 읽기 전용으로 열기만 하므로 시작이 즉시 끝나고,
+페이지는 mmap으로 읽어 같은 서버의 워커들이 OS 페이지 캐시를 공유합니다.
+"""
+
+import csv
+import os
+import sqlite3
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+SCHEMA_VERSION = 1
+
+# 건축 정보 보강에 사용하는 필드 (JSON 건축 정보와 같은 이름)
+INFO_FIELDS = (
+    "floor_area_ratio",
+    "building_coverage_ratio",
+    "total_land_area",
+    "total_households",
+    "total_parking",
+    "build_year",
+)
+
+# 저장 필드 -> 원본 CSV 열 이름 후보 (공공데이터포털 파일 한글 헤더, 건축HUB API 필드명)
+REGISTER_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "name": ("건물명", "bldNm"),
+    "floor_area_ratio": ("용적률(%)", "용적률", "vlRat"),
+    "building_coverage_ratio": ("건폐율(%)", "건폐율", "bcRat"),
+    "total_land_area": ("대지면적(㎡)", "대지면적", "platArea"),
+    "total_households": ("세대수(세대)", "세대수", "hhldCnt"),
+    "use_approval_date": ("사용승인일", "useAprDay"),
+}
+
+# 총 주차대수 = 아래 열의 합
+PARKING_COLUMNS: Tuple[Tuple[str, ...], ...] = (
+    ("옥내기계식대수(대)", "옥내기계식대수", "indrMechUtcnt"),
+    ("옥외기계식대수(대)", "옥외기계식대수", "oudrMechUtcnt"),
+    ("옥내자주식대수(대)", "옥내자주식대수", "indrAutoUtcnt"),
+    ("옥외자주식대수(대)", "옥외자주식대수", "oudrAutoUtcnt"),
+)
+
+# 한 번에 저장하는 행 수
+IMPORT_BATCH_SIZE = 10000
+
+# 읽기 연결 mmap 크기 (파일 크기보다 크면 파일 전체를 매핑)
+MMAP_SIZE = 256 * 1024 * 1024
+
+
+def import_building_register(
+    csv_path: str,
+    output_path: str,
+    normalize: Callable[[str], str],
+    encoding: str = "utf-8-sig"
+) -> int:
+    """건축물대장 CSV를 한 행씩 읽어 저장소 파일 생성
+
+    같은 건물명이 여러 번 나오면 처음 나온 행만 저장합니다 (JSON 건축 정보의 파일 순서 우선과 동일).
+    임시 파일에 만든 뒤 교체하므로 실행 중인 서버는 항상 완성된 파일만 봅니다.
+
+    Returns:
+        저장한 단지 수
+    """
+    temp_path = f"{output_path}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+
+    conn = sqlite3.connect(temp_path)
+    try:
+        conn.executescript(f"""
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            PRAGMA user_version = {SCHEMA_VERSION};
+            CREATE TABLE buildings (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE,
+                normalized_name TEXT NOT NULL,
+                floor_area_ratio REAL,
+                building_coverage_ratio REAL,
+                total_land_area REAL,
+                total_households INTEGER,
+                total_parking INTEGER,
+                build_year INTEGER
+            );
+        """)
+
+        insert = (
+            f"INSERT OR IGNORE INTO buildings (name, normalized_name, {', '.join(INFO_FIELDS)}) "
+            f"VALUES ({', '.join('?' for _ in range(len(INFO_FIELDS) + 2))})"
+        )
+        with open(csv_path, "r", encoding=encoding, newline="") as f:
+            rows = _register_rows(csv.reader(f), normalize)
+            while True:
+                batch = [row for _, row in zip(range(IMPORT_BATCH_SIZE), rows)]
+                if not batch:
+                    break
+                conn.executemany(insert, batch)
+
+        # 색인은 적재 후 한 번에 생성
+        conn.execute("CREATE INDEX idx_buildings_normalized ON buildings (normalized_name)")
+        try:
+            # 부분 문자열 검색 (trigram 토크나이저는 SQLite 3.34 이상)
+            conn.executescript("""
+                CREATE VIRTUAL TABLE building_names USING fts5(
+                    normalized_name, content='buildings', content_rowid='id',
+                    tokenize='trigram case_sensitive 1'
+                );
+                INSERT INTO building_names (building_names) VALUES ('rebuild');
+            """)
+        except sqlite3.OperationalError as e:
+            print(f"⚠️  부분 문자열 색인 생략 ({e}), 부분 일치 조회는 전체 스캔으로 처리")
+
+        count = conn.execute("SELECT COUNT(*) FROM buildings").fetchone()[0]
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    os.replace(temp_path, output_path)
+    return count
+
+
+def _register_rows(
+    reader: Iterable[List[str]], normalize: Callable[[str], str]
+) -> Iterable[Tuple]:
+    """CSV 행 -> 저장 행 (건물명, 정규화 건물명, INFO_FIELDS 순)"""
+    header = [column.strip() for column in next(iter(reader), [])]
+
+    def find(candidates: Sequence[str]) -> Optional[int]:
+        for candidate in candidates:
+            if candidate in header:
+                return header.index(candidate)
+        return None
+
+    positions = {field: find(candidates) for field, candidates in REGISTER_COLUMNS.items()}
+    if positions["name"] is None:
+        raise ValueError(f"건물명 열이 없습니다 (헤더: {', '.join(header)})")
+    parking = [position for position in map(find, PARKING_COLUMNS) if position is not None]
+
+    def value(row: List[str], position: Optional[int]) -> str:
+        return row[position].strip() if position is not None and position < len(row) else ""
+
+    for row in reader:
+        name = value(row, positions["name"])
+        if not name:
+            continue
+
+        approval = value(row, positions["use_approval_date"])
+        parking_counts = [_to_int(value(row, position)) for position in parking]
+        known_parking = [count for count in parking_counts if count is not None]
+
+        yield (
+            name,
+            normalize(name),
+            _to_float(value(row, positions["floor_area_ratio"])),
+            _to_float(value(row, positions["building_coverage_ratio"])),
+            _to_float(value(row, positions["total_land_area"])),
+            _to_int(value(row, positions["total_households"])),
+            sum(known_parking) if known_parking else None,
+            int(approval[:4]) if approval[:4].isdigit() else None,
+        )
+
+
+def _to_float(text: str) -> Optional[float]:
+    try:
+        return float(text.replace(",", "")) if text else None
+    except ValueError:
+        return None
+
+
+def _to_int(text: str) -> Optional[int]:
+    number = _to_float(text)
+    return int(number) if number is not None else None
+
+
+class BuildingStore:
+    """건축 정보 저장소 읽기 전용 연결"""
+
+    # IN 조건 한 번에 넘기는 값 수 (SQLite 변수 개수 제한 이내)
+    MAX_VARIABLES = 500
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(
+            f"file:{os.path.abspath(path)}?mode=ro", uri=True, check_same_thread=False
+        )
+        self._conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+        self._lock = threading.Lock()
+
+        user_version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if user_version != SCHEMA_VERSION:
+            self._conn.close()
+            raise ValueError(f"건축 정보 저장소 형식이 다릅니다 (버전 {user_version}, 필요 {SCHEMA_VERSION})")
+
+        self.has_substring_index = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'building_names'"
+        ).fetchone() is not None
+        self.count = self._conn.execute("SELECT COUNT(*) FROM buildings").fetchone()[0]
+
+    def get(self, name: str) -> Optional[dict]:
+        """건물명이 정확히 같은 단지"""
+        return self._info("WHERE name = ?", (name,))
+
+    def get_by_id(self, building_id: int) -> Optional[dict]:
+        return self._info("WHERE id = ?", (building_id,))
+
+    def first_id_in(self, normalized_names: Sequence[str]) -> Optional[int]:
+        """정규화 건물명이 목록 중 하나와 같은 첫 단지"""
+        first = None
+        for start in range(0, len(normalized_names), self.MAX_VARIABLES):
+            chunk = normalized_names[start:start + self.MAX_VARIABLES]
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT MIN(id) FROM buildings "
+                    f"WHERE normalized_name IN ({', '.join('?' for _ in chunk)})",
+                    tuple(chunk)
+                ).fetchone()
+            if row[0] is not None and (first is None or row[0] < first):
+                first = row[0]
+        return first
+
+    def first_id_containing(self, normalized: str) -> Optional[int]:
+        """정규화 건물명이 검색어를 포함하는 첫 단지"""
+        with self._lock:
+            if self.has_substring_index and len(normalized) >= 3:
+                row = self._conn.execute(
+                    "SELECT MIN(rowid) FROM building_names WHERE building_names MATCH ?",
+                    ('"' + normalized.replace('"', '""') + '"',)
+                ).fetchone()
+            else:
+                # 3글자 미만은 trigram 색인을 쓸 수 없으므로 파일 순서대로 스캔
+                row = self._conn.execute(
+                    "SELECT id FROM buildings WHERE instr(normalized_name, ?) > 0 ORDER BY id LIMIT 1",
+                    (normalized,)
+                ).fetchone()
+        return row[0] if row else None
+
+    def _info(self, where: str, params: tuple) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(INFO_FIELDS)} FROM buildings {where}", params
+            ).fetchone()
+        return dict(zip(INFO_FIELDS, row)) if row else None
+
+    def close(self):
+        """연결 종료 (진행 중인 조회가 끝난 뒤 닫음)"""
+        with self._lock:
+            self._conn.close()
@@ -1,76 +1,125 @@
-from typing import List, Optional
-from collections import defaultdict
-from app.models.schemas import Property, MarketStats, MarketComparison
+from typing import List, Optional, Sequence, Union
+import numpy as np
+from app.models.schemas import (
+    Property,
+    MarketStats,
+    MarketComparison,
+    PriceBucket,
+    PriceDistribution
+)
+from app.services.quantile_sketch import KLLSketch
+from app.services.trade_cube import AREA_GROUPS, TradeCube, as_trade_cube
+from app.services.trade_frame import TradeFrame, as_trade_frame
 
 
 class MarketAnalyzer:
     """시세 비교 분석 서비스"""
 
     def analyze_market_stats(
-        self, properties: List[Property]
+        self, properties: Union[TradeCube, TradeFrame, List[Property]]
     ) -> List[MarketStats]:
-        """평형대별 시장 통계 분석"""
-
-        # 평형대별 그룹화
-        area_groups = {
-            "10평 이하": (0, 33),
-            "10-20평": (33, 66),
-            "20-30평": (66, 99),
-            "30-40평": (99, 132),
-            "40평 이상": (132, 999)
-        }
-
-        stats_list = []
+        """평형대별 시장 통계 분석 (집계 큐브 칸 단위로 합산)"""
+        cube = as_trade_cube(properties)
 
-        for group_name, (min_area, max_area) in area_groups.items():
-            group_properties = [
-                p for p in properties
-                if min_area <= p.exclusive_area < max_area and p.deal_amount > 0
-            ]
+        # 평형대별 그룹화 (평형대 밖의 칸은 제외)
+        groups = cube.area_group
+        stats = cube.aggregate(groups, len(AREA_GROUPS), sketches=True)
 
-            if not group_properties:
+        stats_list = []
+        for i, group_name in enumerate(AREA_GROUPS):
+            deal_count = int(stats.count[i])
+            if not deal_count:
                 continue
 
-            prices = [p.deal_amount for p in group_properties]
-            avg_price = sum(prices) / len(prices)
+            avg_price = float(stats.price_mean[i])
 
             # 평당 가격 계산 (1평 = 3.3㎡)
-            avg_area = sum(p.exclusive_area for p in group_properties) / len(group_properties)
+            avg_area = float(stats.area_mean[i])
             avg_pyeong = avg_area / 3.3
             avg_price_per_pyeong = avg_price / avg_pyeong if avg_pyeong > 0 else 0
 
+            min_price = int(stats.price_min[i])
+            max_price = int(stats.price_max[i])
+
             # 가격 분포 계산
-            price_distribution = self._calculate_price_distribution(prices)
+            price_distribution = self._calculate_price_distribution(
+                stats.sketches[i], min_price, max_price
+            )
 
             stats_list.append(
                 MarketStats(
                     area_range=group_name,
                     avg_price=avg_price,
                     avg_price_per_pyeong=avg_price_per_pyeong,
-                    min_price=min(prices),
-                    max_price=max(prices),
-                    deal_count=len(prices),
+                    min_price=min_price,
+                    max_price=max_price,
+                    deal_count=deal_count,
                     price_distribution=price_distribution
                 )
             )
 
         return stats_list
 
+    def analyze_price_distribution(
+        self,
+        properties: Union[TradeCube, TradeFrame, List[Property]],
+        property_type: Optional[str] = None,
+        dongs: Optional[Sequence[str]] = None,
+        area_groups: Optional[Sequence[str]] = None,
+        percentiles: Sequence[float] = (10, 25, 50, 75, 90),
+        bins: int = 10
+    ) -> Optional[PriceDistribution]:
+        """조건에 맞는 거래의 가격 백분위/구간 분포 (거래가 없으면 None)
+
+        조건에 맞는 큐브 칸(월·동·지역별)의 분위수 스케치만 합쳐 계산하므로 거래 행을 정렬하지 않습니다.
+        """
+        cube = as_trade_cube(properties)
+        selected = cube.select(property_type, dongs, area_groups)
+        stats = cube.aggregate(np.where(selected, 0, -1), 1, sketches=True)
+
+        deal_count = int(stats.count[0])
+        if not deal_count:
+            return None
+
+        sketch = stats.sketches[0]
+        min_price = int(stats.price_min[0])
+        max_price = int(stats.price_max[0])
+
+        values = sketch.quantiles([percentile / 100 for percentile in percentiles])
+        edges = np.linspace(min_price, max_price, bins + 1)
+        counts = sketch.histogram(min_price, max_price, bins)
+
+        return PriceDistribution(
+            deal_count=deal_count,
+            avg_price=float(stats.price_mean[0]),
+            min_price=min_price,
+            max_price=max_price,
+            percentiles={
+                f"p{percentile:g}": value for percentile, value in zip(percentiles, values)
+            },
+            histogram=[
+                PriceBucket(min_price=float(low), max_price=float(high), deal_count=int(count))
+                for low, high, count in zip(edges[:-1].tolist(), edges[1:].tolist(), counts.tolist())
+            ],
+            rank_error=round(sketch.rank_error(distribution=True), 4)
+        )
+
     def compare_property_price(
         self,
         property: Property,
-        all_properties: List[Property]
+        all_properties: Union[TradeFrame, List[Property]]
     ) -> MarketComparison:
         """특정 매물의 시세 비교"""
+        frame = as_trade_frame(all_properties)
 
         # 동일 평형대 매물 필터링 (±10㎡)
-        similar_properties = [
-            p for p in all_properties
-            if abs(p.exclusive_area - property.exclusive_area) <= 10
-            and p.deal_amount > 0
-        ]
+        similar_mask = (
+            (np.abs(frame.exclusive_area - property.exclusive_area) <= 10)
+            & (frame.deal_amount > 0)
+        )
+        similar_count = int(similar_mask.sum())
 
-        if not similar_properties:
+        if not similar_count:
             return MarketComparison(
                 property_id=property.id,
                 apartment_name=property.apartment_name,
@@ -82,11 +131,10 @@ class MarketAnalyzer:
             )
 
         # 시장 통계
-        market_stats = self.analyze_market_stats(similar_properties)
+        market_stats = self.analyze_market_stats(frame.take(similar_mask))
 
         # 가격 포지션 판단
-        prices = [p.deal_amount for p in similar_properties]
-        avg_price = sum(prices) / len(prices)
+        avg_price = float(frame.deal_amount[similar_mask].mean())
 
         if property.deal_amount < avg_price * 0.9:
             price_position = "저가"
@@ -98,7 +146,7 @@ class MarketAnalyzer:
         # 비교 요약
         price_diff_rate = ((property.deal_amount - avg_price) / avg_price) * 100
         comparison_summary = (
-            f"유사 매물 {len(similar_properties)}건 대비 "
+            f"유사 매물 {similar_count}건 대비 "
             f"{abs(price_diff_rate):.1f}% {'높습니다' if price_diff_rate > 0 else '낮습니다'}."
         )
 
@@ -113,57 +161,56 @@ class MarketAnalyzer:
         )
 
     def get_market_ranking(
-        self, properties: List[Property], limit: int = 10
+        self, properties: Union[TradeFrame, List[Property]], limit: int = 10
     ) -> dict:
         """시세 순위 조회"""
+        frame = as_trade_frame(properties)
 
-        # 아파트별 평균 가격 계산
-        apt_prices = defaultdict(list)
-        for prop in properties:
-            if prop.deal_amount > 0:
-                apt_prices[prop.apartment_name].append(prop.deal_amount)
+        # 아파트별 평균 가격 계산 (단지명 코드 기준 집계)
+        valid = frame.deal_amount > 0
+        codes = frame.apartment_name.codes[valid]
+        n_names = len(frame.apartment_name.categories)
 
-        apt_avg_prices = {
-            name: sum(prices) / len(prices)
-            for name, prices in apt_prices.items()
-        }
+        counts = np.bincount(codes, minlength=n_names)
+        sums = np.bincount(codes, weights=frame.deal_amount[valid], minlength=n_names)
 
-        # 가격 순위
-        sorted_by_price = sorted(
-            apt_avg_prices.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
+        # 거래가 있는 단지만 (단지명 첫 등장 순서 유지)
+        traded = np.flatnonzero(counts)
+        avg_prices = sums[traded] / counts[traded]
+
+        # 가격 순위 (동일 가격은 첫 등장 순서)
+        order = np.argsort(-avg_prices, kind="stable")
+        sorted_by_price = [
+            (frame.apartment_name.categories[traded[i]], float(avg_prices[i]))
+            for i in order.tolist()
+        ]
 
         return {
             "highest_price": sorted_by_price[:limit],
             "lowest_price": sorted_by_price[-limit:],
-            "total_apartments": len(apt_avg_prices)
+            "total_apartments": len(sorted_by_price)
         }
 
-    def _calculate_price_distribution(self, prices: List[float]) -> dict:
-        """가격 분포 계산"""
-        if not prices:
+    def _calculate_price_distribution(
+        self, sketch: KLLSketch, min_price: int, max_price: int
+    ) -> dict:
+        """가격 분포 계산 (분위수 스케치의 가중치 값으로 구간별 건수 추정)"""
+        if not sketch.count:
             return {}
 
-        min_price = min(prices)
-        max_price = max(prices)
         price_range = max_price - min_price
 
         if price_range == 0:
             return {"single_price": min_price}
 
-        # 5개 구간으로 분할
-        interval = price_range / 5
-        distribution = defaultdict(int)
-
-        for price in prices:
-            bucket = int((price - min_price) / interval)
-            if bucket == 5:
-                bucket = 4  # 최댓값 처리
-            distribution[f"구간{bucket + 1}"] += 1
+        # 5개 구간으로 분할 (최댓값은 마지막 구간에 포함)
+        counts = sketch.histogram(min_price, max_price, 5)
 
-        return dict(distribution)
+        return {
+            f"구간{bucket + 1}": int(count)
+            for bucket, count in enumerate(counts.tolist())
+            if count
+        }
 
 
 # 싱글톤 인스턴스
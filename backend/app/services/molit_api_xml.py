@@ -1,15 +1,114 @@
 """XML 기반 국토교통부 실거래가 API 서비스"""
 
-import requests
-import xml.etree.ElementTree as ET
-import urllib3
-from datetime import datetime, timedelta
-from typing import List
+import asyncio
+import math
+import time
+import httpx
+from dataclasses import dataclass
+from datetime import datetime
+from lxml import etree
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from app.core.config import settings
+from app.core.degradation import mark_degraded
 from app.models.schemas import Property, PropertyType
+from app.services.molit_xml_parser import MolitXMLStreamParser
+from app.services.resilience import CircuitBreaker, TokenBucket, backoff_delay
+from app.services.single_flight import SingleFlight
+from app.services.trade_cube import TradeCube, partition_cube
+from app.services.trade_frame import TradeFrame, TradeRecord
+from app.services.trade_index import TradeIdIndex, prepare_partition_frame
+from app.services.trade_store import trade_store
+
+
+# 지역/기간 조합별 병합 프레임(및 집계 큐브) 캐시 크기
+MERGED_FRAME_CACHE_SIZE = 16
+
+
+class MolitAPIError(Exception):
+    """국토부 API 조회 실패"""
+
+
+class MolitTransientError(MolitAPIError):
+    """재시도 가능한 일시적 조회 실패 (네트워크 오류, 타임아웃, 429/5xx)"""
+
+
+class MolitRateLimitError(MolitTransientError):
+    """요청 한도 초과 (429, 재시도하지만 서킷 브레이커 실패로 세지 않음)"""
+
+
+class CircuitOpenError(MolitAPIError):
+    """서킷 브레이커 열림 상태로 요청 거부"""
+
+
+@dataclass
+class PartitionRefreshStats:
+    """파티션 갱신 이력"""
+    last_refreshed_at: Optional[float] = None  # 마지막 성공 시각 (epoch)
+    last_duration: Optional[float] = None  # 마지막 갱신 소요 시간(초)
+    failure_count: int = 0
+    consecutive_failures: int = 0
+    last_error: Optional[str] = None
+    last_failed_at: Optional[float] = None  # 마지막 실패 시각 (epoch)
+
+    @property
+    def failing(self) -> bool:
+        """마지막 갱신 시도가 실패했는지 여부"""
+        return self.last_failed_at is not None and self.last_failed_at > (self.last_refreshed_at or 0)
+
+    def record_failure(self, error: str):
+        """갱신 실패 기록"""
+        self.failure_count += 1
+        self.consecutive_failures += 1
+        self.last_error = error
+        self.last_failed_at = time.time()
+
+    def record_success(self):
+        """갱신 성공 기록"""
+        self.consecutive_failures = 0
+        self.last_refreshed_at = time.time()
+        self.last_error = None
+
+    def retry_at(self, cooldown: float, max_cooldown: float) -> float:
+        """다음 갱신 시도 가능 시각 (실패가 이어질수록 대기 시간을 두 배씩 늘림, 실패 중이 아니면 0)"""
+        if not self.failing:
+            return 0.0
+        exponent = min(self.consecutive_failures - 1, 32)
+        return self.last_failed_at + min(max_cooldown, cooldown * 2 ** exponent)
+
+    def to_dict(self) -> dict:
+        return {
+            "last_refreshed_at": (
+                datetime.fromtimestamp(self.last_refreshed_at).isoformat(timespec="seconds")
+                if self.last_refreshed_at else None
+            ),
+            "last_duration": round(self.last_duration, 3) if self.last_duration is not None else None,
+            "failure_count": self.failure_count,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error
+        }
+
+
+@dataclass(frozen=True)
+class TradeEndpoint:
+    """매물 유형별 실거래 API 엔드포인트"""
+    property_type: PropertyType
+    path: str  # 서비스/오퍼레이션 경로
+    name_tag: str  # 단지명 XML 태그
+    id_prefix: str  # 매물 ID 접두어
 
-# SSL 경고 비활성화
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# 매물 유형별 실거래 API (응답 XML 구조는 단지명 태그를 제외하고 동일)
+TRADE_ENDPOINTS: Dict[PropertyType, TradeEndpoint] = {
+    PropertyType.APARTMENT: TradeEndpoint(
+        PropertyType.APARTMENT, "RTMSDataSvcAptTrade/getRTMSDataSvcAptTrade", "aptNm", "APT"
+    ),
+    PropertyType.OFFICETEL: TradeEndpoint(
+        PropertyType.OFFICETEL, "RTMSDataSvcOffiTrade/getRTMSDataSvcOffiTrade", "offiNm", "OFT"
+    ),
+    PropertyType.MULTIPLEX: TradeEndpoint(
+        PropertyType.MULTIPLEX, "RTMSDataSvcRHTrade/getRTMSDataSvcRHTrade", "mhouseNm", "RH"
+    ),
+}
 
 
 class MolitAPIServiceXML:
@@ -17,15 +116,102 @@ class MolitAPIServiceXML:
 
     def __init__(self):
         self.api_key = settings.MOLIT_API_KEY
-        self.base_url = "https://apis.data.go.kr/1613000/RTMSDataSvcAptTrade"
+        self.base_url = settings.MOLIT_API_BASE_URL
+        self.endpoints = [
+            TRADE_ENDPOINTS[PropertyType(name.strip())]
+            for name in settings.MOLIT_TRADE_TYPES.split(",")
+            if name.strip()
+        ]
+        self.max_concurrency = settings.MOLIT_MAX_CONCURRENCY
+        self.page_size = settings.MOLIT_PAGE_SIZE
+        self.store = trade_store
+        self._single_flight = SingleFlight()
+        self._background_tasks: Set[asyncio.Task] = set()
+
+        # 파티션별 최근 요청 시각 / 갱신 이력
+        self.recent_partitions: Dict[Tuple[str, str], float] = {}
+        self.refresh_stats: Dict[Tuple[str, str], PartitionRefreshStats] = {}
+
+        # 메모리 파티션 {(지역코드, 거래년월): (조회 시각, 프레임)} 및 병합 결과 캐시
+        self._partition_frames: Dict[Tuple[str, str], Tuple[float, TradeFrame]] = {}
+        self._merged_frames: Dict[tuple, TradeFrame] = {}
+        self._merged_cubes: Dict[tuple, TradeCube] = {}
+        # 파티션별 세대 (교체될 때마다 전역 카운터로 새 번호 부여)
+        self._frame_generation = 0
+        self._partition_generations: Dict[Tuple[str, str], int] = {}
+        # 매물 ID -> 파티션 인덱스 (파티션 교체 시 증분 갱신)
+        self.id_index = TradeIdIndex()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # 장애 대응 (API 할당량에 맞춘 속도 제한, 재시도, 서킷 브레이커)
+        self.max_retries = settings.MOLIT_MAX_RETRIES
+        self.retry_base_delay = settings.MOLIT_RETRY_BASE_DELAY
+        self.retry_max_delay = settings.MOLIT_RETRY_MAX_DELAY
+        self.rate_limiter = TokenBucket(
+            rate=settings.MOLIT_RATE_LIMIT_PER_SEC,
+            capacity=settings.MOLIT_RATE_LIMIT_BURST
+        )
+        self.circuit = CircuitBreaker(
+            failure_threshold=settings.MOLIT_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.MOLIT_CIRCUIT_RESET_TIMEOUT
+        )
+        # 갱신에 실패한 파티션의 재시도 대기 (서킷 브레이커에 반영되지 않는 4xx/API 오류 포함)
+        self.refresh_retry_cooldown = settings.TRADE_REFRESH_RETRY_COOLDOWN
+        self.refresh_retry_max_cooldown = settings.TRADE_REFRESH_RETRY_MAX_COOLDOWN
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """공유 HTTP 클라이언트 반환 (커넥션 풀 재사용)"""
+        if self._client is None or self._client.is_closed:
+            # SSL 검증 비활성화 (공공데이터포털 인증서 문제 해결)
+            self._client = httpx.AsyncClient(
+                verify=False,
+                timeout=settings.MOLIT_REQUEST_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency
+                )
+            )
+        return self._client
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """동시 요청 수 제한용 세마포어 반환"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def aclose(self):
+        """공유 HTTP 클라이언트 종료"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @staticmethod
+    def _recent_months(months: int) -> List[str]:
+        """최근 N개월의 거래년월 목록 (예: ['202412', '202411', ...])"""
+        current_date = datetime.now()
+        year, month = current_date.year, current_date.month
+
+        deal_ymds = []
+        for _ in range(months):
+            deal_ymds.append(f"{year}{month:02d}")
+            month -= 1
+            if month == 0:
+                year, month = year - 1, 12
+
+        return deal_ymds
 
-    def _parse_apartment_data(self, item) -> Property:
-        """XML item을 Property 객체로 변환"""
+    def _parse_trade_data(
+        self, fields: Dict[str, str], region_code: str, endpoint: TradeEndpoint
+    ) -> Optional[TradeRecord]:
+        """XML item 필드를 TradeRecord로 변환 (잘못된 행은 None)
+
+        수집 경로에서는 행마다 pydantic 검증을 거치지 않고 여기서 타입 변환과 범위 확인만 합니다.
+        """
         try:
-            # XML 요소에서 텍스트 추출
+            # 필드 텍스트 추출 (없거나 비어 있으면 기본값)
             def get_text(tag_name, default=''):
-                elem = item.find(tag_name)
-                return elem.text.strip() if elem is not None and elem.text else default
+                return fields.get(tag_name) or default
 
             # 거래금액 파싱 (만원 단위, 쉼표 제거)
             deal_amount_str = get_text('dealAmount', '0').replace(',', '').replace(' ', '')
@@ -38,6 +224,8 @@ class MolitAPIServiceXML:
             deal_year = int(get_text('dealYear', str(datetime.now().year)))
             deal_month = int(get_text('dealMonth', '1'))
             deal_day = int(get_text('dealDay', '1'))
+            if not (1 <= deal_month <= 12 and 1 <= deal_day <= 31):
+                raise ValueError(f"잘못된 거래일자 {deal_year}-{deal_month}-{deal_day}")
 
             # 층수
             floor_str = get_text('floor', '')
@@ -47,15 +235,16 @@ class MolitAPIServiceXML:
             build_year_str = get_text('buildYear', '')
             build_year = int(build_year_str) if build_year_str.isdigit() else None
 
-            # 아파트명
-            apt_name = get_text('aptNm', 'UNKNOWN')
+            # 단지명 (아파트/오피스텔/연립다세대)
+            apt_name = get_text(endpoint.name_tag, 'UNKNOWN')
 
             # 고유 ID
-            property_id = f"APT_{apt_name}_{deal_year}{deal_month:02d}{deal_day:02d}_{exclusive_area}_{deal_amount}"
+            property_id = f"{endpoint.id_prefix}_{apt_name}_{deal_year}{deal_month:02d}{deal_day:02d}_{exclusive_area}_{deal_amount}"
 
-            return Property(
+            return TradeRecord(
                 id=property_id,
-                property_type=PropertyType.APARTMENT,
+                property_type=endpoint.property_type.value,
+                region_code=region_code,
                 dong=get_text('umdNm', ''),
                 jibun=get_text('jibun', ''),
                 apartment_name=apt_name,
@@ -66,85 +255,501 @@ class MolitAPIServiceXML:
                 deal_amount=deal_amount,
                 floor=floor,
                 build_year=build_year,
-                road_name='',  # XML에 도로명 필드 없음
-                deal_date=f"{deal_year}-{deal_month:02d}-{deal_day:02d}"
+                road_name=''  # XML에 도로명 필드 없음
             )
         except Exception as e:
             print(f"데이터 파싱 오류: {e}")
             return None
 
-    async def fetch_apartment_trades(self, region_code: str, deal_ymd: str) -> List[Property]:
-        """아파트 실거래 데이터 조회
+    async def _request_page(
+        self, endpoint: TradeEndpoint, region_code: str, deal_ymd: str, page_no: int
+    ) -> Tuple[List[TradeRecord], int]:
+        """실거래 데이터 한 페이지 요청 (속도 제한/재시도/서킷 브레이커 적용)
 
-        Args:
-            region_code: 지역코드 (예: 11440)
-            deal_ymd: 거래년월 (예: 202412)
-        """
-        if not self.api_key or self.api_key == "your_api_key_here":
-            print("⚠️  API 키가 설정되지 않았습니다.")
-            return []
+        서킷 브레이커에는 네트워크 오류와 5xx만 실패로 기록합니다.
+        429와 4xx/API 오류 응답(미신청 유형의 403 등)은 API 장애가 아니므로 반영하지 않습니다.
 
-        url = f"{self.base_url}/getRTMSDataSvcAptTrade"
+        Returns:
+            (페이지 내 매물 목록, 전체 건수 totalCount)
+        """
+        for attempt in range(self.max_retries + 1):
+            if not self.circuit.allow():
+                raise CircuitOpenError("API 장애로 요청을 일시 중단했습니다.")
+
+            await self.rate_limiter.acquire()
+
+            try:
+                result = await self._request_page_once(endpoint, region_code, deal_ymd, page_no)
+            except MolitTransientError as e:
+                if isinstance(e, MolitRateLimitError):
+                    self.circuit.record_neutral()
+                else:
+                    self.circuit.record_failure()
+                if attempt == self.max_retries:
+                    raise
+                delay = backoff_delay(attempt, self.retry_base_delay, self.retry_max_delay)
+                print(f"🔁 재시도 ({endpoint.property_type.value} {deal_ymd} p{page_no}, {attempt + 1}회): {e}")
+                await asyncio.sleep(delay)
+                continue
+            except MolitAPIError:
+                self.circuit.record_neutral()
+                raise
+
+            self.circuit.record_success()
+            return result
+
+    async def _request_page_once(
+        self, endpoint: TradeEndpoint, region_code: str, deal_ymd: str, page_no: int
+    ) -> Tuple[List[TradeRecord], int]:
+        """실거래 데이터 한 페이지 단일 요청 (실패 시 MolitAPIError)"""
+        url = f"{self.base_url}/{endpoint.path}"
         params = {
             "serviceKey": self.api_key,
             "LAWD_CD": region_code,
             "DEAL_YMD": deal_ymd,
-            "numOfRows": "1000"
+            "numOfRows": str(self.page_size),
+            "pageNo": str(page_no)
         }
 
+        parser = MolitXMLStreamParser()
+        properties = []
+
+        def collect(records):
+            for fields in records:
+                prop = self._parse_trade_data(fields, region_code, endpoint)
+                if prop and prop.deal_amount > 0:  # 유효한 데이터만
+                    properties.append(prop)
+
         try:
-            # SSL 검증 비활성화 (공공데이터포털 인증서 문제 해결)
-            response = requests.get(url, params=params, verify=False, timeout=15)
+            async with self._get_semaphore():
+                async with self._get_client().stream("GET", url, params=params) as response:
+                    if response.status_code == 429:
+                        raise MolitRateLimitError("HTTP 429")
+                    if response.status_code >= 500:
+                        raise MolitTransientError(f"HTTP {response.status_code}")
+                    if response.status_code != 200:
+                        raise MolitAPIError(f"HTTP {response.status_code}")
+
+                    # 응답 바이트를 받는 대로 파싱
+                    async for chunk in response.aiter_bytes():
+                        collect(parser.feed(chunk))
+
+            collect(parser.close())
+        except httpx.HTTPError as e:
+            raise MolitTransientError(f"요청 실패: {e!r}") from e
+        except etree.XMLSyntaxError as e:
+            raise MolitAPIError(f"XML 파싱 실패: {e}") from e
+
+        # 에러 체크 (성공 결과 코드가 없으면 빈 결과로 보지 않음 - 저장 데이터 삭제 방지)
+        if parser.is_error:
+            raise MolitAPIError(parser.error_message)
+
+        return properties, parser.total_count
+
+    async def _request_trades(
+        self, endpoint: TradeEndpoint, region_code: str, deal_ymd: str
+    ) -> List[TradeRecord]:
+        """한 매물 유형의 월별 실거래 데이터 전체 페이지 요청 (실패 시 MolitAPIError)"""
+        # 첫 페이지에서 totalCount 확인
+        properties, total_count = await self._request_page(endpoint, region_code, deal_ymd, 1)
+
+        # 나머지 페이지 동시 요청 (동시 요청 수는 세마포어로 제한)
+        total_pages = math.ceil(total_count / self.page_size)
+        if total_pages > 1:
+            pages = await asyncio.gather(*(
+                self._request_page(endpoint, region_code, deal_ymd, page_no)
+                for page_no in range(2, total_pages + 1)
+            ))
+            for page_properties, _ in pages:
+                properties.extend(page_properties)
+
+        return properties
+
+    @property
+    def trade_types(self) -> List[str]:
+        """조회 대상 매물 유형"""
+        return [endpoint.property_type.value for endpoint in self.endpoints]
+
+    async def _request_month(
+        self, region_code: str, deal_ymd: str, endpoints: Optional[List[TradeEndpoint]] = None
+    ) -> Tuple[List[TradeRecord], List[str], List[str]]:
+        """월별 매물 유형별 실거래 데이터 요청 (유형별 동시 요청, 기본은 전체 유형)
+
+        유형별로 따로 처리하므로 일부 유형이 실패해도 성공한 유형의 데이터는 반환합니다.
+        모든 유형이 실패한 경우에만 첫 번째 오류를 다시 발생시킵니다.
+
+        Returns:
+            (성공한 유형의 매물 목록, 성공한 유형 목록, 실패한 유형 목록)
+        """
+        endpoints = self.endpoints if endpoints is None else endpoints
+        results = await asyncio.gather(*(
+            self._request_trades(endpoint, region_code, deal_ymd)
+            for endpoint in endpoints
+        ), return_exceptions=True)
+
+        properties: List[TradeRecord] = []
+        succeeded: List[str] = []
+        failed: List[str] = []
+        errors: List[BaseException] = []
+        for endpoint, result in zip(endpoints, results):
+            if isinstance(result, BaseException):
+                print(f"⚠️  {endpoint.property_type.value} 조회 오류 ({deal_ymd}): {result}")
+                failed.append(endpoint.property_type.value)
+                errors.append(result)
+            else:
+                properties.extend(result)
+                succeeded.append(endpoint.property_type.value)
+
+        if not succeeded and errors:
+            raise errors[0]
+        return properties, succeeded, failed
+
+    async def fetch_trades(
+        self, region_code: str, deal_ymd: str, property_type: PropertyType
+    ) -> List[Property]:
+        """매물 유형별 실거래 데이터 조회
+
+        Args:
+            region_code: 지역코드 (예: 11440)
+            deal_ymd: 거래년월 (예: 202412)
+            property_type: 매물 유형
+        """
+        if not self.has_api_key:
+            print("⚠️  API 키가 설정되지 않았습니다.")
+            return []
+
+        try:
+            properties = await self._request_trades(
+                TRADE_ENDPOINTS[PropertyType(property_type)], region_code, deal_ymd
+            )
+        except MolitAPIError as e:
+            print(f"⚠️  API 오류 ({deal_ymd}): {e}")
+            return []
+        except Exception as e:
+            print(f"⚠️  조회 오류 ({deal_ymd}): {e}")
+            return []
+
+        print(f"📊 {deal_ymd}: {len(properties)}건 조회")
+        return [record.to_property() for record in properties]
+
+    async def fetch_apartment_trades(self, region_code: str, deal_ymd: str) -> List[Property]:
+        """아파트 실거래 데이터 조회
+
+        Args:
+            region_code: 지역코드 (예: 11440)
+            deal_ymd: 거래년월 (예: 202412)
+        """
+        return await self.fetch_trades(region_code, deal_ymd, PropertyType.APARTMENT)
+
+    async def _load_month(self, region_code: str, deal_ymd: str) -> TradeFrame:
+        """월별 실거래 데이터 로드 (동일 파티션 동시 요청은 한 번만 로드)"""
+        self.recent_partitions[(region_code, deal_ymd)] = time.time()
+        frame, degraded = await self._single_flight.do(
+            (region_code, deal_ymd),
+            lambda: self._load_partition(region_code, deal_ymd)
+        )
+
+        # 요청 단위로 기록 (병합된 호출자 각각의 응답에 표시)
+        if degraded:
+            mark_degraded(region_code, deal_ymd)
+        return frame
+
+    async def _load_partition(self, region_code: str, deal_ymd: str) -> Tuple[TradeFrame, bool]:
+        """파티션 로드 (메모리 → 저장소 순, 미저장 시에만 API 조회)
+
+        Returns:
+            (실거래 데이터, 데이터 품질 저하 여부 - 조회 실패로 비었거나 갱신에 실패한 만료 데이터)
+        """
+        info = await asyncio.to_thread(self.store.get_partition_info, region_code, deal_ymd)
 
-            if response.status_code != 200:
-                print(f"⚠️  API 오류 ({deal_ymd}): HTTP {response.status_code}")
-                return []
+        if info is not None:
+            degraded = False
 
-            # XML 파싱
-            root = ET.fromstring(response.text)
+            # 만료된 데이터는 즉시 반환하고 백그라운드에서 갱신 (stale-while-revalidate)
+            if not self.store.is_fresh(info, self.trade_types):
+                stats = self.refresh_stats.get((region_code, deal_ymd))
+                degraded = self.circuit.is_open or (stats is not None and stats.failing)
+                if self.can_refresh(region_code, deal_ymd):
+                    self._schedule_refresh(region_code, deal_ymd)
 
-            # 에러 체크
-            result_code = root.find('.//resultCode')
-            if result_code is not None and result_code.text not in ['00', '000']:
-                result_msg = root.find('.//resultMsg')
-                print(f"⚠️  API 에러 ({deal_ymd}): {result_msg.text if result_msg is not None else 'Unknown'}")
-                return []
+            # 메모리에 같은 시점의 파티션이 있으면 재사용
+            cached = self._partition_frames.get((region_code, deal_ymd))
+            if cached is not None and cached[0] == info.updated_at:
+                return cached[1], degraded
 
-            # 데이터 파싱
-            items = root.findall('.//item')
-            properties = []
+            frame = await asyncio.to_thread(self.store.load_partition_frame, region_code, deal_ymd)
+            self._set_partition_frame(region_code, deal_ymd, info.updated_at, frame)
+            return frame, degraded
 
-            for item in items:
-                prop = self._parse_apartment_data(item)
-                if prop and prop.deal_amount > 0:  # 유효한 데이터만
-                    properties.append(prop)
+        # 최근 갱신에 실패했으면 재시도 대기 시간이 지날 때까지 조회하지 않음
+        stats = self.refresh_stats.get((region_code, deal_ymd))
+        if stats is not None and stats.failing and not self.can_refresh(region_code, deal_ymd):
+            return TradeFrame.empty(), True
 
-            print(f"📊 {deal_ymd}: {len(properties)}건 조회")
-            return properties
+        # 백그라운드 갱신과 같은 키로 병합 (동시에 갱신 중이면 그 결과를 함께 사용)
+        try:
+            frame = await self.refresh_partition(region_code, deal_ymd)
+        except Exception:
+            return TradeFrame.empty(), True
+        return frame, self.refresh_stats[(region_code, deal_ymd)].failing
+
+    def _set_partition_frame(
+        self, region_code: str, deal_ymd: str, fetched_at: float, frame: TradeFrame
+    ):
+        """메모리 파티션 교체 (ID 인덱스 갱신, 이 파티션을 포함한 병합 결과만 무효화)"""
+        partition = (region_code, deal_ymd)
+        previous = self._partition_frames.get(partition)
+        self.id_index.replace_partition(
+            partition, previous[1] if previous is not None else None, frame
+        )
+        self._partition_frames[partition] = (fetched_at, frame)
+        self._frame_generation += 1
+        self._partition_generations[partition] = self._frame_generation
+        for cache in (self._merged_frames, self._merged_cubes):
+            for key in [key for key in cache if partition in key[0]]:
+                del cache[key]
+
+    def can_refresh(self, region_code: str, deal_ymd: str) -> bool:
+        """파티션 갱신 시도 가능 여부 (서킷 브레이커가 닫혀 있고 최근 실패 후 재시도 대기 시간이 지남)"""
+        if self.circuit.is_open:
+            return False
+        stats = self.refresh_stats.get((region_code, deal_ymd))
+        return stats is None or time.time() >= stats.retry_at(
+            self.refresh_retry_cooldown, self.refresh_retry_max_cooldown
+        )
+
+    async def refresh_partition(self, region_code: str, deal_ymd: str) -> TradeFrame:
+        """파티션 갱신 (동일 파티션 동시 갱신은 한 번만 수행, 실패 시 예외)"""
+        return await self._single_flight.do(
+            (region_code, deal_ymd, "refresh"),
+            lambda: self._refresh_partition(region_code, deal_ymd)
+        )
+
+    async def _refresh_partition(self, region_code: str, deal_ymd: str) -> TradeFrame:
+        """API 조회 후 저장소에 반영하고 갱신 이력 기록"""
+        stats = self.refresh_stats.setdefault((region_code, deal_ymd), PartitionRefreshStats())
+        started = time.monotonic()
 
+        try:
+            # 마감월에서 이미 마감 이후에 조회한 유형은 다시 조회하지 않음 (모두 조회했으면 전체 재조회)
+            info = await asyncio.to_thread(self.store.get_partition_info, region_code, deal_ymd)
+            types = self.store.mutable_types(info, self.trade_types) or self.trade_types
+            endpoints = [endpoint for endpoint in self.endpoints if endpoint.property_type.value in types]
+
+            properties, succeeded, failed = await self._request_month(region_code, deal_ymd, endpoints)
+            # 일부 유형만 조회했으면 그 유형만 반영 (나머지 유형의 저장 데이터는 유지, 유형별 조회 시각 기록)
+            partial = len(succeeded) < len(self.endpoints)
+            delta = await asyncio.to_thread(
+                self.store.apply_partition, region_code, deal_ymd, properties,
+                succeeded if partial else None
+            )
         except Exception as e:
+            stats.record_failure(str(e))
             print(f"⚠️  조회 오류 ({deal_ymd}): {e}")
-            return []
-
-    async def fetch_all_properties(self, region_code: str, months: int = 12) -> List[Property]:
-        """최근 N개월 전체 매물 조회"""
-        if not self.api_key or self.api_key == "your_api_key_here":
+            raise
+        finally:
+            stats.last_duration = time.monotonic() - started
+
+        cached = self._partition_frames.get((region_code, deal_ymd))
+        if not delta.changed and cached is not None and cached[0] == delta.previous_fetched_at:
+            # 변경이 없으면 기존 프레임과 인덱스, 병합 결과를 그대로 사용 (조회 시각만 갱신)
+            frame = cached[1]
+            self._partition_frames[(region_code, deal_ymd)] = (delta.fetched_at, frame)
+        else:
+            if partial:
+                # 조회하지 않은 유형의 기존 데이터가 포함되도록 저장소에서 다시 로드
+                frame = await asyncio.to_thread(self.store.load_partition_frame, region_code, deal_ymd)
+            else:
+                # 수집 시점에 한 번만 열 단위로 변환
+                frame = await asyncio.to_thread(
+                    lambda: prepare_partition_frame(TradeFrame.from_properties(properties))
+                )
+            self._set_partition_frame(region_code, deal_ymd, delta.fetched_at, frame)
+
+        if failed:
+            # 품질 저하로 표시되고 재시도 대기가 적용되도록 실패로 기록
+            stats.record_failure(f"일부 유형 조회 실패: {', '.join(failed)}")
+        else:
+            stats.record_success()
+        print(
+            f"📊 {deal_ymd}: {len(properties)}건 조회 "
+            f"(추가 {delta.inserted} / 수정 {delta.updated} / 삭제 {delta.deleted})"
+        )
+        return frame
+
+    def _schedule_refresh(self, region_code: str, deal_ymd: str):
+        """백그라운드 파티션 갱신 예약"""
+        async def refresh():
+            try:
+                await self.refresh_partition(region_code, deal_ymd)
+            except Exception:
+                pass  # 실패 이력은 refresh_stats에 기록됨
+
+        task = asyncio.ensure_future(refresh())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def fetch_frame(self, region_codes: List[str], months: int = 12) -> TradeFrame:
+        """여러 지역의 최근 N개월 실거래 데이터를 TradeFrame으로 조회
+
+        지역 × 월 파티션을 모두 동시에 로드합니다.
+        API 요청은 전역 세마포어(MOLIT_MAX_CONCURRENCY)로 제한되므로
+        지역 수가 늘어도 동시 요청 수와 응답 대기 중인 파싱 작업 수는 일정합니다.
+        """
+        if not self.has_api_key:
             print("⚠️  API 키가 설정되지 않았습니다.")
-            return []
+            return TradeFrame.empty()
 
-        all_properties = []
-        current_date = datetime.now()
+        # 지역 × 월 파티션 동시 로드 (로드 전 파티션 세대 기준으로 병합 결과 캐시)
+        partitions = self._partition_keys(region_codes, months)
+        generations = self._generations(partitions)
+        frames = await asyncio.gather(*(
+            self._load_month(region_code, deal_ymd) for region_code, deal_ymd in partitions
+        ))
+
+        # 파티션이 바뀌지 않았으면 이전에 합친 결과 재사용
+        return self._merged(
+            self._merged_frames, generations, partitions, lambda: TradeFrame.concat(frames)
+        )
 
-        # 월별로 데이터 조회
-        for i in range(months):
-            target_date = current_date - timedelta(days=30 * i)
-            deal_ymd = target_date.strftime("%Y%m")
+    async def fetch_cube(self, region_codes: List[str], months: int = 12) -> TradeCube:
+        """여러 지역의 최근 N개월 집계 큐브 조회
 
-            properties = await self.fetch_apartment_trades(region_code, deal_ymd)
-            all_properties.extend(properties)
+        파티션을 수집/로드할 때 만든 파티션별 큐브의 칸만 합치므로 거래 행을 다시 훑지 않습니다.
+        """
+        if not self.has_api_key:
+            print("⚠️  API 키가 설정되지 않았습니다.")
+            return TradeCube.empty()
+
+        partitions = self._partition_keys(region_codes, months)
+        generations = self._generations(partitions)
+        frames = await asyncio.gather(*(
+            self._load_month(region_code, deal_ymd) for region_code, deal_ymd in partitions
+        ))
+
+        return self._merged(
+            self._merged_cubes, generations, partitions,
+            lambda: TradeCube.concat(partition_cube(frame) for frame in frames)
+        )
+
+    def _generations(self, partitions: List[Tuple[str, str]]) -> tuple:
+        """파티션별 세대 (아직 로드하지 않은 파티션은 0)"""
+        return tuple(self._partition_generations.get(partition, 0) for partition in partitions)
+
+    def _merged(
+        self,
+        cache: Dict[tuple, object],
+        generations: tuple,
+        partitions: List[Tuple[str, str]],
+        merge: Callable[[], object]
+    ):
+        """파티션 조합별 병합 결과 캐시 (포함된 파티션이 교체되면 세대가 바뀌어 다시 병합)
+
+        generations는 파티션을 로드하기 전에 읽은 파티션별 세대입니다.
+        로드를 기다리는 동안 파티션이 교체되면 이전 파티션으로 만든 결과가 이전 세대로 저장되므로
+        새 세대의 요청에는 쓰이지 않습니다.
+        """
+        cache_key = (tuple(partitions), generations)
+        merged = cache.get(cache_key)
+        if merged is None:
+            merged = merge()
+            if len(cache) >= MERGED_FRAME_CACHE_SIZE:
+                cache.pop(next(iter(cache)))
+            cache[cache_key] = merged
+
+        return merged
+
+    def _partition_keys(self, region_codes: List[str], months: int) -> List[Tuple[str, str]]:
+        """조회 대상 (지역코드, 거래년월) 파티션 목록"""
+        return [
+            (region_code, deal_ymd)
+            for region_code in region_codes
+            for deal_ymd in self._recent_months(months)
+        ]
+
+    def touch_partitions(self, region_codes: List[str], months: int = 12):
+        """파티션을 최근 요청으로 기록 (캐시된 조회 결과로 응답해도 백그라운드 갱신 대상에 유지)"""
+        now = time.time()
+        for partition in self._partition_keys(region_codes, months):
+            self.recent_partitions[partition] = now
+
+    def failing_partitions(self, region_codes: List[str], months: int = 12) -> List[Tuple[str, str]]:
+        """마지막 갱신 시도가 실패한 파티션 (품질 저하 데이터로 응답할 수 있는 파티션)"""
+        return [
+            partition for partition in self._partition_keys(region_codes, months)
+            if partition in self.refresh_stats and self.refresh_stats[partition].failing
+        ]
+
+    async def find_property(
+        self, region_codes: List[str], property_id: str, months: int = 12
+    ) -> Optional[Property]:
+        """매물 ID로 조회 (ID 해시 인덱스 사용, 전체 행을 훑거나 합치지 않음)"""
+        if not self.has_api_key:
+            print("⚠️  API 키가 설정되지 않았습니다.")
+            return None
 
-        print(f"\n✅ 총 {len(all_properties)}건의 실거래가 데이터 조회 완료")
-        return all_properties
+        await asyncio.gather(*(
+            self._load_month(region_code, deal_ymd)
+            for region_code, deal_ymd in self._partition_keys(region_codes, months)
+        ))
+        return self.lookup_property(region_codes, property_id, months)
+
+    def lookup_property(
+        self, region_codes: List[str], property_id: str, months: int = 12
+    ) -> Optional[Property]:
+        """이미 로드된 파티션에서 매물 ID로 조회"""
+        partitions = self._partition_keys(region_codes, months)
+
+        # 같은 ID가 여러 파티션에 있으면 조회 순서상 앞선 파티션 우선
+        order = {partition: i for i, partition in enumerate(partitions)}
+        candidates = sorted(
+            (partition for partition in self.id_index.lookup(property_id) if partition in order),
+            key=order.get
+        )
+        for partition in candidates:
+            cached = self._partition_frames.get(partition)
+            if cached is None:
+                continue
+            frame = cached[1]
+            index = frame.find_id(property_id)
+            if index is not None:
+                return frame.to_property(index)
+
+        return None
+
+    async def fetch_all_properties(self, region_code: str, months: int = 12) -> List[Property]:
+        """최근 N개월 전체 매물 조회"""
+        return await self.fetch_properties([region_code], months)
+
+    async def fetch_properties(self, region_codes: List[str], months: int = 12) -> List[Property]:
+        """여러 지역의 최근 N개월 전체 매물 조회"""
+        frame = await self.fetch_frame(region_codes, months)
+        return frame.to_properties()
+
+    @property
+    def has_api_key(self) -> bool:
+        """API 키 설정 여부"""
+        return bool(self.api_key) and self.api_key != "your_api_key_here"
+
+    def loader_stats(self) -> dict:
+        """데이터 로드 지표 (중복 로드 병합 현황, 집계 큐브 크기, 파티션별 갱신 이력)"""
+        cubes = [partition_cube(frame) for _, frame in self._partition_frames.values()]
+        return {
+            "dataset_version": self.store.version,
+            "single_flight": self._single_flight.stats(),
+            "circuit_breaker": self.circuit.stats(),
+            "rate_limiter": self.rate_limiter.stats(),
+            "id_index": self.id_index.stats(),
+            "cube": {
+                "partitions": len(cubes),
+                "cells": sum(len(cube) for cube in cubes),
+                "trades": sum(cube.total for cube in cubes)
+            },
+            "partitions": {
+                f"{region_code}:{deal_ymd}": stats.to_dict()
+                for (region_code, deal_ymd), stats in sorted(self.refresh_stats.items())
+            }
+        }
 
 
 # 싱글톤 인스턴스
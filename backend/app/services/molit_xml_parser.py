@@ -0,0 +1,101 @@
+"""국토교통부 실거래가 XML 응답 스트리밍 파서"""
+
+from typing import Dict, Iterator, Optional
+from lxml import etree
+
+# 응답 헤더/본문에서 수집하는 메타 태그
+META_TAGS = {"resultCode", "resultMsg", "totalCount"}
+
+# 공공데이터포털 게이트웨이 오류 응답(OpenAPI_ServiceResponse) 태그
+# (인증키 오류, 요청 한도 초과 등은 HTTP 200에 resultCode 없이 이 형식으로 옴)
+GATEWAY_ERROR_TAGS = {"returnReasonCode", "returnAuthMsg"}
+
+# 정상 응답 결과 코드
+SUCCESS_CODES = {"00", "000"}
+
+
+class MolitXMLStreamParser:
+    """국토부 실거래가 XML 스트리밍 파서
+
+    응답 바이트를 받는 대로 feed() 하면 <item> 하나가 끝날 때마다
+    {태그: 텍스트} 형태의 필드 dict를 돌려줍니다.
+    처리한 요소는 바로 비우므로 응답 크기와 무관하게 메모리 사용량이 일정합니다.
+    """
+
+    def __init__(self):
+        # item과 메타 태그의 종료 이벤트만 받아 Python 처리 횟수를 줄임
+        self._parser = etree.XMLPullParser(
+            events=("end",), tag=["item", *META_TAGS, *GATEWAY_ERROR_TAGS]
+        )
+
+        self.result_code: Optional[str] = None
+        self.result_msg: Optional[str] = None
+        self.total_count: int = 0
+        # 게이트웨이 오류 응답의 사유 코드/메시지
+        self.return_reason_code: Optional[str] = None
+        self.return_auth_msg: Optional[str] = None
+
+    @property
+    def is_error(self) -> bool:
+        """API 에러 응답 여부
+
+        명시적인 성공 결과 코드가 없는 응답(게이트웨이 오류 응답 등)도 오류로 봅니다.
+        빈 결과로 처리하면 저장된 파티션 데이터가 모두 삭제되기 때문입니다.
+        """
+        return (
+            self.return_reason_code is not None
+            or self.result_code not in SUCCESS_CODES
+        )
+
+    @property
+    def error_message(self) -> str:
+        """오류 응답 메시지"""
+        if self.return_reason_code is not None:
+            return f"{self.return_auth_msg or 'SERVICE ERROR'} (returnReasonCode {self.return_reason_code})"
+        if self.result_code is None:
+            return "결과 코드가 없는 응답"
+        return self.result_msg or "Unknown"
+
+    def feed(self, chunk: bytes) -> Iterator[Dict[str, str]]:
+        """응답 바이트 조각 입력 후 완성된 item 반환"""
+        self._parser.feed(chunk)
+        yield from self._read_events()
+
+    def close(self) -> Iterator[Dict[str, str]]:
+        """입력 종료 후 남은 item 반환"""
+        self._parser.close()
+        yield from self._read_events()
+
+    def _read_events(self) -> Iterator[Dict[str, str]]:
+        """파서 이벤트를 item 필드 dict로 변환"""
+        for _, elem in self._parser.read_events():
+            tag = elem.tag
+
+            if tag == "item":
+                # item 하위 필드
+                record = {
+                    child.tag: child.text.strip() if child.text else ''
+                    for child in elem
+                }
+
+                # 처리한 item과 이전 형제 요소 제거
+                elem.clear()
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+
+                yield record
+                continue
+
+            text = elem.text.strip() if elem.text else ''
+            if tag == "resultCode":
+                self.result_code = text
+            elif tag == "resultMsg":
+                self.result_msg = text
+            elif tag == "returnReasonCode":
+                self.return_reason_code = text
+            elif tag == "returnAuthMsg":
+                self.return_auth_msg = text
+            elif tag == "totalCount" and text.isdigit():
+                self.total_count = int(text)
@@ -0,0 +1,61 @@
+"""이름 부분 일치 검색용 n-gram 역색인"""
+
+from collections import defaultdict
+from typing import Callable, Dict, List, Sequence
+import numpy as np
+
+
+class NameIndex:
+    """이름 n-gram 역색인
+
+    정규화한 이름(예: 단지명은 공백 제거, 레미안/래미안 표기 통일, 소문자)의 1·2글자 조각마다
+    해당 조각을 포함하는 이름 코드 목록을 보관합니다.
+    검색어 조각의 목록을 교집합한 뒤 후보 이름만 부분 문자열로 확인합니다.
+    """
+
+    def __init__(self, names: Sequence[str], normalize: Callable[[str], str]):
+        self.normalize = normalize
+        self.normalized = [normalize(name) for name in names]
+
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for code, name in enumerate(self.normalized):
+            for gram in _ngrams(name):
+                postings[gram].append(code)
+        self.postings = dict(postings)
+
+    def search(self, keyword: str) -> List[int]:
+        """정규화한 검색어를 포함하는 이름 코드 (오름차순)"""
+        normalized = self.normalize(keyword)
+        if not normalized:
+            return list(range(len(self.normalized)))
+
+        grams = [normalized] if len(normalized) == 1 else [
+            normalized[i:i + 2] for i in range(len(normalized) - 1)
+        ]
+        lists = sorted((self.postings.get(gram, []) for gram in set(grams)), key=len)
+        if not lists[0]:
+            return []
+
+        candidates = set(lists[0])
+        for codes in lists[1:]:
+            candidates.intersection_update(codes)
+            if not candidates:
+                return []
+
+        if len(normalized) <= 2:
+            return sorted(candidates)
+        return sorted(code for code in candidates if normalized in self.normalized[code])
+
+    def suggest(self, keyword: str, weights: np.ndarray, limit: int) -> List[int]:
+        """자동완성 후보 코드 (검색어로 시작하는 이름 우선, 다음은 weights 큰 순)"""
+        normalized = self.normalize(keyword)
+        codes = [code for code in self.search(keyword) if weights[code] > 0]
+        codes.sort(key=lambda code: (
+            not self.normalized[code].startswith(normalized), -weights[code], self.normalized[code]
+        ))
+        return codes[:limit]
+
+
+def _ngrams(text: str) -> set:
+    """1·2글자 조각"""
+    return set(text) | {text[i:i + 2] for i in range(len(text) - 1)}
@@ -1,7 +1,9 @@
-from typing import List, Optional
-from collections import defaultdict
-from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Union
+import numpy as np
 from app.models.schemas import Property, PriceHistory, PriceTrendAnalysis
+from app.services.price_trends import MonthlyTrends, TrendSummary
+from app.services.trade_cube import AREA_GROUPS, TradeCube, as_trade_cube
+from app.services.trade_frame import CategoricalColumn, TradeFrame, as_trade_frame
 
 
 class PriceAnalyzer:
@@ -9,28 +11,85 @@ class PriceAnalyzer:
 
     def analyze_price_trend(
         self,
-        properties: List[Property],
+        properties: Union[TradeFrame, List[Property]],
         apartment_name: Optional[str] = None,
         area_range: Optional[tuple] = None
     ) -> PriceTrendAnalysis:
         """가격 추이 분석"""
+        frame = as_trade_frame(properties)
 
         # 필터링
-        filtered_properties = properties
+        mask = np.ones(len(frame), dtype=bool)
         if apartment_name:
-            filtered_properties = [
-                p for p in filtered_properties
-                if p.apartment_name == apartment_name
-            ]
+            mask &= frame.apartment_name.codes == frame.apartment_name.code_of(apartment_name)
 
         if area_range:
             min_area, max_area = area_range
-            filtered_properties = [
-                p for p in filtered_properties
-                if min_area <= p.exclusive_area <= max_area
-            ]
+            mask &= (frame.exclusive_area >= min_area) & (frame.exclusive_area <= max_area)
 
-        if not filtered_properties:
+        # 월별 집계 (조건에 맞는 행을 그룹 0으로)
+        trends = MonthlyTrends.from_frame(frame, np.where(mask, 0, -1), 1)
+
+        return self._trend_analysis(
+            trends, trends.summarize(), 0,
+            apartment_name=apartment_name,
+            area_range=area_range
+        )
+
+    def analyze_group_trends(
+        self,
+        properties: Union[TradeCube, TradeFrame, List[Property]],
+        group_by: str,
+        names: Optional[Sequence[str]] = None
+    ) -> Dict[str, PriceTrendAnalysis]:
+        """그룹별 가격 추이 분석 (모든 그룹을 한 번에 집계)
+
+        Args:
+            group_by: "area" (평형대), "apartment" (단지), "dong" (동)
+            names: 조회할 그룹 이름 (지정하지 않으면 거래가 있는 모든 그룹)
+        """
+        if group_by == "area":
+            cube = as_trade_cube(properties)
+            labels = list(AREA_GROUPS)
+            groups = cube.area_group
+            if names:
+                groups, labels = _select_groups(groups, labels, names)
+            trends = MonthlyTrends.from_cube(cube, groups, len(labels))
+        elif group_by == "dong":
+            cube = as_trade_cube(properties)
+            groups, labels = _category_groups(cube.dong, names)
+            trends = MonthlyTrends.from_cube(cube, groups, len(labels))
+        elif group_by == "apartment":
+            # 집계 큐브에는 단지 차원이 없으므로 거래 행으로 집계
+            frame = as_trade_frame(properties)
+            groups, labels = _category_groups(frame.apartment_name, names)
+            trends = MonthlyTrends.from_frame(frame, groups, len(labels))
+        else:
+            raise ValueError(f"지원하지 않는 그룹 기준입니다: {group_by}")
+
+        summary = trends.summarize()
+        results = {}
+        for group, name in enumerate(labels):
+            # 이름을 지정하지 않은 경우 거래가 없는 그룹은 제외
+            if not names and not summary.deal_count[group]:
+                continue
+            results[name] = self._trend_analysis(
+                trends, summary, group,
+                apartment_name=name if group_by == "apartment" else None,
+                area_range=AREA_GROUPS.get(name) if group_by == "area" else None
+            )
+        return results
+
+    def _trend_analysis(
+        self,
+        trends: MonthlyTrends,
+        summary: TrendSummary,
+        group: int,
+        apartment_name: Optional[str] = None,
+        area_range: Optional[tuple] = None
+    ) -> PriceTrendAnalysis:
+        """그룹 하나의 월별 집계(거래가 있는 달만)로 가격 추이 분석"""
+        if not summary.deal_count[group]:
             return PriceTrendAnalysis(
                 apartment_name=apartment_name,
                 area_range=f"{area_range[0]}-{area_range[1]}㎡" if area_range else None,
@@ -40,105 +99,91 @@ class PriceAnalyzer:
                 trend="데이터 없음"
             )
 
-        # 월별 그룹화
-        monthly_data = defaultdict(list)
-        for prop in filtered_properties:
-            month_key = f"{prop.deal_year}-{prop.deal_month:02d}"
-            monthly_data[month_key].append(prop.deal_amount)
-
-        # 월별 통계 계산
-        price_history = []
-        sorted_months = sorted(monthly_data.keys())
-
-        for i, month in enumerate(sorted_months):
-            prices = monthly_data[month]
-            avg_price = sum(prices) / len(prices)
-
-            # 전월 대비 변동률 계산
-            price_change_rate = None
-            if i > 0:
-                prev_month = sorted_months[i - 1]
-                prev_avg = sum(monthly_data[prev_month]) / len(monthly_data[prev_month])
-                price_change_rate = ((avg_price - prev_avg) / prev_avg) * 100
-
-            price_history.append(
-                PriceHistory(
-                    date=month,
-                    avg_price=avg_price,
-                    min_price=min(prices),
-                    max_price=max(prices),
-                    deal_count=len(prices),
-                    price_change_rate=price_change_rate
-                )
+        traded = np.flatnonzero(trends.count[group])
+
+        # 월별 통계 (거래가 있는 달만)
+        price_history = [
+            PriceHistory(
+                date=f"{month // 100}-{month % 100:02d}",
+                avg_price=avg_price,
+                min_price=min_price,
+                max_price=max_price,
+                deal_count=deal_count,
+                price_change_rate=_optional(change_rate)
             )
-
-        # 현재 평균 가격 (최근 월)
-        current_avg_price = price_history[-1].avg_price if price_history else 0
-
-        # 전월 대비 변동률
-        mom_change_rate = price_history[-1].price_change_rate if price_history else None
-
-        # 전년 대비 변동률
-        yoy_change_rate = None
-        if len(price_history) >= 12:
-            year_ago_price = price_history[-12].avg_price
-            yoy_change_rate = ((current_avg_price - year_ago_price) / year_ago_price) * 100
-
-        # 추세 판단
-        trend = "보합"
-        if mom_change_rate:
-            if mom_change_rate > 2:
-                trend = "상승"
-            elif mom_change_rate < -2:
-                trend = "하락"
+            for month, avg_price, min_price, max_price, deal_count, change_rate in zip(
+                trends.months[traded].tolist(),
+                summary.price_mean[group, traded].tolist(),
+                trends.price_min[group, traded].tolist(),
+                trends.price_max[group, traded].tolist(),
+                trends.count[group, traded].tolist(),
+                summary.change_rate[group, traded].tolist()
+            )
+        ]
 
         return PriceTrendAnalysis(
             apartment_name=apartment_name,
             area_range=f"{area_range[0]}-{area_range[1]}㎡" if area_range else None,
             period="12개월",
             price_history=price_history,
-            current_avg_price=current_avg_price,
-            mom_change_rate=mom_change_rate,
-            yoy_change_rate=yoy_change_rate,
-            trend=trend
+            current_avg_price=float(summary.current_avg_price[group]),
+            mom_change_rate=_optional(summary.mom_change_rate[group]),
+            yoy_change_rate=_optional(summary.yoy_change_rate[group]),
+            trend=summary.trend[group]
         )
 
     def calculate_area_price_changes(
-        self, properties: List[Property]
+        self, properties: Union[TradeCube, TradeFrame, List[Property]]
     ) -> dict:
-        """평형대별 가격 변화율 계산"""
+        """평형대별 가격 변화율 계산 (집계 큐브 칸을 평형대 × 거래년월로 한 번에 합산)"""
+        cube = as_trade_cube(properties)
 
-        # 평형대별 그룹화 (3.3㎡ = 1평)
-        area_groups = {
-            "10평 이하": (0, 33),
-            "10-20평": (33, 66),
-            "20-30평": (66, 99),
-            "30-40평": (99, 132),
-            "40평 이상": (132, 999)
-        }
+        # 평형대 그룹 (평형대 밖의 칸은 제외)
+        groups = cube.area_group
+        summary = MonthlyTrends.from_cube(cube, groups, len(AREA_GROUPS)).summarize()
 
         results = {}
-        for group_name, (min_area, max_area) in area_groups.items():
-            group_properties = [
-                p for p in properties
-                if min_area <= p.exclusive_area < max_area
-            ]
-
-            if group_properties:
-                analysis = self.analyze_price_trend(
-                    group_properties,
-                    area_range=(min_area, max_area)
-                )
+        for i, group_name in enumerate(AREA_GROUPS):
+            deal_count = int(summary.deal_count[i])
+
+            if deal_count:
                 results[group_name] = {
-                    "current_avg_price": analysis.current_avg_price,
-                    "mom_change_rate": analysis.mom_change_rate,
-                    "yoy_change_rate": analysis.yoy_change_rate,
-                    "trend": analysis.trend,
-                    "deal_count": len(group_properties)
+                    "current_avg_price": float(summary.current_avg_price[i]),
+                    "mom_change_rate": _optional(summary.mom_change_rate[i]),
+                    "yoy_change_rate": _optional(summary.yoy_change_rate[i]),
+                    "trend": summary.trend[i],
+                    "deal_count": deal_count
                 }
 
         return results
 
 
+def _optional(value: float) -> Optional[float]:
+    """NaN -> None"""
+    return None if np.isnan(value) else float(value)
+
+
+def _select_groups(
+    groups: np.ndarray, labels: List[str], names: Sequence[str]
+) -> tuple:
+    """그룹 번호를 지정한 이름 순서로 다시 매김 (지정하지 않은 그룹은 -1)"""
+    mapping = np.full(len(labels) + 1, -1, dtype=np.int64)
+    positions = {label: i for i, label in enumerate(labels)}
+    for i, name in enumerate(names):
+        if name in positions:
+            mapping[positions[name]] = i
+    # -1(제외)은 마지막 칸으로 매핑
+    return mapping[groups], list(names)
+
+
+def _category_groups(
+    column: CategoricalColumn, names: Optional[Sequence[str]] = None
+) -> tuple:
+    """사전 인코딩 열의 그룹 번호와 그룹 이름 (이름을 지정하면 그 순서로)"""
+    if not names:
+        return column.codes, list(column.categories)
+    return _select_groups(column.codes, list(column.categories), names)
+
+
 # 싱글톤 인스턴스
 price_analyzer = PriceAnalyzer()
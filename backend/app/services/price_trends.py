@@ -0,0 +1,175 @@
+"""그룹별 월간 가격 추이 집계
+
+여러 그룹(평형대, 단지, 동 등)의 월별 거래 건수/평균/최솟값/최댓값과 전월·전년 대비 변동률을
+(그룹, 거래년월) 2차원 배열로 한 번에 계산합니다.
+거래 행(TradeFrame) 또는 집계 큐브 칸(TradeCube)에 그룹 번호를 붙여 한 번만 집계하므로
+그룹 수가 늘어나도 데이터를 그룹마다 다시 훑지 않습니다.
+
+변동률 기준:
+    전월 대비: 거래가 있는 직전 달의 평균 가격 대비
+    전년 대비: 거래가 있는 달이 12개 이상일 때 최근 월부터 12번째 거래 달의 평균 가격 대비
+    추세: 최근 월의 전월 대비 변동률이 2% 초과면 상승, -2% 미만이면 하락, 그 외는 보합
+"""
+
+from dataclasses import dataclass
+from typing import List
+import numpy as np
+from app.services.trade_cube import TradeCube
+from app.services.trade_frame import TradeFrame
+
+# 추세 판단 기준 (전월 대비 변동률, %)
+TREND_THRESHOLD = 2.0
+
+# 전년 대비 비교 기준 (거래가 있는 달 수)
+YOY_MONTHS = 12
+
+
+@dataclass
+class TrendSummary:
+    """그룹별 최근 월 기준 요약 (배열 위치 = 그룹 번호, 값이 없으면 NaN)
+
+    price_mean, change_rate는 (그룹, 월) 배열입니다.
+    """
+    price_mean: np.ndarray
+    change_rate: np.ndarray
+    deal_count: np.ndarray
+    current_avg_price: np.ndarray
+    mom_change_rate: np.ndarray
+    yoy_change_rate: np.ndarray
+    trend: List[str]
+
+
+class MonthlyTrends:
+    """그룹 × 거래년월 월간 가격 집계
+
+    months: 거래년월 (오름차순, 모든 그룹 공통 축)
+    count, price_sum, price_min, price_max: (그룹 수, 월 수) 배열 (거래가 없는 달은 count 0)
+    """
+
+    def __init__(
+        self,
+        months: np.ndarray,
+        count: np.ndarray,
+        price_sum: np.ndarray,
+        price_min: np.ndarray,
+        price_max: np.ndarray
+    ):
+        self.months = months
+        self.count = count
+        self.price_sum = price_sum
+        self.price_min = price_min
+        self.price_max = price_max
+
+    @classmethod
+    def from_frame(cls, frame: TradeFrame, groups: np.ndarray, n_groups: int) -> "MonthlyTrends":
+        """거래 행별 그룹 번호(-1은 제외)로 집계"""
+        rows = np.flatnonzero(groups >= 0)
+        months, month_index = np.unique(frame.deal_ym[rows], return_inverse=True)
+        cells = groups[rows].astype(np.int64) * len(months) + month_index
+        prices = frame.deal_amount[rows]
+
+        size = n_groups * len(months)
+        price_min = np.full(size, np.iinfo(np.int64).max)
+        price_max = np.full(size, np.iinfo(np.int64).min)
+        np.minimum.at(price_min, cells, prices)
+        np.maximum.at(price_max, cells, prices)
+
+        shape = (n_groups, len(months))
+        return cls(
+            months,
+            np.bincount(cells, minlength=size).reshape(shape),
+            np.bincount(cells, weights=prices, minlength=size).reshape(shape),
+            price_min.reshape(shape),
+            price_max.reshape(shape)
+        )
+
+    @classmethod
+    def from_cube(cls, cube: TradeCube, groups: np.ndarray, n_groups: int) -> "MonthlyTrends":
+        """큐브 칸별 그룹 번호(-1은 제외)로 집계"""
+        selected = groups >= 0
+        months, month_index = np.unique(cube.deal_ym[selected], return_inverse=True)
+        cells = np.full(len(cube), -1, dtype=np.int64)
+        cells[selected] = groups[selected].astype(np.int64) * len(months) + month_index
+
+        shape = (n_groups, len(months))
+        stats = cube.aggregate(cells, n_groups * len(months))
+        return cls(
+            months,
+            stats.count.reshape(shape),
+            stats.price_sum.reshape(shape),
+            stats.price_min.reshape(shape),
+            stats.price_max.reshape(shape)
+        )
+
+    def __len__(self) -> int:
+        """그룹 수"""
+        return len(self.count)
+
+    @property
+    def traded(self) -> np.ndarray:
+        """거래가 있는 달 (불리언)"""
+        return self.count > 0
+
+    @property
+    def price_mean(self) -> np.ndarray:
+        """월 평균 가격 (거래가 없는 달은 NaN)"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.traded, self.price_sum / self.count, np.nan)
+
+    def _latest_traded(self) -> np.ndarray:
+        """달마다 그 달까지 거래가 있었던 마지막 달 위치 (없으면 -1)"""
+        positions = np.where(self.traded, np.arange(len(self.months)), -1)
+        return np.maximum.accumulate(positions, axis=1) if positions.size else positions
+
+    def summarize(self) -> TrendSummary:
+        """월별 전월 대비 변동률과 그룹별 최근 월 평균 가격, 전월/전년 대비 변동률, 추세"""
+        mean = self.price_mean
+        traded = self.traded
+
+        # 월별 전월 대비 변동률 (거래가 있는 직전 달 기준)
+        latest = self._latest_traded()
+        previous = np.full_like(latest, -1)
+        previous[:, 1:] = latest[:, :-1]
+        change_rate = _rate(mean, _take(mean, previous))
+
+        # 최근 월
+        latest = latest[:, -1] if len(self.months) else np.full(len(self), -1)
+        current = _take(mean, latest)
+        mom = _take(change_rate, latest)
+
+        # 최근 월부터 YOY_MONTHS번째 거래 달 (거래 달 순번이 n - YOY_MONTHS + 1인 달)
+        n_traded = traded.sum(axis=1)
+        ranks = np.cumsum(traded, axis=1)
+        is_year_ago = traded & (ranks == (n_traded - YOY_MONTHS + 1)[:, None])
+        year_ago = np.argmax(is_year_ago, axis=1) if len(self.months) else np.zeros(len(self), dtype=np.int64)
+        year_ago = np.where(n_traded >= YOY_MONTHS, year_ago, -1)
+        yoy = _rate(current, _take(mean, year_ago))
+
+        trend = np.where(mom > TREND_THRESHOLD, "상승", np.where(mom < -TREND_THRESHOLD, "하락", "보합"))
+        trend = np.where(n_traded > 0, trend, "데이터 없음")
+        return TrendSummary(
+            price_mean=mean,
+            change_rate=change_rate,
+            deal_count=self.count.sum(axis=1),
+            current_avg_price=current,
+            mom_change_rate=mom,
+            yoy_change_rate=yoy,
+            trend=trend.tolist()
+        )
+
+
+def _take(values: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """행별로 지정한 열 위치의 값 (위치가 -1이면 NaN)"""
+    if not values.size:
+        return np.full(positions.shape, np.nan)
+    picked = np.take_along_axis(
+        values, np.maximum(positions, 0).reshape(len(values), -1), axis=1
+    ).reshape(positions.shape)
+    return np.where(positions >= 0, picked, np.nan)
+
+
+def _rate(current: np.ndarray, base: np.ndarray) -> np.ndarray:
+    """변동률 (%) (기준이 없거나 0이면 NaN)"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = ((current - base) / base) * 100
+    return np.where(np.isfinite(rate), rate, np.nan)
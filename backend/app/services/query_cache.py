@@ -0,0 +1,135 @@
+"""조회 결과 캐시
+
+같은 조건의 조회(대시보드 기본 필터, 자주 보는 동 등)는 직렬화된 응답 본문을 그대로 돌려줍니다.
+항목은 실거래 데이터셋 버전(및 건축 정보 등 의존 데이터 버전)에 묶여 있어 수집/재로드로 버전이 바뀌면
+해당 데이터에 의존한 항목만 무효화되고, 메모리 예산을 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다 (LRU).
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import date
+from enum import Enum
+from typing import Any, Dict, Hashable, Optional, Tuple
+from app.core.config import settings
+
+# 값 순서가 결과에 영향을 주지 않는 목록 파라미터 (정렬해 같은 키로 취급)
+UNORDERED_PARAMS = {"dongs", "area_groups"}
+
+
+class QueryCache:
+    """조회 결과 LRU 캐시 (직렬화된 응답 본문, 메모리 예산 기준)
+
+    항목마다 계산 당시 의존한 데이터 버전(예: {"dataset": 12, "building": 3})을 함께 보관합니다.
+    어떤 데이터의 버전이 올라가면 그 데이터에 의존한 항목만 제거합니다.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[bytes, Dict[str, int]]]" = OrderedDict()
+        self._bytes = 0
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(route: str, params: Dict[str, Any]) -> Tuple:
+        """라우트 이름 + 정규화한 조회 파라미터"""
+        return (route, *sorted(
+            (name, _normalize(value, name in UNORDERED_PARAMS))
+            for name, value in params.items()
+        ))
+
+    def get(self, key: Hashable, versions: Dict[str, int]) -> Optional[bytes]:
+        """캐시된 응답 본문 (없거나 versions와 다른 버전으로 만든 결과면 None)"""
+        with self._lock:
+            self._sync_versions(versions)
+            entry = self._entries.get(key)
+            if entry is None or entry[1] != versions:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, versions: Dict[str, int], body: bytes):
+        """응답 본문 저장
+
+        조회를 시작할 때 읽은 데이터 버전을 넘깁니다.
+        계산 중에 버전이 바뀌었으면 이전 데이터로 만든 결과일 수 있으므로 저장하지 않습니다.
+        """
+        if len(body) > self.max_bytes:
+            return
+
+        with self._lock:
+            self._sync_versions(versions)
+            if any(self._versions[source] != version for source, version in versions.items()):
+                return
+
+            self._remove(key)
+            self._entries[key] = (body, dict(versions))
+            self._bytes += len(body)
+
+            while self._bytes > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def _sync_versions(self, versions: Dict[str, int]):
+        """새 버전이 보이면 이전 버전에 의존한 항목 제거"""
+        changed = {
+            source for source, version in versions.items()
+            if version > self._versions.get(source, version - 1)
+        }
+        if not changed:
+            return
+
+        for source in changed:
+            self._versions[source] = versions[source]
+
+        stale = [
+            key for key, (_, entry_versions) in self._entries.items()
+            if any(source in entry_versions for source in changed)
+        ]
+        for key in stale:
+            self._remove(key)
+        if stale:
+            self.invalidations += 1
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[0])
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "versions": dict(self._versions),
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+
+def _normalize(value: Any, unordered: bool = False) -> Hashable:
+    """조회 파라미터 값을 해시 가능한 표준 형태로 변환"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, set)):
+        values = [_normalize(item) for item in value]
+        return tuple(sorted(values, key=str) if unordered else values)
+    return value
+
+
+# 싱글톤 인스턴스
+query_cache = QueryCache(max_bytes=settings.QUERY_CACHE_MAX_MB * 1024 * 1024)
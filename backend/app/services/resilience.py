@@ -0,0 +1,131 @@
+"""외부 API 호출 보호 (요청 속도 제한, 재시도 대기, 서킷 브레이커)"""
+
+import asyncio
+import random
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """토큰 버킷 방식 요청 속도 제한
+
+    초당 rate개씩 토큰이 채워지고 최대 capacity개까지 쌓입니다.
+    요청마다 토큰 1개를 사용하며, 토큰이 없으면 채워질 때까지 대기합니다.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self.waits = 0  # 토큰 부족으로 대기한 횟수
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self):
+        """토큰 1개 획득 (없으면 대기)"""
+        waited = False
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            if not waited:
+                self.waits += 1
+                waited = True
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def stats(self) -> dict:
+        self._refill()
+        return {
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "tokens": round(self._tokens, 2),
+            "waits": self.waits
+        }
+
+
+def backoff_delay(attempt: int, base: float, max_delay: float) -> float:
+    """재시도 대기 시간 (지수 증가 + full jitter)"""
+    return random.uniform(0, min(max_delay, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """서킷 브레이커
+
+    연속 실패가 failure_threshold회에 도달하면 열림(open) 상태가 되어 요청을 즉시 거부합니다.
+    reset_timeout초가 지나면 반열림(half-open) 상태로 한 건의 시험 요청만 허용하고,
+    성공하면 닫힘(closed), 실패하면 다시 열림 상태가 됩니다.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.rejected = 0  # 열림 상태에서 거부한 요청 수
+        self._trial_inflight = False
+
+    @property
+    def is_open(self) -> bool:
+        """요청을 거부하는 상태인지 여부 (시험 요청 가능 시점 이전의 열림 상태)"""
+        return (
+            self.state == self.OPEN
+            and time.monotonic() - self.opened_at < self.reset_timeout
+        )
+
+    def allow(self) -> bool:
+        """요청 허용 여부"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+            self._trial_inflight = False
+
+        if self.state == self.HALF_OPEN:
+            # 시험 요청은 한 번에 한 건만 허용
+            if self._trial_inflight:
+                self.rejected += 1
+                return False
+            self._trial_inflight = True
+
+        return True
+
+    def record_success(self):
+        """요청 성공 기록"""
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._trial_inflight = False
+
+    def record_neutral(self):
+        """서킷 상태에 반영하지 않는 결과 기록 (반열림 상태의 시험 요청 슬롯만 반환)"""
+        self._trial_inflight = False
+
+    def record_failure(self):
+        """요청 실패 기록"""
+        self.consecutive_failures += 1
+        self._trial_inflight = False
+
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                print(f"🔌 서킷 브레이커 열림 (연속 실패 {self.consecutive_failures}회)")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected": self.rejected
+        }
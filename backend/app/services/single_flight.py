@@ -0,0 +1,55 @@
+"""동일 키 동시 요청 병합 (single-flight)"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """동일 키 동시 요청 병합
+
+    같은 키로 진행 중인 작업이 있으면 새로 실행하지 않고 그 결과를 함께 기다립니다.
+    먼저 요청한 쪽이 취소되어도 작업은 계속 진행되어 나머지 호출자에게 결과를 전달합니다.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+        # 지표
+        self.calls = 0  # 전체 호출 수
+        self.executions = 0  # 실제 실행 수
+        self.shared = 0  # 진행 중인 작업을 공유한 호출 수 (중복 로드 절감)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """key 단위로 병합하여 func 실행"""
+        self.calls += 1
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.shared += 1
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        """완료된 작업 정리"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+        # 모든 호출자가 취소된 경우에도 예외 미확인 경고가 남지 않도록 확인
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        """병합 지표"""
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "shared": self.shared,
+            "inflight": len(self._inflight)
+        }
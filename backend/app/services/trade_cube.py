@@ -0,0 +1,322 @@
+"""실거래 집계 큐브
+
+(매물 유형, 동, 평형대, 거래년월) 칸마다 거래 건수, 가격 합계/제곱합/최솟값/최댓값, 면적 합계,
+가격 분위수 스케치를 보관합니다.
+큐브는 파티션을 수집/로드할 때 한 번만 만들고, 통계/시세 조회는 필요한 파티션의 큐브 칸만 합치므로
+건수/평균/최솟값/최댓값 집계 비용은 거래 건수가 아니라 칸 수에 비례합니다.
+(중앙값/분포는 칸별 스케치 보관 값 수에 비례하며, 칸당 보관 값은 거래 건수와 무관하게 상한이 있습니다.)
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from app.models.schemas import Property
+from app.services.quantile_sketch import DEFAULT_K, KLLSketch
+from app.services.trade_frame import CategoricalColumn, TradeFrame, as_trade_frame
+
+# 평형대 (3.3㎡ = 1평): 이름 -> [하한, 상한) ㎡
+AREA_GROUPS: Dict[str, Tuple[float, float]] = {
+    "10평 이하": (0, 33),
+    "10-20평": (33, 66),
+    "20-30평": (66, 99),
+    "30-40평": (99, 132),
+    "40평 이상": (132, 999)
+}
+
+# 평형대 경계 (칸 번호 0: 0㎡ 미만, 1~5: AREA_GROUPS 순서, 6: 999㎡ 이상 또는 미상)
+AREA_EDGES = np.array([0, 33, 66, 99, 132, 999], dtype=np.float64)
+
+
+def area_buckets(areas: np.ndarray) -> np.ndarray:
+    """전용면적 -> 평형대 칸 번호"""
+    return np.digitize(areas, AREA_EDGES).astype(np.int8)
+
+
+def area_group_numbers(buckets: np.ndarray) -> np.ndarray:
+    """평형대 칸 번호 -> AREA_GROUPS 순서 그룹 번호
+
+    평형대 범위 밖(0㎡ 미만, 999㎡ 이상)과 미상(NaN)은 -1이며,
+    평형대별 집계/분포/필터 모두 이 규칙으로 제외합니다.
+    """
+    groups = buckets.astype(np.int64) - 1
+    groups[groups >= len(AREA_GROUPS)] = -1
+    return groups
+
+
+@dataclass
+class CubeAggregate:
+    """그룹별 집계 결과 (배열 위치 = 그룹 번호)"""
+    count: np.ndarray
+    price_sum: np.ndarray
+    price_sumsq: np.ndarray
+    price_min: np.ndarray
+    price_max: np.ndarray
+    area_sum: np.ndarray
+    sketches: Optional[List[KLLSketch]] = None
+
+    @property
+    def price_mean(self) -> np.ndarray:
+        return self.price_sum / np.maximum(self.count, 1)
+
+    @property
+    def area_mean(self) -> np.ndarray:
+        return self.area_sum / np.maximum(self.count, 1)
+
+    @property
+    def price_std(self) -> np.ndarray:
+        """가격 표준편차 (모표준편차)"""
+        variance = self.price_sumsq / np.maximum(self.count, 1) - self.price_mean ** 2
+        return np.sqrt(np.maximum(variance, 0))
+
+
+class TradeCube:
+    """실거래 집계 큐브 (칸 단위 열 배열)
+
+    차원: property_type, dong (사전 인코딩), area_bucket, deal_ym
+    집계: count, price_sum, price_sumsq, price_min, price_max, area_sum
+    가격 분위수 스케치는 칸별 객체 대신 모든 칸의 보관 값을 한 배열에 이어 보관하고(sketch_values/levels,
+    칸별 개수 sketch_sizes), 그룹으로 합칠 때 배열 연산으로 모읍니다.
+    거래금액이 0 이하인 행(수집 시 제외되는 잘못된 행)은 집계하지 않습니다.
+    """
+
+    MEASURES = ("count", "price_sum", "price_sumsq", "price_min", "price_max", "area_sum")
+    SKETCH_COLUMNS = ("sketch_sizes", "sketch_values", "sketch_levels")
+
+    def __init__(
+        self,
+        property_type: CategoricalColumn,
+        dong: CategoricalColumn,
+        area_bucket: np.ndarray,
+        deal_ym: np.ndarray,
+        measures: Dict[str, np.ndarray],
+        sketch: Dict[str, np.ndarray]
+    ):
+        self.property_type = property_type
+        self.dong = dong
+        self.area_bucket = area_bucket
+        self.deal_ym = deal_ym
+        self.count = measures["count"]
+        self.price_sum = measures["price_sum"]
+        self.price_sumsq = measures["price_sumsq"]
+        self.price_min = measures["price_min"]
+        self.price_max = measures["price_max"]
+        self.area_sum = measures["area_sum"]
+        # 칸별 스케치 보관 값 수 / 보관 값 (칸 순서) / 값별 레벨 (가중치 2^레벨)
+        self.sketch_sizes = sketch["sketch_sizes"]
+        self.sketch_values = sketch["sketch_values"]
+        self.sketch_levels = sketch["sketch_levels"]
+
+    @classmethod
+    def empty(cls) -> "TradeCube":
+        return cls.from_frame(TradeFrame.empty())
+
+    @classmethod
+    def from_frame(cls, frame: TradeFrame) -> "TradeCube":
+        """프레임 행을 칸별로 집계"""
+        rows = np.flatnonzero(frame.deal_amount > 0)
+        types = frame.property_type.codes[rows]
+        dongs = frame.dong.codes[rows]
+        buckets = area_buckets(frame.exclusive_area[rows])
+        months = frame.deal_ym[rows]
+        prices = frame.deal_amount[rows]
+
+        # 칸 순서로 정렬 (칸 안에서는 가격 오름차순)
+        order = np.lexsort((prices, months, buckets, dongs, types))
+        keys = [types[order], dongs[order], buckets[order], months[order]]
+        prices = prices[order]
+        areas = frame.exclusive_area[rows][order]
+
+        boundary = np.zeros(len(order), dtype=bool)
+        boundary[:1] = True
+        for key in keys:
+            boundary[1:] |= key[1:] != key[:-1]
+        starts = np.flatnonzero(boundary)
+        ends = np.append(starts[1:], len(order)) if len(starts) else starts
+
+        measures = {
+            "count": (ends - starts).astype(np.int64),
+            "price_sum": _reduce(prices, starts),
+            "price_sumsq": _reduce(prices.astype(np.float64) ** 2, starts),
+            "price_min": prices[starts],
+            "price_max": prices[ends - 1],
+            "area_sum": _reduce(areas, starts),
+        }
+        return cls(
+            CategoricalColumn(keys[0][starts], frame.property_type.categories),
+            CategoricalColumn(keys[1][starts], frame.dong.categories),
+            keys[2][starts],
+            keys[3][starts],
+            measures,
+            _cell_sketches(prices, starts, ends)
+        )
+
+    @classmethod
+    def concat(cls, cubes: Iterable["TradeCube"]) -> "TradeCube":
+        """여러 큐브의 칸을 합침 (같은 차원 값의 칸도 따로 유지, 집계 시 합산)"""
+        cubes = [cube for cube in cubes if len(cube)]
+        if not cubes:
+            return cls.empty()
+        if len(cubes) == 1:
+            return cubes[0]
+
+        return cls(
+            CategoricalColumn.concat([cube.property_type for cube in cubes]),
+            CategoricalColumn.concat([cube.dong for cube in cubes]),
+            np.concatenate([cube.area_bucket for cube in cubes]),
+            np.concatenate([cube.deal_ym for cube in cubes]),
+            {
+                name: np.concatenate([getattr(cube, name) for cube in cubes])
+                for name in cls.MEASURES
+            },
+            {
+                name: np.concatenate([getattr(cube, name) for cube in cubes])
+                for name in cls.SKETCH_COLUMNS
+            }
+        )
+
+    def __len__(self) -> int:
+        """칸 수"""
+        return len(self.count)
+
+    def select(
+        self,
+        property_type: Optional[str] = None,
+        dongs: Optional[Sequence[str]] = None,
+        area_groups: Optional[Sequence[str]] = None
+    ) -> np.ndarray:
+        """조건에 맞는 칸 (불리언 마스크, 조건을 지정하지 않으면 전체)"""
+        selected = np.ones(len(self), dtype=bool)
+        if property_type:
+            selected &= self.property_type.codes == self.property_type.code_of(property_type)
+        if dongs:
+            selected &= np.isin(self.dong.codes, [self.dong.code_of(dong) for dong in dongs])
+        if area_groups:
+            names = list(AREA_GROUPS)
+            selected &= np.isin(self.area_group, [names.index(group) for group in area_groups])
+        return selected
+
+    @property
+    def area_group(self) -> np.ndarray:
+        """칸별 평형대 그룹 번호 (AREA_GROUPS 순서, 범위 밖/미상은 -1)"""
+        return area_group_numbers(self.area_bucket)
+
+    def area_distribution(self, selected: np.ndarray) -> Dict[str, int]:
+        """선택한 칸의 평형대별 거래 건수 (범위 밖/미상 면적은 제외)"""
+        groups = self.area_group
+        selected = selected & (groups >= 0)
+        counts = np.bincount(
+            groups[selected], weights=self.count[selected], minlength=len(AREA_GROUPS)
+        )
+        return dict(zip(AREA_GROUPS, counts.astype(np.int64).tolist()))
+
+    @property
+    def total(self) -> int:
+        """집계된 거래 건수"""
+        return int(self.count.sum())
+
+    def aggregate(
+        self, groups: np.ndarray, n_groups: int, sketches: bool = False
+    ) -> CubeAggregate:
+        """칸별 그룹 번호(-1은 제외)로 집계
+
+        Args:
+            groups: 칸별 그룹 번호 (0 ~ n_groups-1)
+            sketches: 그룹별 분위수 스케치도 합칠지 여부
+        """
+        selected = np.flatnonzero(groups >= 0)
+        group_of = groups[selected].astype(np.int64)
+
+        def total(values: np.ndarray) -> np.ndarray:
+            return np.bincount(group_of, weights=values[selected], minlength=n_groups)
+
+        price_min = np.full(n_groups, np.iinfo(np.int64).max)
+        price_max = np.full(n_groups, np.iinfo(np.int64).min)
+        np.minimum.at(price_min, group_of, self.price_min[selected])
+        np.maximum.at(price_max, group_of, self.price_max[selected])
+
+        count = total(self.count).astype(np.int64)
+        return CubeAggregate(
+            count=count,
+            price_sum=total(self.price_sum),
+            price_sumsq=total(self.price_sumsq),
+            price_min=price_min,
+            price_max=price_max,
+            area_sum=total(self.area_sum),
+            sketches=self._merge_sketches(groups, n_groups, count) if sketches else None
+        )
+
+    def _merge_sketches(
+        self, groups: np.ndarray, n_groups: int, counts: np.ndarray
+    ) -> List[KLLSketch]:
+        """그룹별로 칸 스케치 보관 값을 모아 합친 스케치"""
+        # 보관 값을 그룹 순서로 정렬 (제외된 칸(-1)의 값은 맨 앞)
+        item_groups = np.repeat(groups.astype(np.int64), self.sketch_sizes)
+        order = np.argsort(item_groups, kind="stable")
+        values = self.sketch_values[order]
+        levels = self.sketch_levels[order]
+
+        sizes = np.bincount(item_groups[item_groups >= 0], minlength=n_groups)
+        offsets = np.concatenate([[0], np.cumsum(sizes)]) + (len(order) - int(sizes.sum()))
+
+        merged = []
+        for group in range(n_groups):
+            start, end = offsets[group], offsets[group + 1]
+            group_values, group_levels = values[start:end], levels[start:end]
+            height = int(group_levels.max()) + 1 if end > start else 0
+            merged.append(KLLSketch.from_levels(
+                [group_values[group_levels == level] for level in range(height)],
+                int(counts[group])
+            ))
+        return merged
+
+
+def _reduce(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """구간별 합계 (빈 배열 허용)"""
+    return np.add.reduceat(values, starts) if len(starts) else values[:0]
+
+
+def _cell_sketches(
+    prices: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """칸별 가격 스케치 보관 값 (칸 안 가격은 정렬된 상태)
+
+    거래가 DEFAULT_K건 이하인 칸은 가격을 그대로 보관하고(정확), 그보다 많은 칸만 KLL로 압축합니다.
+    """
+    sizes = (ends - starts).astype(np.int64)
+    values: List[np.ndarray] = []
+    levels: List[np.ndarray] = []
+
+    position = 0
+    for cell in np.flatnonzero(sizes > DEFAULT_K).tolist():
+        values.append(prices[position:starts[cell]])
+        levels.append(np.zeros(starts[cell] - position, dtype=np.int8))
+
+        sketch = KLLSketch.from_values(prices[starts[cell]:ends[cell]])
+        for level, items in enumerate(sketch.levels):
+            values.append(items)
+            levels.append(np.full(len(items), level, dtype=np.int8))
+        sizes[cell] = sketch.size
+        position = ends[cell]
+
+    values.append(prices[position:])
+    levels.append(np.zeros(len(prices) - position, dtype=np.int8))
+    return {
+        "sketch_sizes": sizes,
+        "sketch_values": np.concatenate(values).astype(np.float64),
+        "sketch_levels": np.concatenate(levels),
+    }
+
+
+def partition_cube(frame: TradeFrame) -> TradeCube:
+    """파티션 집계 큐브 (프레임별로 처음 사용할 때 생성)"""
+    cube = frame.indexes.get("cube")
+    if cube is None:
+        cube = frame.indexes["cube"] = TradeCube.from_frame(frame)
+    return cube
+
+
+def as_trade_cube(data: Union[TradeCube, TradeFrame, Sequence[Property]]) -> TradeCube:
+    """TradeCube, TradeFrame 또는 Property 목록을 TradeCube로 변환"""
+    if isinstance(data, TradeCube):
+        return data
+    return TradeCube.from_frame(as_trade_frame(data))
@@ -0,0 +1,46 @@
+"""실거래 데이터 내보내기 (NDJSON / CSV 스트리밍)"""
+
+import csv
+import io
+from typing import Iterator, List
+import numpy as np
+from app.models.schemas import Property
+from app.services.building_info_service import building_info_service
+from app.services.trade_frame import TradeFrame
+
+# 한 번에 Property로 변환해 내보내는 행 수 (메모리 사용량은 이 크기에만 비례)
+EXPORT_BATCH_SIZE = 1000
+
+# CSV 열 순서 (Property 필드 순서와 동일)
+CSV_FIELDS = list(Property.model_fields)
+
+
+def _batches(frame: TradeFrame, rows: np.ndarray) -> Iterator[List[Property]]:
+    """행 인덱스를 나눠 건축 정보를 추가한 Property 목록으로 변환"""
+    for start in range(0, len(rows), EXPORT_BATCH_SIZE):
+        yield [
+            building_info_service.enrich_property(prop)
+            for prop in frame.to_properties(rows[start:start + EXPORT_BATCH_SIZE])
+        ]
+
+
+def iter_ndjson(frame: TradeFrame, rows: np.ndarray) -> Iterator[bytes]:
+    """한 줄에 매물 하나씩 JSON (NDJSON)"""
+    for batch in _batches(frame, rows):
+        yield "".join(prop.model_dump_json() + "\n" for prop in batch).encode("utf-8")
+
+
+def iter_csv(frame: TradeFrame, rows: np.ndarray) -> Iterator[bytes]:
+    """CSV (첫 줄 헤더, 엑셀에서 한글이 깨지지 않도록 UTF-8 BOM 포함)"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS, lineterminator="\n")
+
+    # 헤더는 데이터 변환 전에 바로 전송
+    writer.writeheader()
+    yield ("﻿" + buffer.getvalue()).encode("utf-8")
+
+    for batch in _batches(frame, rows):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(prop.model_dump() for prop in batch)
+        yield buffer.getvalue().encode("utf-8")
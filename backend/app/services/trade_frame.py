@@ -0,0 +1,380 @@
+"""열 단위(columnar) 실거래 데이터 컨테이너
+
+분석/필터링 경로에서 Property 객체 목록 대신 사용합니다.
+수치 열은 NumPy 배열, 단지명/동 등 반복되는 문자열은 사전 인코딩(정수 코드 + 값 목록)으로 보관하고,
+Property 객체는 응답에 실제로 포함되는 행만 만듭니다.
+"""
+
+import hashlib
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+import numpy as np
+from app.models.schemas import Property
+
+# 행 단위 입력/출력 필드 순서
+FRAME_FIELDS = [
+    "id",
+    "property_type",
+    "region_code",
+    "dong",
+    "jibun",
+    "apartment_name",
+    "exclusive_area",
+    "deal_year",
+    "deal_month",
+    "deal_day",
+    "deal_amount",
+    "floor",
+    "build_year",
+    "road_name",
+]
+
+
+def make_id_key(property_id: str) -> int:
+    """매물 ID의 고정 길이(64비트) 해시 키"""
+    return int.from_bytes(
+        hashlib.blake2b(property_id.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+class TradeRecord:
+    """수집 단계 실거래 레코드
+
+    파서에서 타입 변환과 범위 확인을 마친 행만 담는 경량 객체로, 저장소 반영과 TradeFrame 생성에 사용합니다.
+    수집 단계에서는 Property(pydantic) 객체를 만들지 않고 응답 시점에만 만듭니다.
+    """
+
+    __slots__ = (*FRAME_FIELDS, "deal_date")
+
+    def __init__(
+        self,
+        id: str,
+        property_type: str,
+        region_code: Optional[str],
+        dong: str,
+        jibun: str,
+        apartment_name: str,
+        exclusive_area: float,
+        deal_year: int,
+        deal_month: int,
+        deal_day: int,
+        deal_amount: int,
+        floor: Optional[int],
+        build_year: Optional[int],
+        road_name: str,
+    ):
+        self.id = id
+        self.property_type = property_type
+        self.region_code = region_code
+        self.dong = dong
+        self.jibun = jibun
+        self.apartment_name = apartment_name
+        self.exclusive_area = exclusive_area
+        self.deal_year = deal_year
+        self.deal_month = deal_month
+        self.deal_day = deal_day
+        self.deal_amount = deal_amount
+        self.floor = floor
+        self.build_year = build_year
+        self.road_name = road_name
+        self.deal_date = f"{deal_year}-{deal_month:02d}-{deal_day:02d}"
+
+    def to_property(self) -> Property:
+        """Property 객체로 변환"""
+        return Property(**{field: getattr(self, field) for field in self.__slots__})
+
+
+class CategoricalColumn:
+    """사전 인코딩된 문자열 열 (codes[i]는 categories 내 위치)"""
+
+    __slots__ = ("codes", "categories", "_lookup")
+
+    def __init__(self, codes: np.ndarray, categories: List[str]):
+        self.codes = codes
+        self.categories = categories
+        self._lookup: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def encode(cls, values: Sequence[str]) -> "CategoricalColumn":
+        """문자열 목록 인코딩 (값 목록은 처음 등장한 순서)"""
+        lookup: Dict[str, int] = {}
+        codes = np.fromiter(
+            (lookup.setdefault(value, len(lookup)) for value in values),
+            dtype=np.int32,
+            count=len(values)
+        )
+        column = cls(codes, list(lookup))
+        column._lookup = lookup
+        return column
+
+    @classmethod
+    def concat(cls, columns: List["CategoricalColumn"]) -> "CategoricalColumn":
+        """여러 열을 하나로 합침 (값 목록 통합 후 코드 재매핑)"""
+        lookup: Dict[str, int] = {}
+        parts = []
+        for column in columns:
+            remap = np.fromiter(
+                (lookup.setdefault(value, len(lookup)) for value in column.categories),
+                dtype=np.int32,
+                count=len(column.categories)
+            )
+            parts.append(remap[column.codes] if len(column.codes) else column.codes)
+
+        codes = np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)
+        merged = cls(codes, list(lookup))
+        merged._lookup = lookup
+        return merged
+
+    @property
+    def lookup(self) -> Dict[str, int]:
+        """값 -> 코드"""
+        if self._lookup is None:
+            self._lookup = {value: code for code, value in enumerate(self.categories)}
+        return self._lookup
+
+    def code_of(self, value: str) -> int:
+        """값의 코드 (없으면 -1)"""
+        return self.lookup.get(value, -1)
+
+    def take(self, indices: np.ndarray) -> "CategoricalColumn":
+        column = CategoricalColumn(self.codes[indices], self.categories)
+        column._lookup = self._lookup
+        return column
+
+    def values(self, indices: Optional[np.ndarray] = None) -> List[str]:
+        """디코딩된 값 목록"""
+        codes = self.codes if indices is None else self.codes[indices]
+        categories = self.categories
+        return [categories[code] for code in codes.tolist()]
+
+    def __getitem__(self, index: int) -> str:
+        return self.categories[self.codes[index]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+class TradeFrame:
+    """열 단위 실거래 데이터
+
+    수치 열: deal_amount, exclusive_area, deal_year, deal_month, deal_day,
+             floor, build_year (층/건축년도 미상은 NaN)
+    파생 열: deal_ym (YYYYMM), deal_date (YYYYMMDD)
+    사전 인코딩 열: property_type, region_code, dong, apartment_name
+    문자열 열: id, jibun, road_name (응답 생성 시에만 사용)
+    """
+
+    CATEGORICAL = ("property_type", "region_code", "dong", "apartment_name")
+    NUMERIC = {
+        "exclusive_area": np.float64,
+        "deal_year": np.int16,
+        "deal_month": np.int8,
+        "deal_day": np.int8,
+        "deal_amount": np.int64,
+        "floor": np.float64,
+        "build_year": np.float64,
+    }
+    OBJECT = ("id", "jibun", "road_name")
+
+    def __init__(
+        self,
+        columns: Dict[str, Union[np.ndarray, CategoricalColumn]],
+        id_keys: Optional[np.ndarray] = None
+    ):
+        for name, column in columns.items():
+            setattr(self, name, column)
+
+        self._id_keys = id_keys
+        self._id_index: Optional[Dict[int, int]] = None
+        # 보조 인덱스 캐시 (trade_index에서 열 이름별로 생성)
+        self.indexes: Dict[str, object] = {}
+
+        self.deal_ym = self.deal_year.astype(np.int32) * 100 + self.deal_month
+        self.deal_date = self.deal_ym * 100 + self.deal_day
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence], fields: Sequence[str] = FRAME_FIELDS) -> "TradeFrame":
+        """행 목록(튜플)으로 생성"""
+        if not rows:
+            return cls.empty()
+
+        transposed = dict(zip(fields, zip(*rows)))
+        if "region_code" not in transposed:
+            transposed["region_code"] = ("",) * len(rows)
+        return cls._from_lists(transposed)
+
+    @classmethod
+    def from_properties(
+        cls, properties: Sequence[Union[Property, TradeRecord]]
+    ) -> "TradeFrame":
+        """Property 또는 TradeRecord 목록으로 생성"""
+        return cls.from_rows(
+            [tuple(getattr(p, field) for field in FRAME_FIELDS) for p in properties]
+        )
+
+    @classmethod
+    def _from_lists(cls, values: Dict[str, Sequence]) -> "TradeFrame":
+        columns: Dict[str, Union[np.ndarray, CategoricalColumn]] = {}
+
+        for name in cls.CATEGORICAL:
+            columns[name] = CategoricalColumn.encode(
+                [str(value) if value is not None else "" for value in values[name]]
+            )
+
+        for name, dtype in cls.NUMERIC.items():
+            if dtype is np.float64:
+                columns[name] = np.array(
+                    [np.nan if value is None else value for value in values[name]],
+                    dtype=dtype
+                )
+            else:
+                columns[name] = np.array(values[name], dtype=dtype)
+
+        for name in cls.OBJECT:
+            columns[name] = np.array(
+                [value or "" for value in values[name]], dtype=object
+            )
+
+        return cls(columns)
+
+    @classmethod
+    def empty(cls) -> "TradeFrame":
+        """빈 프레임"""
+        columns: Dict[str, Union[np.ndarray, CategoricalColumn]] = {
+            name: CategoricalColumn(np.empty(0, dtype=np.int32), []) for name in cls.CATEGORICAL
+        }
+        columns.update({name: np.empty(0, dtype=dtype) for name, dtype in cls.NUMERIC.items()})
+        columns.update({name: np.empty(0, dtype=object) for name in cls.OBJECT})
+        return cls(columns)
+
+    @classmethod
+    def concat(cls, frames: Iterable["TradeFrame"]) -> "TradeFrame":
+        """여러 프레임을 하나로 합침"""
+        frames = [frame for frame in frames if len(frame)]
+        if not frames:
+            return cls.empty()
+        if len(frames) == 1:
+            return frames[0]
+
+        columns: Dict[str, Union[np.ndarray, CategoricalColumn]] = {
+            name: CategoricalColumn.concat([getattr(f, name) for f in frames])
+            for name in cls.CATEGORICAL
+        }
+        for name in (*cls.NUMERIC, *cls.OBJECT):
+            columns[name] = np.concatenate([getattr(f, name) for f in frames])
+
+        # 이미 계산된 ID 키는 다시 해시하지 않음
+        id_keys = None
+        if all(f._id_keys is not None for f in frames):
+            id_keys = np.concatenate([f._id_keys for f in frames])
+        return cls(columns, id_keys)
+
+    def __len__(self) -> int:
+        return len(self.deal_amount)
+
+    def take(self, indices: np.ndarray) -> "TradeFrame":
+        """행 선택 (정수 인덱스 또는 불리언 마스크)"""
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+
+        columns: Dict[str, Union[np.ndarray, CategoricalColumn]] = {
+            name: getattr(self, name).take(indices) for name in self.CATEGORICAL
+        }
+        for name in (*self.NUMERIC, *self.OBJECT):
+            columns[name] = getattr(self, name)[indices]
+        id_keys = self._id_keys[indices] if self._id_keys is not None else None
+        return TradeFrame(columns, id_keys)
+
+    @property
+    def id_keys(self) -> np.ndarray:
+        """행별 매물 ID 해시 키 (uint64)"""
+        if self._id_keys is None:
+            self._id_keys = np.fromiter(
+                (make_id_key(property_id) for property_id in self.id.tolist()),
+                dtype=np.uint64,
+                count=len(self)
+            )
+        return self._id_keys
+
+    @property
+    def id_index(self) -> Dict[int, int]:
+        """ID 해시 키 -> 행 위치 (같은 ID가 여러 행이면 첫 행)"""
+        if self._id_index is None:
+            self.index_ids()
+        return self._id_index
+
+    def index_ids(self) -> "TradeFrame":
+        """ID 해시 인덱스 생성 (파티션 로드 시 스레드에서 미리 호출)"""
+        if self._id_index is None:
+            keys = self.id_keys.tolist()
+            # 뒤에서부터 채워 첫 행이 남도록 함
+            self._id_index = dict(zip(reversed(keys), range(len(keys) - 1, -1, -1)))
+        return self
+
+    def find_id(self, property_id: str) -> Optional[int]:
+        """매물 ID로 행 위치 검색 (해시 인덱스)"""
+        index = self.id_index.get(make_id_key(property_id))
+        if index is None:
+            return None
+        if self.id[index] == property_id:
+            return index
+
+        # 해시 키 충돌 시 전체 비교
+        matches = np.flatnonzero(self.id == property_id)
+        return int(matches[0]) if len(matches) else None
+
+    def to_properties(self, indices: Optional[np.ndarray] = None) -> List[Property]:
+        """선택한 행을 Property 객체로 변환 (응답에 포함되는 행에만 사용)"""
+        if indices is None:
+            indices = np.arange(len(self))
+
+        ids = self.id[indices].tolist()
+        property_types = self.property_type.values(indices)
+        region_codes = self.region_code.values(indices)
+        dongs = self.dong.values(indices)
+        jibuns = self.jibun[indices].tolist()
+        names = self.apartment_name.values(indices)
+        areas = self.exclusive_area[indices].tolist()
+        years = self.deal_year[indices].tolist()
+        months = self.deal_month[indices].tolist()
+        days = self.deal_day[indices].tolist()
+        amounts = self.deal_amount[indices].tolist()
+        floors = self.floor[indices].tolist()
+        build_years = self.build_year[indices].tolist()
+        road_names = self.road_name[indices].tolist()
+
+        properties = []
+        for i in range(len(ids)):
+            floor = floors[i]
+            build_year = build_years[i]
+            properties.append(
+                Property(
+                    id=ids[i],
+                    property_type=property_types[i],
+                    region_code=region_codes[i] or None,
+                    dong=dongs[i],
+                    jibun=jibuns[i],
+                    apartment_name=names[i],
+                    exclusive_area=areas[i],
+                    deal_year=years[i],
+                    deal_month=months[i],
+                    deal_day=days[i],
+                    deal_amount=amounts[i],
+                    floor=None if floor != floor else int(floor),
+                    build_year=None if build_year != build_year else int(build_year),
+                    road_name=road_names[i],
+                    deal_date=f"{years[i]}-{months[i]:02d}-{days[i]:02d}"
+                )
+            )
+
+        return properties
+
+    def to_property(self, index: int) -> Property:
+        """한 행을 Property 객체로 변환"""
+        return self.to_properties(np.array([index]))[0]
+
+
+def as_trade_frame(data: Union[TradeFrame, Sequence[Property]]) -> TradeFrame:
+    """TradeFrame 또는 Property 목록을 TradeFrame으로 변환"""
+    if isinstance(data, TradeFrame):
+        return data
+    return TradeFrame.from_properties(data)
@@ -0,0 +1,287 @@
+"""메모리 파티션 실거래 데이터 인덱스"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from app.services.building_info_service import building_info_service
+from app.services.name_index import NameIndex
+from app.services.trade_cube import partition_cube
+from app.services.trade_frame import TradeFrame, make_id_key
+
+# (지역코드, 거래년월)
+PartitionKey = Tuple[str, str]
+
+
+class TradeIdIndex:
+    """매물 ID 해시 키 -> 파티션 인덱스
+
+    파티션이 로드/갱신될 때 해당 파티션의 키만 빼고 다시 넣으므로
+    로드된 지역·기간이 늘어도 갱신 비용은 파티션 크기에만 비례합니다.
+    파티션 내 행 위치는 각 파티션 TradeFrame의 id_index로 찾습니다.
+    """
+
+    def __init__(self):
+        self._index: Dict[int, PartitionKey] = {}
+        # 둘 이상의 파티션에 있는 키 (다른 지역에 같은 ID의 거래가 있는 경우)
+        self._shared: Dict[int, List[PartitionKey]] = {}
+        self._partition_sizes: Dict[PartitionKey, int] = {}
+
+    def replace_partition(
+        self,
+        partition: PartitionKey,
+        old_frame: Optional[TradeFrame],
+        new_frame: TradeFrame
+    ):
+        """파티션 키 교체"""
+        if old_frame is not None:
+            for key in np.unique(old_frame.id_keys).tolist():
+                self._remove(key, partition)
+
+        keys = np.unique(new_frame.id_keys).tolist()
+        for key in keys:
+            self._add(key, partition)
+        self._partition_sizes[partition] = len(keys)
+
+    def _add(self, key: int, partition: PartitionKey):
+        current = self._index.get(key)
+        if current is None:
+            self._index[key] = partition
+        elif current != partition:
+            shared = self._shared.setdefault(key, [current])
+            if partition not in shared:
+                shared.append(partition)
+
+    def _remove(self, key: int, partition: PartitionKey):
+        shared = self._shared.get(key)
+        if shared is not None:
+            if partition in shared:
+                shared.remove(partition)
+            if len(shared) == 1:
+                self._index[key] = shared[0]
+                del self._shared[key]
+        elif self._index.get(key) == partition:
+            del self._index[key]
+
+    def lookup(self, property_id: str) -> List[PartitionKey]:
+        """매물 ID가 있을 수 있는 파티션 목록"""
+        key = make_id_key(property_id)
+        shared = self._shared.get(key)
+        if shared is not None:
+            return list(shared)
+        partition = self._index.get(key)
+        return [partition] if partition is not None else []
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self._index),
+            "shared_keys": len(self._shared),
+            "partitions": len(self._partition_sizes)
+        }
+
+
+class SortedIndex:
+    """정렬 보조 인덱스 (범위 조건에 맞는 행만 이진 탐색으로 찾음)"""
+
+    __slots__ = ("order", "values", "size")
+
+    def __init__(self, values: np.ndarray):
+        self.order = np.argsort(values, kind="stable")
+        self.values = values[self.order]
+        if self.values.dtype.kind in "iu":
+            # 조회 시 경계값과의 형 변환으로 배열 전체가 복사되지 않도록 int64로 보관
+            self.values = self.values.astype(np.int64)
+        # NaN(미상)은 정렬 시 맨 뒤에 모이며 어떤 범위에도 포함되지 않음
+        self.size = (
+            int(np.count_nonzero(~np.isnan(values)))
+            if values.dtype.kind == "f" else len(values)
+        )
+
+    def _bounds(self, low, high) -> Tuple[int, int]:
+        start = 0 if low is None else int(np.searchsorted(self.values[:self.size], low, side="left"))
+        end = self.size if high is None else int(np.searchsorted(self.values[:self.size], high, side="right"))
+        return start, max(start, end)
+
+    def count(self, low, high) -> int:
+        """low <= 값 <= high 행 수"""
+        start, end = self._bounds(low, high)
+        return end - start
+
+    def rows(self, low, high) -> np.ndarray:
+        """low <= 값 <= high 행 위치 (오름차순)"""
+        start, end = self._bounds(low, high)
+        return np.sort(self.order[start:end])
+
+
+class InvertedIndex:
+    """역색인 (사전 인코딩 열의 코드 -> 행 위치)"""
+
+    __slots__ = ("order", "offsets")
+
+    def __init__(self, codes: np.ndarray, n_categories: int):
+        # 코드별로 모은 행 위치 (같은 코드 안에서는 행 순서 유지)
+        self.order = np.argsort(codes, kind="stable")
+        self.offsets = np.zeros(n_categories + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=n_categories), out=self.offsets[1:])
+
+    def _valid(self, codes: Iterable[int]) -> List[int]:
+        return sorted({code for code in codes if 0 <= code < len(self.offsets) - 1})
+
+    def count(self, codes: Iterable[int]) -> int:
+        """코드 중 하나에 해당하는 행 수"""
+        return sum(
+            int(self.offsets[code + 1] - self.offsets[code]) for code in self._valid(codes)
+        )
+
+    def rows(self, codes: Iterable[int]) -> np.ndarray:
+        """코드 중 하나에 해당하는 행 위치 (오름차순)"""
+        valid = self._valid(codes)
+        if not valid:
+            return np.empty(0, dtype=np.int64)
+        if len(valid) == 1:
+            return self.order[self.offsets[valid[0]]:self.offsets[valid[0] + 1]]
+        return np.sort(np.concatenate([
+            self.order[self.offsets[code]:self.offsets[code + 1]] for code in valid
+        ]))
+
+
+class KeysetIndex:
+    """목록 정렬 순서 인덱스
+
+    (정렬 값, 매물 ID 키, 같은 ID 내 순번) 순으로 정렬하므로 행마다 정렬 키가 유일하고,
+    마지막으로 받은 행의 정렬 키(커서)만 있으면 다음 위치를 이진 탐색으로 찾습니다.
+    내림차순은 정렬 값의 부호를 바꿔 보관합니다 (동점은 방향과 무관하게 ID 키 오름차순).
+    NaN(미상)은 부호를 바꿔도 NaN이므로 방향과 무관하게 맨 뒤에 모입니다.
+    """
+
+    __slots__ = ("order", "rank", "values", "keys", "occurrences", "descending")
+
+    def __init__(self, values: np.ndarray, id_keys: np.ndarray, descending: bool):
+        if values.dtype.kind in "iu":
+            values = values.astype(np.int64)
+        values = -values if descending else values
+        occurrences = _occurrences(id_keys)
+
+        self.order = np.lexsort((occurrences, id_keys, values))
+        self.values = values[self.order]
+        self.keys = id_keys[self.order]
+        self.occurrences = occurrences[self.order]
+        self.descending = descending
+
+        # 행 위치 -> 정렬 순서상 위치
+        self.rank = np.empty_like(self.order)
+        self.rank[self.order] = np.arange(len(self.order))
+
+    def key_at(self, position: int) -> Tuple:
+        """정렬 순서상 위치의 정렬 키 (정렬 값, ID 키, 순번)"""
+        value = self.values[position].item()
+        return (
+            -value if self.descending else value,
+            int(self.keys[position]),
+            int(self.occurrences[position])
+        )
+
+    def position_after(self, key: Tuple) -> int:
+        """정렬 키 바로 다음 위치"""
+        value, id_key, occurrence = key
+        targets = (-value if self.descending else value, id_key, occurrence)
+
+        start, end = 0, len(self.order)
+        for column, target in zip((self.values, self.keys, self.occurrences), targets):
+            # 같은 자료형으로 비교 (uint64 키를 float로 바꿔 비교하지 않도록)
+            target = column.dtype.type(target)
+            segment = column[start:end]
+            start, end = (
+                start + int(np.searchsorted(segment, target, side="left")),
+                start + int(np.searchsorted(segment, target, side="right"))
+            )
+        return end
+
+
+def _occurrences(keys: np.ndarray) -> np.ndarray:
+    """행별로 같은 키가 앞에서 몇 번째로 나왔는지 (0부터)"""
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    positions = np.arange(len(keys))
+    starts = np.ones(len(keys), dtype=bool)
+    starts[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    run_starts = np.maximum.accumulate(np.where(starts, positions, 0)) if len(keys) else positions
+
+    occurrences = np.empty(len(keys), dtype=np.int64)
+    occurrences[order] = positions - run_starts
+    return occurrences
+
+
+# 1평 = 3.3㎡ (시세 분석과 동일)
+PYEONG_AREA = 3.3
+
+# 목록 정렬 기준 -> 정렬 값
+SORT_COLUMNS: Dict[str, Callable[[TradeFrame], np.ndarray]] = {
+    "deal_date": lambda frame: frame.deal_date,
+    "price": lambda frame: frame.deal_amount,
+    "area": lambda frame: frame.exclusive_area,
+    "price_per_pyeong": lambda frame: _price_per_pyeong(frame),
+}
+
+
+def _price_per_pyeong(frame: TradeFrame) -> np.ndarray:
+    """평당 가격 (면적이 0이거나 미상이면 NaN -> 정렬 시 방향과 무관하게 맨 뒤)"""
+    area = frame.exclusive_area
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(area > 0, frame.deal_amount / (area / PYEONG_AREA), np.nan)
+
+
+def keyset_index(frame: TradeFrame, sort: str, descending: bool) -> KeysetIndex:
+    """목록 정렬 순서 인덱스 (프레임별로 처음 사용할 때 생성)"""
+    key = f"keyset:{sort}:{'desc' if descending else 'asc'}"
+    index = frame.indexes.get(key)
+    if index is None:
+        index = frame.indexes[key] = KeysetIndex(
+            SORT_COLUMNS[sort](frame), frame.id_keys, descending
+        )
+    return index
+
+
+def sorted_index(frame: TradeFrame, column: str) -> SortedIndex:
+    """수치 열 정렬 인덱스 (프레임별로 처음 사용할 때 생성)"""
+    key = f"sorted:{column}"
+    index = frame.indexes.get(key)
+    if index is None:
+        index = frame.indexes[key] = SortedIndex(getattr(frame, column))
+    return index
+
+
+def inverted_index(frame: TradeFrame, column: str) -> InvertedIndex:
+    """사전 인코딩 열 역색인 (프레임별로 처음 사용할 때 생성)"""
+    key = f"inverted:{column}"
+    index = frame.indexes.get(key)
+    if index is None:
+        categorical = getattr(frame, column)
+        index = frame.indexes[key] = InvertedIndex(categorical.codes, len(categorical.categories))
+    return index
+
+
+def apartment_name_index(frame: TradeFrame) -> NameIndex:
+    """단지명 n-gram 역색인 (프레임별로 처음 사용할 때 생성)"""
+    index = frame.indexes.get("ngram:apartment_name")
+    if index is None:
+        index = frame.indexes["ngram:apartment_name"] = NameIndex(
+            frame.apartment_name.categories, building_info_service.normalize_apartment_name
+        )
+    return index
+
+
+def apartment_name_counts(frame: TradeFrame) -> np.ndarray:
+    """단지명 코드별 거래 건수"""
+    counts = frame.indexes.get("counts:apartment_name")
+    if counts is None:
+        counts = frame.indexes["counts:apartment_name"] = np.bincount(
+            frame.apartment_name.codes, minlength=len(frame.apartment_name.categories)
+        )
+    return counts
+
+
+def prepare_partition_frame(frame: TradeFrame) -> TradeFrame:
+    """파티션 로드 시 미리 만드는 인덱스 (매물 ID, 단지명 n-gram, 집계 큐브)"""
+    frame.index_ids()
+    apartment_name_index(frame)
+    partition_cube(frame)
+    return frame
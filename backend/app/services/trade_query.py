@@ -0,0 +1,328 @@
+"""매물 목록 필터 조건 (실거래 /trades, 현재 매물 /listings 공용)"""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, TypeVar
+import numpy as np
+from app.services.trade_frame import TradeFrame
+from app.services.building_info_service import building_info_service
+from app.services.trade_index import apartment_name_index, inverted_index, keyset_index, sorted_index
+
+T = TypeVar("T")
+
+# 이보다 작은 프레임은 인덱스를 만들지 않고 조건 순서대로 스캔
+INDEX_MIN_ROWS = 20000
+
+# 가장 선택도 높은 인덱스 조건의 해당 행이 전체의 이 비율을 넘으면 인덱스 대신 스캔
+INDEX_SCAN_RATIO = 0.2
+
+
+@dataclass
+class _Condition:
+    """TradeFrame 필터 조건"""
+    name: str
+    # 후보 행 인덱스(None이면 전체) -> 통과 여부 마스크
+    mask: Callable[[Optional[np.ndarray]], np.ndarray]
+    # 인덱스 기준 해당 행 수
+    estimate: Callable[[], int]
+    # 인덱스로 찾은 해당 행 위치 (오름차순)
+    lookup: Callable[[], np.ndarray]
+
+
+@dataclass
+class TradeQuery:
+    """매물 목록 필터 조건
+
+    TradeFrame에는 조건을 차례로 적용하되 앞 조건을 통과한 행만 다음 조건에서 확인하므로
+    전체 비용이 (행 수 × 조건 수)가 아니라 행 수 + 조건별 후보 수에 비례합니다.
+    큰 프레임에서는 면적/가격/거래일 정렬 인덱스와 유형/동/단지명 역색인으로 조건별 해당 행 수를 구해
+    가장 적은 조건의 인덱스로 후보를 찾고, 나머지 조건은 후보 행에만 적용합니다.
+    Property 목록에는 조건을 하나의 판정 함수로 묶어 한 번만 순회합니다.
+    """
+
+    property_type: Optional[str] = None
+    min_area: Optional[float] = None
+    max_area: Optional[float] = None
+    min_price: Optional[int] = None
+    max_price: Optional[int] = None
+    apartment_name: Optional[str] = None
+    dongs: Optional[Sequence[str]] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+    def _conditions(self, frame: TradeFrame) -> List[_Condition]:
+        """TradeFrame 필터 조건 목록
+
+        동등 비교(유형/동/단지명)는 정수 코드 비교라 스캔 시 가장 먼저 적용합니다.
+        """
+        def column(values: np.ndarray, candidates: Optional[np.ndarray]) -> np.ndarray:
+            return values if candidates is None else values[candidates]
+
+        def categorical(name: str, codes: List[int]) -> _Condition:
+            values = getattr(frame, name).codes
+            if len(codes) == 1:
+                mask = lambda c: column(values, c) == codes[0]
+            else:
+                mask = lambda c: np.isin(column(values, c), codes)
+            return _Condition(
+                name,
+                mask,
+                lambda: inverted_index(frame, name).count(codes),
+                lambda: inverted_index(frame, name).rows(codes)
+            )
+
+        def value_range(name: str, low, high) -> _Condition:
+            values = getattr(frame, name)
+            return _Condition(
+                name,
+                lambda c: _in_range(column(values, c), low, high),
+                lambda: sorted_index(frame, name).count(low, high),
+                lambda: sorted_index(frame, name).rows(low, high)
+            )
+
+        conditions = []
+
+        if self.property_type:
+            conditions.append(categorical(
+                "property_type", [frame.property_type.code_of(self.property_type)]
+            ))
+
+        if self.dongs:
+            conditions.append(categorical(
+                "dong", [frame.dong.code_of(dong) for dong in self.dongs]
+            ))
+
+        if self.apartment_name:
+            # 단지명 n-gram 역색인으로 해당 단지 코드 검색 (표기 변형/공백 무시)
+            conditions.append(categorical(
+                "apartment_name", apartment_name_index(frame).search(self.apartment_name)
+            ))
+
+        if self.min_area is not None or self.max_area is not None:
+            conditions.append(value_range("exclusive_area", self.min_area, self.max_area))
+
+        if self.min_price is not None or self.max_price is not None:
+            conditions.append(value_range("deal_amount", self.min_price, self.max_price))
+
+        if self.start_date is not None or self.end_date is not None:
+            conditions.append(value_range(
+                "deal_date", _date_key(self.start_date), _date_key(self.end_date)
+            ))
+
+        return conditions
+
+    def plan(self, frame: TradeFrame) -> Tuple[Optional[_Condition], List[_Condition]]:
+        """실행 계획 (인덱스로 후보를 찾을 조건, 후보에 차례로 적용할 나머지 조건)"""
+        conditions = self._conditions(frame)
+        if not conditions or len(frame) < INDEX_MIN_ROWS:
+            return None, conditions
+
+        # 조건별 해당 행 수가 적은 순으로 정렬
+        estimated = sorted(
+            ((condition.estimate(), i, condition) for i, condition in enumerate(conditions))
+        )
+        ordered = [condition for _, _, condition in estimated]
+
+        if estimated[0][0] > len(frame) * INDEX_SCAN_RATIO:
+            return None, ordered
+        return ordered[0], ordered[1:]
+
+    def explain(self, frame: TradeFrame) -> dict:
+        """실행 계획 요약"""
+        index_condition, rest = self.plan(frame)
+        return {
+            "index": index_condition.name if index_condition else None,
+            "filters": [condition.name for condition in rest]
+        }
+
+    def select(self, frame: TradeFrame) -> np.ndarray:
+        """조건에 맞는 행 인덱스 (원래 순서 유지)"""
+        index_condition, rest = self.plan(frame)
+        candidates = index_condition.lookup() if index_condition else None
+
+        for condition in rest:
+            # 남은 후보가 없으면 나머지 조건은 확인하지 않음
+            if candidates is not None and not len(candidates):
+                break
+            mask = condition.mask(candidates)
+            candidates = np.flatnonzero(mask) if candidates is None else candidates[mask]
+
+        return np.arange(len(frame)) if candidates is None else candidates
+
+    @property
+    def is_empty(self) -> bool:
+        """필터 조건이 하나도 없는지 여부"""
+        return not (
+            self.property_type or self.dongs or self.apartment_name
+            or self.min_area is not None or self.max_area is not None
+            or self.min_price is not None or self.max_price is not None
+            or self.start_date is not None or self.end_date is not None
+        )
+
+    def seek(
+        self,
+        frame: TradeFrame,
+        sort: str,
+        descending: bool,
+        after: Optional[Tuple],
+        offset: int,
+        limit: int
+    ) -> Tuple[np.ndarray, int, Optional[Tuple]]:
+        """정렬 순서상 after(정렬 키) 다음부터 offset을 건너뛴 한 페이지
+
+        정렬 순서 인덱스에서 커서 위치를 이진 탐색으로 찾으므로 몇 번째 페이지든 비용이 같습니다.
+        조건이 없으면 인덱스를 바로 잘라 쓰고, 있으면 조건에 맞는 행의 정렬 순위 중
+        커서 다음 순위만 골라 페이지 크기만큼 부분 정렬합니다.
+
+        Returns:
+            (페이지 행 인덱스, 전체 건수, 다음 페이지 정렬 키 또는 None)
+        """
+        index = keyset_index(frame, sort, descending)
+        start = index.position_after(after) if after is not None else 0
+        end = offset + limit
+
+        if self.is_empty:
+            total = len(frame)
+            positions = np.arange(start + offset, min(start + end, total))
+            has_more = start + end < total
+        else:
+            matched = self.select(frame)
+            total = len(matched)
+            ranks = index.rank[matched]
+            ranks = ranks[ranks >= start]
+            has_more = len(ranks) > end
+            if has_more:
+                ranks = np.partition(ranks, end - 1)[:end]
+            positions = np.sort(ranks)[offset:]
+
+        next_key = index.key_at(int(positions[-1])) if has_more and len(positions) else None
+        return index.order[positions], total, next_key
+
+    def ordered(self, frame: TradeFrame, sort: str, descending: bool) -> np.ndarray:
+        """조건에 맞는 전체 행 인덱스 (정렬 순서, seek와 같은 순서)"""
+        index = keyset_index(frame, sort, descending)
+        if self.is_empty:
+            return index.order
+        return index.order[np.sort(index.rank[self.select(frame)])]
+
+    def compile(self) -> Callable[[object], bool]:
+        """Property(또는 같은 필드를 가진 객체) 판정 함수"""
+        checks: List[Callable[[object], bool]] = []
+
+        if self.property_type:
+            property_type = self.property_type
+            checks.append(lambda p: p.property_type == property_type)
+
+        if self.dongs:
+            dongs = set(self.dongs)
+            checks.append(lambda p: p.dong in dongs)
+
+        if self.apartment_name:
+            normalize = building_info_service.normalize_apartment_name
+            keyword = normalize(self.apartment_name)
+            checks.append(lambda p: keyword in normalize(p.apartment_name))
+
+        if self.min_area is not None:
+            min_area = self.min_area
+            checks.append(lambda p: p.exclusive_area >= min_area)
+
+        if self.max_area is not None:
+            max_area = self.max_area
+            checks.append(lambda p: p.exclusive_area <= max_area)
+
+        if self.min_price is not None:
+            min_price = self.min_price
+            checks.append(lambda p: p.deal_amount >= min_price)
+
+        if self.max_price is not None:
+            max_price = self.max_price
+            checks.append(lambda p: p.deal_amount <= max_price)
+
+        if self.start_date is not None:
+            start = self.start_date.isoformat()
+            checks.append(lambda p: p.deal_date is not None and p.deal_date >= start)
+
+        if self.end_date is not None:
+            end = self.end_date.isoformat()
+            checks.append(lambda p: p.deal_date is not None and p.deal_date <= end)
+
+        if not checks:
+            return lambda p: True
+        if len(checks) == 1:
+            return checks[0]
+
+        def predicate(p) -> bool:
+            for check in checks:
+                if not check(p):
+                    return False
+            return True
+
+        return predicate
+
+    def paginate(
+        self, items: Iterable[T], offset: int, limit: int, count_total: bool = True
+    ) -> Tuple[List[T], Optional[int]]:
+        """한 번 순회하며 한 페이지만 모으고 전체 건수 계산
+
+        count_total=False이면 페이지가 차는 즉시 순회를 멈추고 전체 건수는 None을 반환합니다.
+        """
+        predicate = self.compile()
+        end = offset + limit
+        page: List[T] = []
+        total = 0
+
+        for item in items:
+            if not predicate(item):
+                continue
+            if offset <= total < end:
+                page.append(item)
+            total += 1
+            if total >= end and not count_total:
+                return page, None
+
+        return page, total
+
+
+def encode_cursor(sort: str, descending: bool, key: Tuple) -> str:
+    """정렬 키 -> 페이지 커서 문자열"""
+    payload = json.dumps([sort, "desc" if descending else "asc", *key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, descending: bool) -> Tuple:
+    """페이지 커서 문자열 -> 정렬 키
+
+    Raises:
+        ValueError: 형식이 잘못되었거나 다른 정렬 기준의 커서인 경우
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, order, value, id_key, occurrence = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise ValueError("잘못된 커서입니다.")
+
+    if cursor_sort != sort or order != ("desc" if descending else "asc"):
+        raise ValueError("정렬 기준이 다른 커서입니다.")
+    if (
+        not isinstance(value, (int, float))
+        or not isinstance(id_key, int) or not 0 <= id_key < 2 ** 64
+        or not isinstance(occurrence, int) or occurrence < 0
+    ):
+        raise ValueError("잘못된 커서입니다.")
+    return value, id_key, occurrence
+
+
+def _date_key(value: Optional[date]) -> Optional[int]:
+    """날짜 -> YYYYMMDD 정수 (TradeFrame.deal_date 형식)"""
+    return value.year * 10000 + value.month * 100 + value.day if value else None
+
+
+def _in_range(values: np.ndarray, low, high) -> np.ndarray:
+    """low <= values <= high (None은 제한 없음)"""
+    if low is None:
+        return values <= high
+    if high is None:
+        return values >= low
+    return (values >= low) & (values <= high)
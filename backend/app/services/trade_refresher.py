@@ -0,0 +1,108 @@
+"""실거래 데이터 백그라운드 갱신 스케줄러"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+from app.core.config import settings
+from app.services.molit_api_xml import MolitAPIServiceXML, molit_service_xml
+
+
+class TradeRefresher:
+    """실거래 파티션 백그라운드 갱신 스케줄러
+
+    당월(및 신고 기한 내 월)과 최근 요청된 파티션을 만료 전에 미리 갱신하여
+    만료 직후 요청이 API 조회 지연을 떠안지 않도록 합니다.
+    """
+
+    def __init__(self, service: MolitAPIServiceXML):
+        self.service = service
+        self.interval = settings.TRADE_REFRESH_INTERVAL
+        self.refresh_ahead = settings.CACHE_DURATION * settings.TRADE_REFRESH_AHEAD_RATIO
+        self.hot_window = settings.TRADE_HOT_WINDOW
+
+        self._task: Optional[asyncio.Task] = None
+        self.cycles = 0
+        self.last_cycle_at: Optional[float] = None
+
+    def start(self):
+        """갱신 루프 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """갱신 루프 종료"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        """주기적으로 갱신 대상 파티션 갱신"""
+        while True:
+            try:
+                await self.refresh_due_partitions()
+            except Exception as e:
+                print(f"⚠️  백그라운드 갱신 오류: {e}")
+            await asyncio.sleep(self.interval)
+
+    def hot_partitions(self) -> List[Tuple[str, str]]:
+        """갱신 대상 후보 파티션 (기본 지역 당월~신고 기한 내 월 + 최근 요청 파티션)"""
+        open_months = self.service._recent_months(self.service.store.reporting_lag_months + 1)
+        partitions = {(settings.MAPO_REGION_CODE, deal_ymd) for deal_ymd in open_months}
+
+        now = time.time()
+        for key, requested_at in list(self.service.recent_partitions.items()):
+            if now - requested_at <= self.hot_window:
+                partitions.add(key)
+            else:
+                del self.service.recent_partitions[key]
+
+        return sorted(partitions)
+
+    async def refresh_due_partitions(self):
+        """만료가 임박했거나 만료된 파티션 갱신"""
+        self.cycles += 1
+        self.last_cycle_at = time.time()
+
+        # API 키가 없거나 서킷 브레이커가 열린 동안은 갱신하지 않음
+        if not self.service.has_api_key or self.service.circuit.is_open:
+            return
+
+        store = self.service.store
+        due = []
+        for region_code, deal_ymd in self.hot_partitions():
+            info = await asyncio.to_thread(store.get_partition_info, region_code, deal_ymd)
+            types = self.service.trade_types
+            if info is not None and store.is_immutable(info, types):
+                continue
+            # 최근 갱신에 실패한 파티션은 재시도 대기 시간이 지난 뒤에만 갱신
+            if not self.service.can_refresh(region_code, deal_ymd):
+                continue
+            if info is None or time.time() - info.oldest_fetched_at(types) >= self.refresh_ahead:
+                due.append((region_code, deal_ymd))
+
+        # 갱신 실패는 파티션별 갱신 이력에 기록되므로 여기서는 무시
+        await asyncio.gather(
+            *(self.service.refresh_partition(region_code, deal_ymd) for region_code, deal_ymd in due),
+            return_exceptions=True
+        )
+
+    def stats(self) -> dict:
+        """스케줄러 상태"""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval": self.interval,
+            "cycles": self.cycles,
+            "last_cycle_at": (
+                datetime.fromtimestamp(self.last_cycle_at).isoformat(timespec="seconds")
+                if self.last_cycle_at else None
+            )
+        }
+
+
+# 싱글톤 인스턴스
+trade_refresher = TradeRefresher(molit_service_xml)
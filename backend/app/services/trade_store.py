@@ -0,0 +1,557 @@
+"""실거래 데이터 영구 저장소 (SQLite)
+
+지역코드 + 거래년월(DEAL_YMD) 단위 파티션으로 실거래 데이터를 저장합니다.
+신고 기한이 지난 달은 더 이상 바뀌지 않으므로 한 번 저장하면 다시 조회하지 않고,
+당월/전월처럼 신고가 계속 들어오는 달만 CACHE_DURATION 주기로 갱신합니다.
+
+갱신 시에는 거래 키 기준으로 기존 파티션과 비교하여 추가/수정/삭제분만 반영하고,
+변경이 있으면 데이터셋 버전을 올려 변경 내역(change feed)에 기록합니다.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from app.core.config import settings
+from app.models.schemas import Property, TradeChange, TradeChangeFeed
+from app.services.trade_frame import TradeFrame, TradeRecord
+from app.services.trade_index import prepare_partition_frame
+
+# 저장 컬럼 (건축 정보 등 조회 시 추가되는 필드는 저장하지 않음)
+TRADE_COLUMNS = [
+    "id",
+    "property_type",
+    "dong",
+    "jibun",
+    "apartment_name",
+    "exclusive_area",
+    "deal_year",
+    "deal_month",
+    "deal_day",
+    "deal_amount",
+    "floor",
+    "build_year",
+    "road_name",
+    "deal_date",
+]
+
+
+# 스키마 버전 (변경 시 캐시 테이블을 재생성)
+SCHEMA_VERSION = 3
+
+# 거래 키 구성 필드 (정정 신고로 바뀔 수 있는 거래금액 등은 제외)
+TRADE_KEY_FIELDS = [
+    "property_type",
+    "dong",
+    "jibun",
+    "apartment_name",
+    "deal_date",
+    "exclusive_area",
+    "floor",
+]
+
+
+def make_trade_keys(
+    properties: List[TradeRecord], existing: Optional[Dict[str, Tuple]] = None
+) -> List[str]:
+    """파티션 내 거래 키 생성
+
+    같은 단지/날짜/면적/층의 거래가 여러 건이면 일련번호를 붙여 구분합니다.
+    기존 행(existing, 거래 키 -> 저장 행)이 있으면 같은 거래 조건의 기존 키를 먼저 이어 받습니다.
+    내용이 같은 행은 그 행의 키를, 나머지는 남은 기존 키를 받으므로
+    중복 거래 중 한 건의 거래금액이 정정되어도 짝이 바뀌지 않고 그 한 건만 수정으로 기록됩니다.
+    새 일련번호는 응답 순서대로 비어 있는 가장 작은 번호를 씁니다.
+    """
+    groups: Dict[str, List[int]] = defaultdict(list)
+    for index, prop in enumerate(properties):
+        groups[_natural_key(getattr(prop, field) for field in TRADE_KEY_FIELDS)].append(index)
+
+    previous: Dict[str, List[Tuple[str, Tuple]]] = defaultdict(list)
+    for key, row in sorted((existing or {}).items()):
+        previous[_natural_key(row[position] for position in _KEY_POSITIONS)].append((key, row))
+
+    keys = [""] * len(properties)
+    for natural_key, indices in groups.items():
+        candidates = previous.get(natural_key, [])
+        pending = indices
+        if candidates:
+            # 내용이 같은 기존 행의 키 재사용
+            unused = list(candidates)
+            pending = []
+            for index in indices:
+                row = trade_row(properties[index])
+                match = next((i for i, (_, old) in enumerate(unused) if old == row), None)
+                if match is None:
+                    pending.append(index)
+                else:
+                    keys[index] = unused.pop(match)[0]
+            # 남은 기존 키 (내용이 바뀐 행)
+            for index, (key, _) in zip(pending, unused):
+                keys[index] = key
+            pending = pending[len(unused):]
+
+        # 새 일련번호
+        used = {keys[index] for index in indices if keys[index]}
+        ordinal = 0
+        for index in pending:
+            while True:
+                digest = _trade_key(natural_key, ordinal)
+                ordinal += 1
+                if digest not in used:
+                    break
+            keys[index] = digest
+
+    return keys
+
+
+def trade_row(prop: TradeRecord) -> Tuple:
+    """저장 행 (TRADE_COLUMNS 순서)"""
+    return tuple(getattr(prop, column) for column in TRADE_COLUMNS)
+
+
+# 저장 행에서 거래 키 구성 필드 위치
+_KEY_POSITIONS = [TRADE_COLUMNS.index(field) for field in TRADE_KEY_FIELDS]
+
+
+def _natural_key(values: Iterable) -> str:
+    """거래 조건 (거래 키 구성 필드 값)"""
+    return "|".join(str(value) for value in values)
+
+
+def _trade_key(natural_key: str, ordinal: int) -> str:
+    """거래 조건 + 일련번호 해시"""
+    return hashlib.blake2b(f"{natural_key}#{ordinal}".encode("utf-8"), digest_size=8).hexdigest()
+
+
+@dataclass
+class PartitionDelta:
+    """파티션 갱신 결과"""
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    version: int = 0  # 반영 후 데이터셋 버전
+    fetched_at: float = 0.0  # 조회 시각 (epoch, 반영 후 PartitionInfo.updated_at)
+    previous_fetched_at: Optional[float] = None  # 반영 전 PartitionInfo.updated_at (새 파티션이면 None)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted)
+
+
+@dataclass
+class PartitionInfo:
+    """파티션 메타 정보"""
+    region_code: str
+    deal_ymd: str
+    fetched_at: float  # 마지막 전체 유형 조회 시각 (epoch)
+    row_count: int
+    # 일부 유형만 조회에 성공한 경우 그 유형의 조회 시각 (전체 조회 시 비움)
+    type_fetched_at: Dict[str, float] = field(default_factory=dict)
+
+    def fetched_at_of(self, property_type: str) -> float:
+        """매물 유형의 마지막 조회 시각"""
+        return max(self.fetched_at, self.type_fetched_at.get(property_type, 0.0))
+
+    def oldest_fetched_at(self, property_types: Optional[Sequence[str]] = None) -> float:
+        """매물 유형 중 가장 오래된 조회 시각 (유형을 지정하지 않으면 전체 유형 조회 시각)"""
+        if not property_types:
+            return self.fetched_at
+        return min(self.fetched_at_of(property_type) for property_type in property_types)
+
+    @property
+    def updated_at(self) -> float:
+        """마지막으로 반영한 조회 시각 (일부 유형 조회 포함)"""
+        return max([self.fetched_at, *self.type_fetched_at.values()])
+
+
+class TradeStore:
+    """지역코드/거래년월 단위로 분할된 실거래 데이터 저장소"""
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_duration = settings.CACHE_DURATION
+        self.reporting_lag_months = settings.TRADE_REPORTING_LAG_MONTHS
+        self.change_retention = settings.TRADE_CHANGE_RETENTION_DAYS * 86400
+        # 데이터셋 버전 (변경 반영 시마다 증가, 원본은 meta 테이블이며 이 값은 마지막으로 확인한 버전)
+        self.version = 0
+
+        # 스레드풀(asyncio.to_thread)에서 접근하므로 연결 하나를 락으로 보호
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._init_schema()
+
+    def _init_schema(self):
+        """테이블 생성 (스키마 버전이 다르면 재생성)"""
+        column_defs = ", ".join(TRADE_COLUMNS)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+
+            user_version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if user_version != SCHEMA_VERSION:
+                # 저장소는 API 데이터 캐시이므로 스키마 변경 시 비우고 다시 채움
+                for table in ("partitions", "partition_types", "trades", "trade_changes", "meta"):
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS partitions (
+                    region_code TEXT NOT NULL,
+                    deal_ymd TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    row_count INTEGER NOT NULL,
+                    PRIMARY KEY (region_code, deal_ymd)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS partition_types (
+                    region_code TEXT NOT NULL,
+                    deal_ymd TEXT NOT NULL,
+                    property_type TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (region_code, deal_ymd, property_type)
+                )
+                """
+            )
+            self._conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS trades (
+                    region_code TEXT NOT NULL,
+                    deal_ymd TEXT NOT NULL,
+                    trade_key TEXT NOT NULL,
+                    {column_defs},
+                    PRIMARY KEY (region_code, deal_ymd, trade_key)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS trade_changes (
+                    version INTEGER NOT NULL,
+                    region_code TEXT NOT NULL,
+                    deal_ymd TEXT NOT NULL,
+                    op TEXT NOT NULL,
+                    trade_key TEXT NOT NULL,
+                    data TEXT,
+                    changed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_trade_changes_version "
+                "ON trade_changes (version)"
+            )
+            # 보관 기간 지난 변경 내역 삭제용
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_trade_changes_changed_at "
+                "ON trade_changes (changed_at)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+            self.version = self._stored_version()
+
+    def _stored_version(self) -> int:
+        """저장된 데이터셋 버전 (락을 잡은 상태에서 호출)"""
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'dataset_version'"
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def current_version(self) -> int:
+        """저장된 데이터셋 버전 (같은 파일을 쓰는 다른 워커가 반영한 변경 포함)"""
+        with self._lock:
+            self.version = self._stored_version()
+        return self.version
+
+    def is_closed_month(self, deal_ymd: str) -> bool:
+        """신고 기한이 지나 더 이상 변경되지 않는 달인지 여부"""
+        now = datetime.now()
+        months_ago = (now.year - int(deal_ymd[:4])) * 12 + (now.month - int(deal_ymd[4:]))
+        return months_ago > self.reporting_lag_months
+
+    def is_immutable(
+        self, info: PartitionInfo, property_types: Optional[Sequence[str]] = None
+    ) -> bool:
+        """더 이상 재조회가 필요 없는 파티션인지 여부 (마감 이후에 조회한 마감월)
+
+        property_types를 지정하면 해당 유형이 모두 마감 이후에 조회되었는지로 판단합니다.
+        """
+        return (
+            self.is_closed_month(info.deal_ymd)
+            and self._fetched_after_close(info.deal_ymd, info.oldest_fetched_at(property_types))
+        )
+
+    def is_fresh(
+        self, info: Optional[PartitionInfo], property_types: Optional[Sequence[str]] = None
+    ) -> bool:
+        """파티션을 재조회 없이 사용할 수 있는지 여부 (property_types: 모두 최신이어야 하는 유형)"""
+        if info is None:
+            return False
+
+        if self.is_immutable(info, property_types):
+            return True
+
+        return time.time() - info.oldest_fetched_at(property_types) < self.cache_duration
+
+    def mutable_types(self, info: Optional[PartitionInfo], property_types: Sequence[str]) -> List[str]:
+        """다시 조회해야 하는 매물 유형 (마감월에서 마감 이후에 조회한 유형은 제외)"""
+        if info is None or not self.is_closed_month(info.deal_ymd):
+            return list(property_types)
+        return [
+            property_type for property_type in property_types
+            if not self._fetched_after_close(info.deal_ymd, info.fetched_at_of(property_type))
+        ]
+
+    def _fetched_after_close(self, deal_ymd: str, fetched_at: float) -> bool:
+        """해당 월 신고 마감 이후에 조회되었는지 여부"""
+        fetched = datetime.fromtimestamp(fetched_at)
+        months_after = (fetched.year - int(deal_ymd[:4])) * 12 + (fetched.month - int(deal_ymd[4:]))
+        return months_after > self.reporting_lag_months
+
+    def get_partition_info(self, region_code: str, deal_ymd: str) -> Optional[PartitionInfo]:
+        """파티션 메타 정보 조회"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at, row_count FROM partitions "
+                "WHERE region_code = ? AND deal_ymd = ?",
+                (region_code, deal_ymd)
+            ).fetchone()
+            type_rows = self._conn.execute(
+                "SELECT property_type, fetched_at FROM partition_types "
+                "WHERE region_code = ? AND deal_ymd = ?",
+                (region_code, deal_ymd)
+            ).fetchall() if row is not None else []
+
+        if row is None:
+            return None
+
+        return PartitionInfo(
+            region_code=region_code,
+            deal_ymd=deal_ymd,
+            fetched_at=row[0],
+            row_count=row[1],
+            type_fetched_at=dict(type_rows)
+        )
+
+    def load_partition_frame(self, region_code: str, deal_ymd: str) -> TradeFrame:
+        """파티션의 실거래 데이터를 TradeFrame으로 로드 (매물 ID/단지명 인덱스 포함)"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT region_code, {', '.join(TRADE_COLUMNS)} FROM trades "
+                "WHERE region_code = ? AND deal_ymd = ?",
+                (region_code, deal_ymd)
+            ).fetchall()
+
+        return prepare_partition_frame(TradeFrame.from_rows(rows, ["region_code", *TRADE_COLUMNS]))
+
+    def apply_partition(
+        self,
+        region_code: str,
+        deal_ymd: str,
+        properties: List[TradeRecord],
+        property_types: Optional[Sequence[str]] = None
+    ) -> PartitionDelta:
+        """파티션 갱신 (거래 키 기준 추가/수정/삭제분만 반영)
+
+        변경이 있으면 데이터셋 버전을 올리고 변경 내역에 기록합니다.
+        같은 파일을 쓰는 다른 워커/프로세스와 버전이 겹치지 않도록
+        쓰기 트랜잭션(BEGIN IMMEDIATE) 안에서 저장된 버전을 읽어 올립니다.
+
+        Args:
+            property_types: 일부 매물 유형만 조회된 경우 그 유형 목록.
+                해당 유형의 행만 비교/반영하고 나머지 유형의 행은 유지합니다.
+                파티션 조회 시각은 그대로 두고 유형별 조회 시각만 기록하므로
+                조회하지 못한 유형만 만료 상태로 남고, 마감월은 유형별로 조회가 끝나면 더 이상 재조회하지 않습니다.
+        """
+        columns = ", ".join(TRADE_COLUMNS)
+        placeholders = ", ".join("?" for _ in range(len(TRADE_COLUMNS) + 3))
+        now = time.time()
+
+        type_filter = ""
+        if property_types is not None:
+            type_filter = f" AND property_type IN ({', '.join('?' for _ in property_types)})"
+
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            current_version = self._stored_version()
+
+            old_rows: Dict[str, Tuple] = {
+                row[0]: tuple(row[1:])
+                for row in self._conn.execute(
+                    f"SELECT trade_key, {columns} FROM trades "
+                    "WHERE region_code = ? AND deal_ymd = ?" + type_filter,
+                    (region_code, deal_ymd, *(property_types or []))
+                )
+            }
+            # 기존 행과 짝을 맞춰 거래 키 부여 (중복 거래의 가격 정정이 다른 행 수정으로 번지지 않도록)
+            new_rows: Dict[str, Tuple] = {
+                key: trade_row(p)
+                for key, p in zip(make_trade_keys(properties, old_rows), properties)
+            }
+
+            # 반영 전 조회 시각 (메모리 프레임이 이 시점 데이터인지 확인용)
+            row = self._conn.execute(
+                "SELECT p.fetched_at, MAX(t.fetched_at) FROM partitions p "
+                "LEFT JOIN partition_types t USING (region_code, deal_ymd) "
+                "WHERE p.region_code = ? AND p.deal_ymd = ?",
+                (region_code, deal_ymd)
+            ).fetchone()
+            previous_fetched_at = max(row[0], row[1] or 0.0) if row[0] is not None else None
+
+            # 일부 유형만 반영하는 경우 파티션 조회 시각은 유지하고 유형별 조회 시각 기록
+            # (처음 저장하는 파티션은 나머지 유형이 만료 상태가 되도록 0으로 저장)
+            fetched_at = now
+            if property_types is not None:
+                fetched_at = row[0] if row[0] is not None else 0.0
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO partition_types "
+                    "(region_code, deal_ymd, property_type, fetched_at) VALUES (?, ?, ?, ?)",
+                    [(region_code, deal_ymd, property_type, now) for property_type in property_types]
+                )
+            else:
+                # 전체 유형 조회 시각이 유형별 조회 시각을 대신함
+                self._conn.execute(
+                    "DELETE FROM partition_types WHERE region_code = ? AND deal_ymd = ?",
+                    (region_code, deal_ymd)
+                )
+
+            inserted = [key for key in new_rows if key not in old_rows]
+            deleted = [key for key in old_rows if key not in new_rows]
+            updated = [
+                key for key in new_rows
+                if key in old_rows and new_rows[key] != old_rows[key]
+            ]
+            delta = PartitionDelta(
+                inserted=len(inserted),
+                updated=len(updated),
+                deleted=len(deleted),
+                version=current_version,
+                fetched_at=now,
+                previous_fetched_at=previous_fetched_at
+            )
+
+            if delta.changed:
+                version = current_version + 1
+
+                self._conn.executemany(
+                    "DELETE FROM trades WHERE region_code = ? AND deal_ymd = ? AND trade_key = ?",
+                    [(region_code, deal_ymd, key) for key in deleted + updated]
+                )
+                self._conn.executemany(
+                    f"INSERT INTO trades (region_code, deal_ymd, trade_key, {columns}) "
+                    f"VALUES ({placeholders})",
+                    [(region_code, deal_ymd, key, *new_rows[key]) for key in inserted + updated]
+                )
+
+                changes = (
+                    [("insert", key, new_rows[key]) for key in inserted]
+                    + [("update", key, new_rows[key]) for key in updated]
+                    + [("delete", key, old_rows[key]) for key in deleted]
+                )
+                self._conn.executemany(
+                    "INSERT INTO trade_changes "
+                    "(version, region_code, deal_ymd, op, trade_key, data, changed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            version, region_code, deal_ymd, op, key,
+                            json.dumps(dict(zip(TRADE_COLUMNS, row)), ensure_ascii=False),
+                            now
+                        )
+                        for op, key, row in changes
+                    ]
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('dataset_version', ?)",
+                    (str(version),)
+                )
+                self._conn.execute(
+                    "DELETE FROM trade_changes WHERE changed_at < ?",
+                    (now - self.change_retention,)
+                )
+                delta.version = version
+
+            row_count = len(new_rows)
+            if property_types is not None:
+                row_count = self._conn.execute(
+                    "SELECT COUNT(*) FROM trades WHERE region_code = ? AND deal_ymd = ?",
+                    (region_code, deal_ymd)
+                ).fetchone()[0]
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO partitions (region_code, deal_ymd, fetched_at, row_count) "
+                "VALUES (?, ?, ?, ?)",
+                (region_code, deal_ymd, fetched_at, row_count)
+            )
+
+        # 커밋 이후에 버전 반영
+        self.version = delta.version
+        return delta
+
+    def get_changes(self, since: int, limit: int = 1000) -> TradeChangeFeed:
+        """since 버전 이후 변경 내역 조회
+
+        한 버전의 변경 내역은 나누지 않고 반환하므로 next_since를 다음 요청의 since로 쓰면 됩니다.
+        """
+        select = "SELECT version, region_code, deal_ymd, op, trade_key, data FROM trade_changes "
+
+        with self._lock:
+            # 다른 워커가 반영한 변경도 포함되도록 저장된 버전 기준
+            current_version = self.version = self._stored_version()
+            rows = self._conn.execute(
+                select + "WHERE version > ? AND version <= ? ORDER BY version, rowid LIMIT ?",
+                (since, current_version, limit + 1)
+            ).fetchall()
+
+            has_more = len(rows) > limit
+            if has_more:
+                # 마지막 버전이 잘린 경우 해당 버전은 다음 요청으로 넘김
+                cut_version = rows[limit][0]
+                rows = [row for row in rows[:limit] if row[0] != cut_version]
+                if not rows:
+                    # 한 버전이 limit보다 크면 그 버전 전체 반환
+                    rows = self._conn.execute(
+                        select + "WHERE version = ? ORDER BY rowid",
+                        (cut_version,)
+                    ).fetchall()
+
+            oldest = self._conn.execute("SELECT MIN(version) FROM trade_changes").fetchone()[0]
+
+        # 보관 기간이 지나 since 이후 내역 일부가 삭제된 경우 전체 재동기화 필요
+        reset = since < current_version and (oldest is None or oldest > since + 1)
+
+        changes = [
+            TradeChange(
+                version=version,
+                op=op,
+                region_code=region_code,
+                deal_ymd=deal_ymd,
+                trade_key=trade_key,
+                property=Property(region_code=region_code, **json.loads(data))
+            )
+            for version, region_code, deal_ymd, op, trade_key, data in rows
+        ]
+
+        return TradeChangeFeed(
+            version=current_version,
+            since=since,
+            next_since=changes[-1].version if changes else max(since, 0),
+            has_more=has_more,
+            reset=reset,
+            changes=changes
+        )
+
+
+# 싱글톤 인스턴스
+trade_store = TradeStore(settings.TRADE_STORE_PATH)
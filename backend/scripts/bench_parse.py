@@ -0,0 +1,107 @@
+"""실거래 XML 파싱 처리량 측정
+
+수집 경로의 행당 비용을 단계별로 비교합니다.
+  - XML 스트리밍 파싱 (item 필드 추출)
+  - 필드 → TradeRecord (자체 검증 + 경량 레코드, 현재 방식)
+  - 필드 → Property (행마다 pydantic 객체 생성, 기존 방식)
+  - TradeRecord → TradeFrame, TradeFrame → Property (응답 변환)
+  - Property 생성 시 검증(pydantic-core) / model_construct 비교
+
+사용법 (backend 디렉터리에서):
+    python scripts/bench_parse.py [--rows 20000] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models.schemas import Property, PropertyType  # noqa: E402
+from app.services.molit_api_xml import TRADE_ENDPOINTS, molit_service_xml  # noqa: E402
+from app.services.molit_xml_parser import MolitXMLStreamParser  # noqa: E402
+from app.services.trade_frame import FRAME_FIELDS, TradeFrame  # noqa: E402
+
+CHUNK_SIZE = 64 * 1024
+
+
+def make_xml(rows: int) -> bytes:
+    """테스트용 아파트 실거래 응답 XML"""
+    dongs = ["아현동", "공덕동", "상암동", "성산동", "합정동"]
+    items = "".join(
+        f"<item><aptNm>단지{i % 97}</aptNm><buildYear>{1990 + i % 35}</buildYear>"
+        f"<dealAmount>{50000 + i % 150000:,}</dealAmount><dealDay>{i % 28 + 1}</dealDay>"
+        f"<dealMonth>{i % 12 + 1}</dealMonth><dealYear>2025</dealYear>"
+        f"<excluUseAr>{40 + i % 120}.{i % 100:02d}</excluUseAr><floor>{i % 30 + 1}</floor>"
+        f"<jibun>{i % 500}</jibun><umdNm>{dongs[i % len(dongs)]}</umdNm></item>"
+        for i in range(rows)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><response><header><resultCode>000</resultCode>'
+        f"<resultMsg>OK</resultMsg></header><body><items>{items}</items>"
+        f"<totalCount>{rows}</totalCount></body></response>"
+    ).encode("utf-8")
+
+
+def parse_fields(xml: bytes) -> list:
+    parser = MolitXMLStreamParser()
+    fields = []
+    for start in range(0, len(xml), CHUNK_SIZE):
+        fields.extend(parser.feed(xml[start:start + CHUNK_SIZE]))
+    fields.extend(parser.close())
+    return fields
+
+
+def bench(label: str, func, rows: int, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<36} {best * 1000:9.1f} ms  {rows / best:12,.0f} rows/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="실거래 XML 파싱 처리량 측정")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows, repeat = args.rows, args.repeat
+    endpoint = TRADE_ENDPOINTS[PropertyType.APARTMENT]
+    xml = make_xml(rows)
+    print(f"📏 {rows:,}행 / {len(xml) / 1024 / 1024:.1f}MB, {repeat}회 중 최고 기록\n")
+
+    fields = bench("XML 스트리밍 파싱", lambda: parse_fields(xml), rows, repeat)
+
+    def to_records():
+        return [molit_service_xml._parse_trade_data(f, "11440", endpoint) for f in fields]
+
+    records = bench("필드 → TradeRecord (현재)", to_records, rows, repeat)
+
+    # 기존 방식: 같은 값으로 행마다 검증된 Property 생성
+    keys = (*FRAME_FIELDS, "deal_date")
+    bench(
+        "필드 → 변환 + Property 검증 (기존)",
+        lambda: [
+            Property(**{key: getattr(r, key) for key in keys})
+            for r in to_records()
+        ],
+        rows,
+        repeat,
+    )
+
+    frame = bench("TradeRecord → TradeFrame", lambda: TradeFrame.from_properties(records), rows, repeat)
+    bench("TradeFrame → Property (현재)", frame.to_properties, rows, repeat)
+
+    # 응답 변환 시 객체 생성 비용만 비교
+    values = [{key: getattr(r, key) for key in keys} for r in records]
+    bench("Property 생성 - 검증", lambda: [Property(**v) for v in values], rows, repeat)
+    bench("Property 생성 - model_construct", lambda: [Property.model_construct(**v) for v in values], rows, repeat)
+
+
+if __name__ == "__main__":
+    main()
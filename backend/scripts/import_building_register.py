@@ -0,0 +1,42 @@
+"""건축물대장 CSV -> 건축 정보 저장소(SQLite) 변환
+
+공공데이터포털/건축HUB의 건축물대장 총괄표제부 CSV를 한 행씩 읽어
+건축 정보 보강에 필요한 필드(용적률, 건폐율, 대지면적, 세대수, 주차대수, 사용승인연도)만 저장합니다.
+변환한 파일을 BUILDING_INFO_PATH로 지정하면 서버가 JSON 대신 사용하며,
+실행 중인 서버는 파일 교체를 감지해 자동으로 다시 엽니다.
+
+사용법 (backend 디렉터리에서):
+    python scripts/import_building_register.py 총괄표제부.csv [--output app/data/cache/buildings.sqlite3] [--encoding cp949]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.building_info_service import normalize_apartment_name  # noqa: E402
+from app.services.building_store import import_building_register  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="건축물대장 CSV -> 건축 정보 저장소 변환")
+    parser.add_argument("csv_path", help="건축물대장 총괄표제부 CSV 파일")
+    parser.add_argument("--output", default="app/data/cache/buildings.sqlite3", help="저장소 파일 경로")
+    parser.add_argument("--encoding", default="utf-8-sig", help="CSV 인코딩 (공공데이터포털 파일은 보통 cp949)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    count = import_building_register(
+        args.csv_path, args.output, normalize_apartment_name, encoding=args.encoding
+    )
+    elapsed = time.perf_counter() - started
+
+    size = Path(args.output).stat().st_size
+    print(f"✅ {count:,}개 단지 저장 ({elapsed:.1f}초, {size / 1024 / 1024:.1f}MB): {args.output}")
+    print(f"   .env에 BUILDING_INFO_PATH={args.output} 를 지정하세요.")
+
+
+if __name__ == "__main__":
+    main()
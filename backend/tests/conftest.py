@@ -0,0 +1,115 @@
+"""테스트 공통 설정
+
+앱 모듈을 가져오기 전에 저장소 경로 등을 임시 디렉터리로 바꾸고,
+국토부 API는 httpx.MockTransport로 대체합니다.
+"""
+
+import inspect
+import os
+import tempfile
+
+_TMP_DIR = tempfile.mkdtemp(prefix="mapo-test-")
+os.environ.setdefault("TRADE_STORE_PATH", os.path.join(_TMP_DIR, "trades.sqlite3"))
+os.environ.setdefault("MOLIT_API_KEY", "test")
+os.environ.setdefault("BUILDING_INFO_WATCH_INTERVAL", "0")
+
+from typing import Callable, List, Optional
+
+import httpx
+import pytest
+
+from app.services.molit_api_xml import MolitAPIServiceXML
+from app.services.trade_frame import TradeRecord
+from app.services.trade_store import TradeStore
+
+
+def make_record(
+    index: int,
+    deal_ymd: str = "202401",
+    property_type: str = "아파트",
+    apartment_name: str = "마포래미안푸르지오",
+    deal_amount: Optional[int] = None
+) -> TradeRecord:
+    """테스트용 실거래 레코드"""
+    year, month = int(deal_ymd[:4]), int(deal_ymd[4:])
+    return TradeRecord(
+        id=f"T_{deal_ymd}_{index}",
+        property_type=property_type,
+        region_code="11440",
+        dong="아현동",
+        jibun=str(index),
+        apartment_name=apartment_name,
+        exclusive_area=59.0 + index % 30,
+        deal_year=year,
+        deal_month=month,
+        deal_day=index % 28 + 1,
+        deal_amount=deal_amount if deal_amount is not None else 100000 + index,
+        floor=index % 20 + 1,
+        build_year=2014,
+        road_name=""
+    )
+
+
+def trade_xml(deal_ymd: str, count: int, name_tag: str = "aptNm", result_code: str = "000") -> bytes:
+    """국토부 실거래 API 응답 XML"""
+    items = "".join(
+        f"<item><{name_tag}>단지{i % 5}</{name_tag}><buildYear>2014</buildYear>"
+        f"<dealAmount>{100000 + i:,}</dealAmount><dealDay>{i % 28 + 1}</dealDay>"
+        f"<dealMonth>{int(deal_ymd[4:])}</dealMonth><dealYear>{deal_ymd[:4]}</dealYear>"
+        f"<excluUseAr>{59 + i % 30}.97</excluUseAr><floor>{i % 20 + 1}</floor>"
+        f"<jibun>{i}</jibun><umdNm>아현동</umdNm></item>"
+        for i in range(count)
+    )
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?><response><header><resultCode>{result_code}</resultCode>'
+        f"<resultMsg>OK</resultMsg></header><body><items>{items}</items>"
+        f"<numOfRows>1000</numOfRows><pageNo>1</pageNo><totalCount>{count}</totalCount></body></response>"
+    ).encode()
+
+
+@pytest.fixture
+def store(tmp_path) -> TradeStore:
+    """빈 실거래 저장소"""
+    return TradeStore(str(tmp_path / "trades.sqlite3"))
+
+
+@pytest.fixture
+def make_service(store) -> Callable[..., MolitAPIServiceXML]:
+    """국토부 API를 handler로 대체한 실거래 서비스 생성
+
+    handler(request)는 httpx.Response를 반환하며 (코루틴 가능), 요청 기록은 service.requests에 남습니다.
+    """
+    def factory(
+        handler: Callable[[httpx.Request], httpx.Response],
+        trade_types: Optional[List[str]] = None
+    ) -> MolitAPIServiceXML:
+        from app.services.molit_api_xml import TRADE_ENDPOINTS
+        from app.models.schemas import PropertyType
+
+        service = MolitAPIServiceXML()
+        service.api_key = "test"
+        service.store = store
+        service.retry_base_delay = 0
+        service.retry_max_delay = 0
+        if trade_types is not None:
+            service.endpoints = [TRADE_ENDPOINTS[PropertyType(name)] for name in trade_types]
+
+        requests: List[httpx.Request] = []
+
+        async def record(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            response = handler(request)
+            if inspect.isawaitable(response):
+                response = await response
+            return response
+
+        service.requests = requests
+        service._client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+        return service
+
+    return factory
+
+
+def count_requests(requests: List[httpx.Request], path_part: str = "") -> int:
+    """경로에 path_part가 포함된 요청 수"""
+    return sum(1 for request in requests if path_part in request.url.path)
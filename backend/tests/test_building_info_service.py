@@ -0,0 +1,67 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.services.building_info_service import (
+    BuildingInfoService,
+    BuildingRegistry,
+    normalize_apartment_name
+)
+from app.services.building_store import import_building_register
+
+
+def write_store(tmp_path, name: str, rows) -> str:
+    """건축물대장 CSV로 저장소 파일 생성"""
+    csv_path = tmp_path / f"{name}.csv"
+    csv_path.write_text(
+        "bldNm,vlRat,bcRat,platArea,hhldCnt,useAprDay\n"
+        + "".join(f"{row},250,20,10000,500,20100101\n" for row in rows),
+        encoding="utf-8"
+    )
+    output_path = str(tmp_path / "buildings.sqlite3")
+    import_building_register(str(csv_path), output_path, normalize_apartment_name)
+    return output_path
+
+
+def test_registry_is_abstract():
+    with pytest.raises(TypeError):
+        BuildingRegistry()
+
+
+def test_reload_closes_replaced_store(tmp_path):
+    path = write_store(tmp_path, "v1", ["마포래미안푸르지오"])
+    service = BuildingInfoService(path)
+    first = service._registry
+    assert service.get_building_info("마포래미안푸르지오")["floor_area_ratio"] == 250
+
+    # 파일 교체 후 재로드 (수정 시각이 같아도 크기가 달라지도록 단지 추가)
+    write_store(tmp_path, "v2", ["마포래미안푸르지오", "공덕자이"])
+    assert asyncio.run(service.reload(force=True))
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        first.store.get("마포래미안푸르지오")
+    assert service.get_building_info("공덕자이") is not None
+
+    current = service._registry
+    service.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        current.store.get("공덕자이")
+
+
+def test_lookup_retries_on_snapshot_replaced_during_query(tmp_path):
+    path = write_store(tmp_path, "v1", ["마포래미안푸르지오"])
+    service = BuildingInfoService(path)
+    stale = service._registry
+
+    # 교체 전에 잡은 스냅샷(닫힌 저장소)으로 조회가 시작된 경우
+    asyncio.run(service.reload(force=True))
+    service._registry, current = stale, service._registry
+    original_lookup = stale.lookup
+
+    def lookup_then_swap(name):
+        service._registry = current
+        return original_lookup(name)
+
+    stale.lookup = lookup_then_swap
+    assert service.get_building_info("마포래미안푸르지오")["total_households"] == 500
@@ -0,0 +1,283 @@
+import asyncio
+
+import httpx
+
+from app.services.molit_api_xml import MolitAPIError
+from app.services.resilience import CircuitBreaker
+from app.services.trade_frame import TradeFrame
+from conftest import count_requests, make_record, trade_xml
+
+DEAL_YMD = "202401"
+
+
+def officetel_forbidden(request: httpx.Request) -> httpx.Response:
+    """아파트만 활용신청된 API 키 (오피스텔/연립다세대는 403)"""
+    if "Apt" in request.url.path:
+        return httpx.Response(200, content=trade_xml(request.url.params["DEAL_YMD"], 12))
+    return httpx.Response(403)
+
+
+def test_partial_type_failure_keeps_succeeded_types(make_service, store):
+    service = make_service(officetel_forbidden, trade_types=["아파트", "오피스텔", "연립다세대"])
+    # 이전에 저장된 오피스텔 거래는 조회 실패 시에도 유지되어야 함
+    store.apply_partition("11440", DEAL_YMD, [make_record(0, DEAL_YMD, property_type="오피스텔")])
+    before = store.get_partition_info("11440", DEAL_YMD)
+
+    frame = asyncio.run(service.refresh_partition("11440", DEAL_YMD))
+
+    assert sorted(set(frame.property_type.categories)) == ["아파트", "오피스텔"]
+    assert len(frame) == 13
+    assert service.refresh_stats[("11440", DEAL_YMD)].failing
+
+    # 일부 유형 실패는 파티션을 최신으로 표시하지 않음 (다음 요청에서 재조회)
+    info = store.get_partition_info("11440", DEAL_YMD)
+    assert info.fetched_at == before.fetched_at
+    assert info.row_count == 13
+
+    # 4xx 응답은 서킷 브레이커 실패로 세지 않음
+    assert service.circuit.state == CircuitBreaker.CLOSED
+    assert service.circuit.consecutive_failures == 0
+
+
+def test_partial_type_failure_on_cold_partition_is_degraded(make_service, store):
+    service = make_service(officetel_forbidden, trade_types=["아파트", "오피스텔"])
+
+    frame, degraded = asyncio.run(service._load_partition("11440", DEAL_YMD))
+
+    assert len(frame) == 12
+    assert degraded
+    assert not store.is_fresh(store.get_partition_info("11440", DEAL_YMD))
+
+
+def test_all_types_failing_raises_without_tripping_circuit(make_service):
+    service = make_service(lambda request: httpx.Response(403), trade_types=["아파트", "오피스텔"])
+
+    for _ in range(service.circuit.failure_threshold + 1):
+        try:
+            asyncio.run(service.refresh_partition("11440", DEAL_YMD))
+        except MolitAPIError:
+            pass
+        else:
+            raise AssertionError("모든 유형 실패 시 예외가 발생해야 합니다")
+
+    assert service.circuit.state == CircuitBreaker.CLOSED
+
+
+def test_server_errors_open_circuit(make_service):
+    service = make_service(lambda request: httpx.Response(503), trade_types=["아파트"])
+    service.max_retries = 0
+
+    for _ in range(service.circuit.failure_threshold):
+        try:
+            asyncio.run(service.refresh_partition("11440", DEAL_YMD))
+        except MolitAPIError:
+            pass
+
+    assert service.circuit.state == CircuitBreaker.OPEN
+    requests = count_requests(service.requests)
+
+    # 열림 상태에서는 API를 호출하지 않음
+    frame, degraded = asyncio.run(service._load_partition("11440", "202402"))
+    assert len(frame) == 0 and degraded
+    assert count_requests(service.requests) == requests
+
+
+def test_cold_load_and_refresh_share_one_upstream_fetch(make_service):
+    async def slow_upstream(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, content=trade_xml(request.url.params["DEAL_YMD"], 3))
+
+    service = make_service(slow_upstream, trade_types=["아파트"])
+
+    async def run():
+        # 백그라운드 갱신과 첫 요청들이 동시에 같은 파티션을 로드
+        return await asyncio.gather(
+            service.refresh_partition("11440", DEAL_YMD),
+            service._load_month("11440", DEAL_YMD),
+            service._load_month("11440", DEAL_YMD)
+        )
+
+    refreshed, first, second = asyncio.run(run())
+
+    assert count_requests(service.requests) == 1
+    assert len(refreshed) == len(first) == len(second) == 3
+
+
+def test_merged_frame_not_cached_under_generation_of_refresh_during_load(make_service):
+    service = make_service(lambda request: httpx.Response(500), trade_types=["아파트"])
+    deal_ymd = service._recent_months(1)[0]
+    partition = ("11440", deal_ymd)
+    old = TradeFrame.from_properties([make_record(i, deal_ymd) for i in range(3)])
+    new = TradeFrame.from_properties([make_record(i, deal_ymd) for i in range(5)])
+    service._set_partition_frame(*partition, 1.0, old)
+
+    async def load_month_with_refresh(region_code, ymd):
+        frame = service._partition_frames[(region_code, ymd)][1]
+        # 로드를 기다리는 동안 갱신이 끝나 파티션이 교체됨
+        service._set_partition_frame(region_code, ymd, 2.0, new)
+        await asyncio.sleep(0)
+        return frame
+
+    async def load_month(region_code, ymd):
+        return service._partition_frames[(region_code, ymd)][1]
+
+    service._load_month = load_month_with_refresh
+    assert len(asyncio.run(service.fetch_frame(["11440"], 1))) == 3
+    service._load_month = load_month
+    assert len(asyncio.run(service.fetch_frame(["11440"], 1))) == 5
+
+    service._set_partition_frame(*partition, 3.0, old)
+    service._load_month = load_month_with_refresh
+    assert asyncio.run(service.fetch_cube(["11440"], 1)).total == 3
+    service._load_month = load_month
+    assert asyncio.run(service.fetch_cube(["11440"], 1)).total == 5
+
+
+GATEWAY_ERROR = (
+    '<OpenAPI_ServiceResponse><cmmMsgHeader><errMsg>SERVICE ERROR</errMsg>'
+    '<returnAuthMsg>LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR</returnAuthMsg>'
+    '<returnReasonCode>22</returnReasonCode></cmmMsgHeader></OpenAPI_ServiceResponse>'
+).encode()
+
+
+def test_gateway_error_response_does_not_delete_stored_rows(make_service, store):
+    # 요청 한도 초과/인증키 오류는 HTTP 200에 resultCode 없는 게이트웨이 응답으로 옴
+    service = make_service(lambda request: httpx.Response(200, content=GATEWAY_ERROR))
+    store.apply_partition("11440", DEAL_YMD, [make_record(i, DEAL_YMD) for i in range(30)])
+
+    try:
+        asyncio.run(service.refresh_partition("11440", DEAL_YMD))
+    except MolitAPIError as e:
+        assert "22" in str(e)
+    else:
+        raise AssertionError("게이트웨이 오류 응답은 MolitAPIError여야 함")
+
+    assert store.get_partition_info("11440", DEAL_YMD).row_count == 30
+    assert store.version == 1
+    assert store.get_changes(1).changes == []
+    assert service.refresh_stats[("11440", DEAL_YMD)].failure_count == 1
+
+
+def test_response_without_result_code_is_error(make_service, store):
+    body = trade_xml(DEAL_YMD, 0).replace(b"<resultCode>000</resultCode>", b"")
+    service = make_service(lambda request: httpx.Response(200, content=body))
+    store.apply_partition("11440", DEAL_YMD, [make_record(0, DEAL_YMD)])
+
+    try:
+        asyncio.run(service.refresh_partition("11440", DEAL_YMD))
+    except MolitAPIError:
+        pass
+    else:
+        raise AssertionError("결과 코드 없는 응답은 MolitAPIError여야 함")
+    assert store.get_partition_info("11440", DEAL_YMD).row_count == 1
+
+
+def test_failing_stale_partition_is_not_refetched_on_every_request(make_service, store):
+    service = make_service(lambda request: httpx.Response(403))
+    store.apply_partition("11440", DEAL_YMD, [make_record(i, DEAL_YMD) for i in range(3)])
+    # 만료된 파티션
+    with store._conn:
+        store._conn.execute("UPDATE partitions SET fetched_at = 0")
+
+    async def load():
+        frame = await service._load_month("11440", DEAL_YMD)
+        await asyncio.gather(*service._background_tasks)
+        return frame
+
+    async def scenario():
+        for _ in range(5):
+            assert len(await load()) == 3
+
+    asyncio.run(scenario())
+    stats = service.refresh_stats[("11440", DEAL_YMD)]
+    assert len(service.requests) == 1
+    assert stats.failing and stats.consecutive_failures == 1
+
+    # 대기 시간이 지나면 다시 시도하고, 연속 실패 시 대기 시간이 늘어남
+    stats.last_failed_at -= service.refresh_retry_cooldown
+    asyncio.run(scenario())
+    assert len(service.requests) == 2
+    assert stats.retry_at(service.refresh_retry_cooldown, service.refresh_retry_max_cooldown) == (
+        stats.last_failed_at + 2 * service.refresh_retry_cooldown
+    )
+
+
+def test_failing_cold_partition_is_not_refetched_on_every_request(make_service):
+    service = make_service(lambda request: httpx.Response(403))
+
+    async def scenario():
+        for _ in range(5):
+            frame, degraded = await service._load_partition("11440", DEAL_YMD)
+            assert len(frame) == 0 and degraded
+
+    asyncio.run(scenario())
+    assert len(service.requests) == 1
+
+
+def test_closed_month_settles_per_type_after_partial_refresh(make_service, store):
+    officetel_approved = False
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        deal_ymd = request.url.params["DEAL_YMD"]
+        if "Apt" in request.url.path:
+            return httpx.Response(200, content=trade_xml(deal_ymd, 12))
+        if officetel_approved:
+            return httpx.Response(200, content=trade_xml(deal_ymd, 5, name_tag="offiNm"))
+        return httpx.Response(403)
+
+    service = make_service(handler, trade_types=["아파트", "오피스텔"])
+    types = service.trade_types
+
+    # 처음 저장하는 마감월에서 오피스텔만 실패: 아파트는 마감 이후 조회로 기록
+    frame, degraded = asyncio.run(service._load_partition("11440", DEAL_YMD))
+    assert len(frame) == 12 and degraded
+    info = store.get_partition_info("11440", DEAL_YMD)
+    assert not store.is_fresh(info, types)
+    assert store.mutable_types(info, types) == ["오피스텔"]
+
+    # 재시도에서는 실패한 유형만 조회
+    officetel_approved = True
+    frame = asyncio.run(service.refresh_partition("11440", DEAL_YMD))
+    assert len(frame) == 17
+    assert (count_requests(service.requests, "Apt"), count_requests(service.requests, "Offi")) == (1, 2)
+    assert not service.refresh_stats[("11440", DEAL_YMD)].failing
+
+    # 모든 유형을 마감 이후에 조회했으므로 더 이상 재조회하지 않음
+    info = store.get_partition_info("11440", DEAL_YMD)
+    assert store.is_immutable(info, types)
+    frame, degraded = asyncio.run(service._load_partition("11440", DEAL_YMD))
+    assert len(frame) == 17 and not degraded
+    assert len(service.requests) == 3
+
+
+def test_refresh_keeps_unchanged_frames_and_unrelated_merged_results(make_service):
+    count = 10
+    service = make_service(
+        lambda request: httpx.Response(200, content=trade_xml(request.url.params["DEAL_YMD"], count))
+    )
+    deal_ymd = service._recent_months(1)[0]
+
+    async def scenario():
+        for region_code in ("11440", "11410"):
+            await service.refresh_partition(region_code, deal_ymd)
+        both = await service.fetch_frame(["11440", "11410"], 1)
+        other = await service.fetch_frame(["11410"], 1)
+        frame = service._partition_frames[("11440", deal_ymd)][1]
+
+        # 변경 없는 갱신: 프레임과 병합 결과 유지
+        await service.refresh_partition("11440", deal_ymd)
+        assert service._partition_frames[("11440", deal_ymd)][1] is frame
+        assert await service.fetch_frame(["11440", "11410"], 1) is both
+        return both, other
+
+    both, other = asyncio.run(scenario())
+
+    # 변경이 있으면 해당 파티션을 포함한 병합 결과만 무효화
+    count = 12
+
+    async def changed():
+        await service.refresh_partition("11440", deal_ymd)
+        assert len(await service.fetch_frame(["11440", "11410"], 1)) == 22
+        assert await service.fetch_frame(["11410"], 1) is other
+
+    asyncio.run(changed())
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from app.services.quantile_sketch import KLLSketch, rank_error
+
+
+def rank_error_of(sketch: KLLSketch, values: np.ndarray, qs: np.ndarray) -> float:
+    """분위수로 반환한 값의 실제 순위와 목표 순위 차이의 최댓값 (정규화)"""
+    values = np.sort(values)
+    n = len(values)
+    worst = 0
+    for q, value in zip(qs, sketch.quantiles(qs)):
+        target = min(int(q * n), n - 1)
+        low = np.searchsorted(values, value, "left")
+        high = np.searchsorted(values, value, "right")
+        if not low <= target < high:
+            worst = max(worst, min(abs(target - low), abs(target - high + 1)))
+    return worst / n
+
+
+def test_exact_below_k():
+    rng = np.random.default_rng(0)
+    values = rng.integers(1, 10 ** 6, 200).astype(np.float64)
+    sketch = KLLSketch.from_values(values, k=200)
+
+    assert sketch.is_exact
+    assert sketch.rank_error() == 0.0
+    expected = np.sort(values)
+    qs = np.linspace(0, 1, 101)
+    assert sketch.quantiles(qs) == [expected[min(int(q * 200), 199)] for q in qs]
+
+
+def test_merged_small_sketches_stay_exact():
+    parts = [np.arange(start, start + 50, dtype=np.float64) for start in range(0, 200, 50)]
+    sketch = KLLSketch.merged([KLLSketch.from_values(part) for part in parts])
+
+    assert sketch.is_exact
+    assert sketch.count == 200
+    assert sketch.quantile(0.5) == 100.0
+
+
+def test_empty_sketch():
+    sketch = KLLSketch()
+    assert sketch.quantile(0.5) is None
+    assert sketch.quantiles([0.1, 0.9]) == []
+    assert KLLSketch.merged([]).count == 0
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_merge_error_within_bound(seed):
+    rng = np.random.default_rng(seed)
+    values = rng.lognormal(11, 0.6, 50000).round()
+    parts = np.array_split(values, 500)
+
+    merged = KLLSketch.merged([KLLSketch.from_values(part) for part in parts])
+    incremental = KLLSketch()
+    for part in parts:
+        incremental.merge(KLLSketch.from_values(part))
+
+    qs = np.linspace(0, 1, 101)
+    for sketch in (merged, incremental):
+        assert sketch.count == len(values)
+        assert not sketch.is_exact
+        # 보관 값 수는 입력 크기와 무관하게 작게 유지
+        assert sketch.size < 3 * sketch.k
+        assert sketch.weighted_values()[1].sum() == len(values)
+        assert rank_error_of(sketch, values, qs) <= sketch.rank_error(distribution=True)
+    assert merged.rank_error(distribution=True) == rank_error(merged.k, distribution=True)
+
+
+def test_merge_is_deterministic():
+    rng = np.random.default_rng(7)
+    parts = [rng.integers(1, 1000, 300).astype(np.float64) for _ in range(20)]
+
+    first = KLLSketch.merged([KLLSketch.from_values(part) for part in parts])
+    second = KLLSketch.merged([KLLSketch.from_values(part) for part in parts])
+    qs = [0.1, 0.25, 0.5, 0.75, 0.9]
+    assert first.quantiles(qs) == second.quantiles(qs)
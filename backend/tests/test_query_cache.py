@@ -0,0 +1,67 @@
+from typing import List
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import cached_query, get_region_codes
+from app.core.degradation import DEGRADED_HEADER, DegradationMiddleware, mark_degraded
+from app.services.molit_api_xml import PartitionRefreshStats, molit_service_xml
+from app.services.trade_store import TradeStore, trade_store
+from conftest import make_record
+
+
+def make_client(route: str, calls: List[int]) -> TestClient:
+    """호출 횟수를 세고 갱신에 실패한 파티션을 품질 저하로 표시하는 캐시 라우트"""
+    app = FastAPI()
+    app.add_middleware(DegradationMiddleware)
+
+    @app.get("/test")
+    @cached_query(route)
+    async def endpoint(months: int = 1, region_codes: List[str] = Depends(get_region_codes)):
+        calls.append(1)
+        for partition in molit_service_xml.failing_partitions(region_codes, months):
+            mark_degraded(*partition)
+        return {"calls": len(calls)}
+
+    return TestClient(app)
+
+
+def test_cache_invalidated_by_version_persisted_by_other_worker():
+    calls: List[int] = []
+    client = make_client("test-other-worker", calls)
+
+    assert client.get("/test").json() == {"calls": 1}
+    assert client.get("/test").json() == {"calls": 1}
+
+    # 같은 저장소 파일을 쓰는 다른 워커가 갱신 반영
+    other_worker = TradeStore(str(trade_store.db_path))
+    other_worker.apply_partition("11110", "200001", [make_record(0, "200001")])
+
+    assert client.get("/test").json() == {"calls": 2}
+    assert client.get("/test").json() == {"calls": 2}
+
+
+def test_cache_bypassed_while_requested_partition_is_failing():
+    calls: List[int] = []
+    client = make_client("test-degraded", calls)
+    partition = ("11440", molit_service_xml._recent_months(1)[0])
+
+    assert DEGRADED_HEADER not in client.get("/test").headers
+    assert len(calls) == 1
+
+    stats = PartitionRefreshStats()
+    stats.record_failure("HTTP 403")
+    molit_service_xml.refresh_stats[partition] = stats
+    try:
+        for _ in range(2):
+            response = client.get("/test")
+            assert response.headers[DEGRADED_HEADER] == ":".join(partition)
+        assert len(calls) == 3
+    finally:
+        del molit_service_xml.refresh_stats[partition]
+
+    # 다시 정상이 되면 품질 저하 이전에 저장한 결과로 응답 (품질 저하 결과는 저장되지 않음)
+    response = client.get("/test")
+    assert response.json() == {"calls": 1}
+    assert DEGRADED_HEADER not in response.headers
+    assert len(calls) == 3
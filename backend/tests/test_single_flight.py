@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    executions = []
+
+    async def load():
+        executions.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    async def scenario():
+        results = await asyncio.gather(*(flight.do("key", load) for _ in range(5)))
+        other = await flight.do("other", load)
+        return results, other
+
+    results, other = asyncio.run(scenario())
+    assert len(executions) == 2
+    assert all(result is results[0] for result in results)
+    assert other is not results[0]
+    assert flight.stats() == {"calls": 6, "executions": 2, "shared": 4, "inflight": 0}
+
+
+def test_single_flight_shares_errors_and_runs_again_after_completion():
+    flight = SingleFlight()
+    attempts = []
+
+    async def fail():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream")
+
+    async def scenario():
+        results = await asyncio.gather(
+            flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+        )
+        # 끝난 작업은 다시 실행
+        with pytest.raises(RuntimeError):
+            await flight.do("key", fail)
+        return results
+
+    results = asyncio.run(scenario())
+    assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+    assert len(attempts) == 2
+
+
+def test_single_flight_survives_first_caller_cancellation():
+    flight = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def scenario():
+        first = asyncio.ensure_future(flight.do("key", load))
+        second = asyncio.ensure_future(flight.do("key", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second, first.cancelled()
+
+    assert asyncio.run(scenario()) == ("done", True)
+    assert flight.executions == 1
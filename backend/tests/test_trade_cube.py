@@ -0,0 +1,27 @@
+import numpy as np
+
+from app.services.trade_cube import AREA_GROUPS, TradeCube
+from app.services.trade_frame import TradeFrame
+from conftest import make_record
+
+
+def selected_count(cube: TradeCube, selected: np.ndarray) -> int:
+    return int(cube.aggregate(np.where(selected, 0, -1), 1).count[0])
+
+
+def test_area_distribution_matches_area_group_filter():
+    areas = [20.0, 50.0, 80.0, 150.0, 1000.0, None, -1.0, 132.0]
+    records = []
+    for i, area in enumerate(areas):
+        record = make_record(i)
+        record.exclusive_area = area
+        records.append(record)
+    cube = TradeCube.from_frame(TradeFrame.from_properties(records))
+
+    distribution = cube.area_distribution(cube.select())
+    assert distribution == {"10평 이하": 1, "10-20평": 1, "20-30평": 1, "30-40평": 0, "40평 이상": 2}
+
+    # 평형대 필터와 분포가 같은 규칙 (범위 밖/미상 면적은 어느 평형대에도 포함되지 않음)
+    assert selected_count(cube, cube.select(area_groups=list(AREA_GROUPS))) == sum(distribution.values())
+    for group, count in distribution.items():
+        assert selected_count(cube, cube.select(area_groups=[group])) == count
@@ -0,0 +1,109 @@
+import math
+import warnings
+
+import numpy as np
+import pytest
+
+from conftest import make_record
+from app.services.trade_frame import TradeFrame
+from app.services.trade_index import PYEONG_AREA, SORT_COLUMNS
+from app.services.trade_query import TradeQuery, decode_cursor, encode_cursor
+
+
+def random_frame(seed: int, size: int = 300) -> TradeFrame:
+    """면적 0/미상, 같은 가격, 같은 ID가 섞인 프레임"""
+    rng = np.random.default_rng(seed)
+    records = []
+    for i in range(size):
+        record = make_record(
+            int(rng.integers(0, size // 2)),
+            deal_amount=int(rng.choice([50000, 80000, 120000]))
+        )
+        record.exclusive_area = [0.0, None, 59.0, 84.0, 114.0][int(rng.integers(0, 5))]
+        records.append(record)
+    return TradeFrame.from_properties(records)
+
+
+def naive_order(frame: TradeFrame, sort: str, descending: bool, query: TradeQuery) -> list:
+    """조건에 맞는 행을 전부 훑어 정렬 (NaN은 맨 뒤, 동점은 ID 키/순번 오름차순)"""
+    values = SORT_COLUMNS[sort](frame)
+    keys = frame.id_keys.tolist()
+    matched = query.select(frame).tolist()
+    seen = {}
+    occurrences = {}
+    for row in range(len(frame)):
+        occurrences[row] = seen.get(keys[row], 0)
+        seen[keys[row]] = occurrences[row] + 1
+
+    def sort_key(row):
+        value = float(values[row])
+        if math.isnan(value):
+            return (1, 0.0, keys[row], occurrences[row])
+        return (0, -value if descending else value, keys[row], occurrences[row])
+
+    return sorted(matched, key=sort_key)
+
+
+def test_price_per_pyeong_without_area_is_nan():
+    frame = random_frame(0)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        values = SORT_COLUMNS["price_per_pyeong"](frame)
+
+    valid = frame.exclusive_area > 0
+    assert np.isnan(values[~valid]).all()
+    assert np.allclose(values[valid], frame.deal_amount[valid] / (frame.exclusive_area[valid] / PYEONG_AREA))
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("sort", ["price_per_pyeong", "area"])
+def test_cursor_paging_matches_naive_scan_with_missing_area(seed, descending, sort):
+    frame = random_frame(seed)
+    query = TradeQuery(min_price=60000) if seed % 2 else TradeQuery()
+    expected = naive_order(frame, sort, descending, query)
+
+    rows, after = [], None
+    while True:
+        page, total, next_key = query.seek(frame, sort, descending, after, 0, 37)
+        rows.extend(page.tolist())
+        if next_key is None:
+            break
+        # 커서 문자열로 바꿔도 같은 위치에서 이어짐 (NaN 포함)
+        after = decode_cursor(encode_cursor(sort, descending, next_key), sort, descending)
+
+    assert total == len(expected)
+    assert rows == expected
+    assert query.ordered(frame, sort, descending).tolist() == expected
+
+
+def test_cursor_round_trip_keeps_full_id_key():
+    key = (123456.5, 2 ** 64 - 1, 3)
+    assert decode_cursor(encode_cursor("price", True, key), "price", True) == key
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    encode_cursor("price", False, (1, 2, 3)),
+    encode_cursor("area", True, (1, 2, 3)),
+    encode_cursor("price", True, (1, -1, 0)),
+    encode_cursor("price", True, ("1", 2, 0)),
+])
+def test_decode_cursor_rejects_invalid_or_foreign_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "price", True)
+
+
+def test_cursor_pages_do_not_shift_when_rows_are_inserted_before_cursor():
+    records = [make_record(i) for i in range(40)]
+    frame = TradeFrame.from_properties(records)
+    query = TradeQuery()
+    first, _, next_key = query.seek(frame, "price", False, None, 0, 10)
+    assert next_key is not None
+
+    # 커서 앞쪽(더 싼 가격)에 거래가 추가되어도 다음 페이지는 커서 바로 다음부터 이어짐
+    grown = TradeFrame.from_properties(records + [make_record(100 + i, deal_amount=i) for i in range(5)])
+    after = decode_cursor(encode_cursor("price", False, next_key), "price", False)
+    second, _, _ = query.seek(grown, "price", False, after, 0, 10)
+
+    assert grown.deal_amount[second].tolist() == frame.deal_amount[np.arange(10, 20)].tolist()
@@ -0,0 +1,118 @@
+import time
+
+from app.services.trade_store import TradeStore
+from conftest import make_record
+
+REGION = "11440"
+
+
+def test_apply_partition_computes_delta_and_bumps_version(store):
+    first = store.apply_partition(REGION, "202401", [make_record(i) for i in range(5)])
+    assert (first.inserted, first.updated, first.deleted, first.version) == (5, 0, 0, 1)
+
+    # 1건 가격 정정, 1건 삭제, 1건 추가
+    records = [make_record(i) for i in range(1, 5)] + [make_record(9)]
+    records[0] = make_record(1, deal_amount=1)
+    second = store.apply_partition(REGION, "202401", records)
+    assert (second.inserted, second.updated, second.deleted, second.version) == (1, 1, 1, 2)
+
+    # 변경이 없으면 버전을 올리지 않음
+    third = store.apply_partition(REGION, "202401", records)
+    assert not third.changed and third.version == 2 and store.version == 2
+
+    frame = store.load_partition_frame(REGION, "202401")
+    assert sorted(frame.deal_amount.tolist()) == sorted(r.deal_amount for r in records)
+
+
+def test_versions_are_unique_across_store_instances(tmp_path):
+    # 같은 파일을 쓰는 두 워커
+    path = str(tmp_path / "shared.sqlite3")
+    worker_a, worker_b = TradeStore(path), TradeStore(path)
+
+    versions = []
+    for month in range(1, 7):
+        worker = worker_a if month % 2 else worker_b
+        deal_ymd = f"2024{month:02d}"
+        versions.append(worker.apply_partition(REGION, deal_ymd, [make_record(0, deal_ymd)]).version)
+
+    assert versions == [1, 2, 3, 4, 5, 6]
+
+    # 다른 워커가 반영한 변경도 변경 내역에 포함
+    feed = worker_a.get_changes(0)
+    assert feed.version == 6
+    assert [change.version for change in feed.changes] == versions
+
+
+def test_get_changes_pages_without_splitting_a_version(store):
+    store.apply_partition(REGION, "202401", [make_record(i) for i in range(3)])
+    store.apply_partition(REGION, "202402", [make_record(i, "202402") for i in range(2)])
+    store.apply_partition(REGION, "202403", [make_record(i, "202403") for i in range(4)])
+
+    # 한 버전 변경 내역이 limit에 걸리면 다음 페이지로 넘김
+    page = store.get_changes(0, limit=4)
+    assert [change.version for change in page.changes] == [1, 1, 1]
+    assert page.has_more and page.next_since == 1
+
+    page = store.get_changes(page.next_since, limit=4)
+    assert [change.version for change in page.changes] == [2, 2]
+    assert page.has_more and page.next_since == 2
+
+    # limit보다 큰 버전은 한 번에 전체 반환
+    page = store.get_changes(page.next_since, limit=2)
+    assert [change.version for change in page.changes] == [3, 3, 3, 3]
+    assert page.next_since == 3
+
+    page = store.get_changes(3)
+    assert page.changes == [] and not page.has_more and page.next_since == 3 and not page.reset
+
+
+def test_get_changes_requests_reset_after_retention(store):
+    store.apply_partition(REGION, "202401", [make_record(0)])
+    store.apply_partition(REGION, "202402", [make_record(0, "202402")])
+
+    # 보관 기간이 지나 이전 변경 내역이 삭제된 상황
+    store.change_retention = 0
+    time.sleep(0.01)
+    store.apply_partition(REGION, "202403", [make_record(0, "202403")])
+
+    feed = store.get_changes(0)
+    assert feed.reset
+    assert [change.version for change in feed.changes] == [3]
+
+
+def test_price_correction_of_duplicate_trade_is_single_update(store):
+    # 같은 단지/날짜/면적/층의 거래 2건 (거래금액만 다름)
+    duplicates = [make_record(3, deal_amount=100000), make_record(3, deal_amount=200000)]
+    store.apply_partition(REGION, "202401", duplicates + [make_record(1)])
+
+    # 싼 쪽 거래금액이 더 비싸게 정정되어도 나머지 한 건은 그대로
+    corrected = [make_record(3, deal_amount=300000), make_record(3, deal_amount=200000)]
+    delta = store.apply_partition(REGION, "202401", corrected + [make_record(1)])
+    assert (delta.inserted, delta.updated, delta.deleted) == (0, 1, 0)
+
+    changes = store.get_changes(1).changes
+    assert [(change.op, change.property.deal_amount) for change in changes] == [("update", 300000)]
+
+    # 응답 순서만 바뀌면 변경 없음
+    delta = store.apply_partition(REGION, "202401", [make_record(1)] + corrected[::-1])
+    assert not delta.changed
+
+
+def test_duplicate_trade_added_and_removed(store):
+    store.apply_partition(REGION, "202401", [make_record(3, deal_amount=100000)])
+
+    delta = store.apply_partition(
+        REGION, "202401", [make_record(3, deal_amount=200000), make_record(3, deal_amount=100000)]
+    )
+    assert (delta.inserted, delta.updated, delta.deleted) == (1, 0, 0)
+
+    delta = store.apply_partition(REGION, "202401", [make_record(3, deal_amount=200000)])
+    assert (delta.inserted, delta.updated, delta.deleted) == (0, 0, 1)
+    assert store.load_partition_frame(REGION, "202401").deal_amount.tolist() == [200000]
+
+
+def test_change_retention_prune_uses_index(store):
+    plan = store._conn.execute(
+        "EXPLAIN QUERY PLAN DELETE FROM trade_changes WHERE changed_at < ?", (0,)
+    ).fetchall()
+    assert any("idx_trade_changes_changed_at" in row[-1] for row in plan)